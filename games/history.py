@@ -0,0 +1,176 @@
+import threading
+import time
+
+from games.storage import storage
+
+WIN = "win"
+LOSS = "loss"
+DRAW = "draw"
+
+LEADERBOARD_SIZE = 10
+
+# Показатель, по которому строятся таблица лидеров и перцентили: колонка, больше ли
+# лучше и считается ли он только по победам (время сапёра, ходы крестиков-ноликов)
+METRICS = {
+    "snake": ("score", True, False),
+    "minesweeper": ("seconds", False, True),
+    "tictactoe": ("moves", False, True),
+}
+
+_history = None
+_history_lock = threading.Lock()
+
+# Каждая законченная партия — строка history. Сводки по (игра, вариант) обновляет
+# триггер в той же транзакции, что и вставку, поэтому экран статистики читает только
+# их и верх индекса history_rank — без просмотра всей истории.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    result TEXT NOT NULL,
+    value REAL,
+    score INTEGER,
+    length INTEGER,
+    moves INTEGER,
+    seconds REAL,
+    rows INTEGER,
+    cols INTEGER,
+    mines INTEGER,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_rank ON history (game, variant, value);
+CREATE INDEX IF NOT EXISTS history_recent ON history (game, finished);
+
+CREATE TABLE IF NOT EXISTS history_totals (
+    game TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    plays INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    last_value REAL,
+    PRIMARY KEY (game, variant)
+) WITHOUT ROWID;
+
+-- Распределение показателя с шагом 1: из него считаются перцентили
+CREATE TABLE IF NOT EXISTS history_histogram (
+    game TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game, variant, bucket)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS history_rollup AFTER INSERT ON history
+BEGIN
+    INSERT OR IGNORE INTO history_totals (game, variant) VALUES (NEW.game, NEW.variant);
+    UPDATE history_totals SET
+        plays = plays + 1,
+        wins = wins + (NEW.result = 'win'),
+        losses = losses + (NEW.result = 'loss'),
+        draws = draws + (NEW.result = 'draw'),
+        seconds = seconds + COALESCE(NEW.seconds, 0),
+        streak = CASE WHEN NEW.result = 'win' THEN streak + 1 ELSE 0 END,
+        best_streak = MAX(best_streak, CASE WHEN NEW.result = 'win' THEN streak + 1 ELSE 0 END),
+        last_value = NEW.value
+    WHERE game = NEW.game AND variant = NEW.variant;
+    INSERT INTO history_histogram (game, variant, bucket, count)
+        SELECT NEW.game, NEW.variant, CAST(NEW.value AS INTEGER), 1 WHERE NEW.value IS NOT NULL
+        ON CONFLICT (game, variant, bucket) DO UPDATE SET count = count + 1;
+END;
+"""
+
+COLUMNS = ("score", "length", "moves", "seconds", "rows", "cols", "mines")
+
+
+class History:
+    # История законченных партий всех игр. Запись — одна операция "sql" в очередь
+    # хранилища (вставку и сводки фиксирует фоновый поток), чтение — только сводки,
+    # поэтому экран статистики открывается сразу и при миллионах партий.
+    def __init__(self, store=None):
+        self.store = store or storage()
+        self.store.ensure_schema(SCHEMA)
+
+    # --- Запись ---
+    def record(self, game, variant, result, **fields):
+        # fields — колонки из COLUMNS; показатель для рейтинга берётся из METRICS
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown history columns: {sorted(unknown)}")
+        column, _, wins_only = METRICS[game]
+        value = fields.get(column) if result == WIN or not wins_only else None
+        names = ("game", "variant", "result", "value", "finished") + tuple(fields)
+        params = (game, variant, result, value, time.time()) + tuple(fields.values())
+        self.store.write([("sql", f"INSERT INTO history ({', '.join(names)}) "
+                                  f"VALUES ({', '.join('?' * len(names))})", params)])
+
+    # --- Сводки ---
+    def variants(self, game):
+        # Варианты игры, от самого сыгрываемого
+        rows = self.store.query("SELECT variant FROM history_totals WHERE game = ? ORDER BY plays DESC, variant",
+                                (game,))
+        return [variant for variant, in rows]
+
+    def totals(self, game, variant):
+        row = self.store.query("SELECT plays, wins, losses, draws, seconds, streak, best_streak, last_value "
+                               "FROM history_totals WHERE game = ? AND variant = ?", (game, variant))
+        if not row:
+            return None
+        keys = ("plays", "wins", "losses", "draws", "seconds", "streak", "best_streak", "last_value")
+        return dict(zip(keys, row[0]))
+
+    def leaderboard(self, game, variant, limit=LEADERBOARD_SIZE):
+        # Верх индекса history_rank: читается limit строк при любом размере истории
+        _, higher, _ = METRICS[game]
+        order = "DESC" if higher else "ASC"
+        return self.store.query(
+            f"SELECT value, result, length, moves, seconds, finished FROM history "
+            f"WHERE game = ? AND variant = ? AND value IS NOT NULL ORDER BY value {order} LIMIT ?",
+            (game, variant, limit))
+
+    def histogram(self, game, variant):
+        return self.store.query("SELECT bucket, count FROM history_histogram "
+                                "WHERE game = ? AND variant = ? ORDER BY bucket", (game, variant))
+
+    def percentiles(self, game, variant, points=(50, 90, 99)):
+        # Перцентили показателя по распределению; None, если партий с показателем нет
+        buckets = self.histogram(game, variant)
+        total = sum(count for _, count in buckets)
+        if not total:
+            return None
+        result = {}
+        for p in points:
+            need = total * p / 100
+            seen = 0
+            for bucket, count in buckets:
+                seen += count
+                if seen >= need:
+                    result[p] = bucket
+                    break
+        return result
+
+    def rank(self, game, variant, value):
+        # Доля партий с показателем, которые value превосходит строго, в процентах
+        if value is None:
+            return None
+        _, higher, _ = METRICS[game]
+        buckets = self.histogram(game, variant)
+        total = sum(count for _, count in buckets)
+        if not total:
+            return None
+        value = int(value)
+        beaten = sum(count for bucket, count in buckets if (bucket < value if higher else bucket > value))
+        return 100 * beaten / total
+
+
+def history():
+    # Одна история на процесс, поверх общего хранилища
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = History()
+        return _history
@@ -0,0 +1,117 @@
+import logging
+import time
+from collections import OrderedDict
+
+MAX_HIDDEN_WIDGETS = 3000  # сколько виджетов могут держать скрытые экраны
+MAX_HIDDEN_FRAMES = 2      # и сколько самих скрытых экранов
+
+log = logging.getLogger("minigame")
+
+
+class Lifecycle:
+    # Протокол экрана игры. Методы вызывает MainApp, а не сама игра:
+    #   on_show()      — экран снова на виду: продолжить таймеры, вернуть фокус;
+    #   on_hide()      — экран скрыт: остановить таймеры и анимации, данные не трогать;
+    #   suspend()      — экран будет уничтожен ради памяти: вернуть состояние
+    #                    (обычные объекты Python), по которому resume() его восстановит;
+    #   resume(state)  — новый экран вместо холодного старта продолжает с того же места;
+    #   dispose()      — перед destroy(): закрыть потоки, сокеты и файлы.
+    def on_show(self):
+        pass
+
+    def on_hide(self):
+        pass
+
+    def suspend(self):
+        return None
+
+    def resume(self, state):
+        pass
+
+    def dispose(self):
+        pass
+
+
+def widget_count(widget):
+    count = 0
+    stack = [widget]
+    while stack:
+        w = stack.pop()
+        count += 1
+        stack.extend(w.winfo_children())
+    return count
+
+
+def call(frame, name, *args):
+    # Экраны сторонних игр могут не наследовать Lifecycle — тогда шаг пропускается
+    method = getattr(frame, name, None)
+    return method(*args) if method is not None else None
+
+
+class FrameCache:
+    # Экраны игр по названию. Скрытые экраны хранятся от давно скрытых к недавним;
+    # когда они вместе превышают бюджет виджетов или числа экранов, самые давние
+    # сохраняют состояние через suspend() и уничтожаются. При следующем открытии
+    # экран строится заново и получает это состояние в resume().
+    def __init__(self, container, controller, max_widgets=MAX_HIDDEN_WIDGETS, max_frames=MAX_HIDDEN_FRAMES):
+        self.container = container
+        self.controller = controller
+        self.max_widgets = max_widgets
+        self.max_frames = max_frames
+        self.frames = OrderedDict()  # название -> экран
+        self.widgets = {}            # название -> число виджетов на момент скрытия
+        self.states = {}             # название -> состояние выгруженного экрана
+        self.current = None
+
+    def show(self, entry):
+        self.hide()
+        frame = self.frames.get(entry.title)
+        if frame is None:
+            started = time.perf_counter()
+            warm = entry.loaded
+            frame = entry.load()(self.container, self.controller)
+            state = self.states.pop(entry.title, None)
+            if state is not None:
+                call(frame, "resume", state)
+            self.frames[entry.title] = frame
+            log.info("%s: экран построен за %.0f мс%s%s", entry.title, (time.perf_counter() - started) * 1000,
+                     " (модуль уже загружен)" if warm else "", ", состояние восстановлено" if state else "")
+        else:
+            self.widgets.pop(entry.title, None)
+        self.frames.move_to_end(entry.title)
+        self.current = entry.title
+        frame.pack(fill="both", expand=True)
+        call(frame, "on_show")
+
+    def hide(self):
+        if self.current is None:
+            return
+        title, self.current = self.current, None
+        frame = self.frames[title]
+        frame.pack_forget()
+        call(frame, "on_hide")
+        self.frames.move_to_end(title)
+        self.widgets[title] = widget_count(frame)
+        self.evict()
+
+    def evict(self):
+        # Выгружаются самые давно скрытые экраны, пока не уложимся в бюджет
+        while self.widgets and (sum(self.widgets.values()) > self.max_widgets or len(self.widgets) > self.max_frames):
+            title = next(t for t in self.frames if t in self.widgets)
+            self.drop(title)
+
+    def drop(self, title):
+        frame = self.frames.pop(title)
+        count = self.widgets.pop(title, 0)
+        state = call(frame, "suspend")
+        if state is not None:
+            self.states[title] = state
+        call(frame, "dispose")
+        frame.destroy()
+        log.info("%s: экран выгружен (%d виджетов)", title, count)
+
+    def close(self):
+        # Выход из приложения: каждый экран сохраняет и закрывает своё
+        self.hide()
+        for title in list(self.frames):
+            self.drop(title)
@@ -1,11 +1,59 @@
 import tkinter as tk
 from tkinter import messagebox
-import random, json, os
-
-SAVE_FILE = "games/data/mina_save.json"
+import time
+from collections import deque
+
+from games import perf
+from games.history import WIN, LOSS, history
+from games.lifecycle import Lifecycle
+from games.minesweeper_canvas import CanvasBoard, InfiniteCanvasBoard
+from games.minesweeper_engine import MinesweeperGame, PLAYING, WON, LOST, new_seed
+from games.minesweeper_infinite import InfiniteWorld
+from games.minesweeper_pool import BoardPool
+from games.minesweeper_save import SaveJournal, game_state, restore_game
+from games.minesweeper_solver import Advisor
+
+# Файлы сохранения прежних версий — переносятся в общее хранилище при первом запуске
+LEGACY_SAVE_FILES = ("games/data/mina_save.bin", "games/data/mina_save.journal", "games/data/mina_save.json")
+COMPACT_EVERY = 500  # после стольких ходов журнал сворачивается в новый снимок
 NUMBER_COLORS = {1:"blue", 2:"green", 3:"red", 4:"purple", 5:"maroon", 6:"turquoise", 7:"black", 8:"gray"}
+CANVAS_MIN_CELLS = 30 * 30  # начиная с такого размера поле рисуется на Canvas
+REVEAL_SLICE = 0.012  # секунд работы каскада между возвратами в цикл событий Tk
+
+
+class ButtonBoard(tk.Frame):
+    # Режим для небольших полей: по кнопке на клетку
+    def __init__(self, parent, game, rows, cols):
+        super().__init__(parent, bg="#e8f0f7")
+        self.game = game
+        self.buttons = {}
+        for r in range(rows):
+            for c in range(cols):
+                btn = tk.Button(
+                    self, text="", width=4, height=2,
+                    bg="#cce7ff", relief="raised", font=("Arial", 12, "bold"),
+                    command=lambda r=r, c=c: game.open_cell(r, c)
+                )
+                btn.bind("<Button-3>", lambda e, r=r, c=c: game.toggle_flag(r, c))
+                btn.grid(row=r, column=c, padx=1, pady=1)
+                self.buttons[(r, c)] = btn
 
-class GameFrame(tk.Frame):
+    def paint(self, r, c):
+        text, bg, fg, opened = self.game.cell_style(r, c)
+        self.buttons[(r, c)].config(
+            text=text, bg=bg, fg=fg,
+            relief="sunken" if opened else "raised", state="disabled" if opened else "normal"
+        )
+
+    def update_cells(self, cells):
+        for r, c in cells:
+            self.paint(r, c)
+
+    def redraw(self):
+        self.update_cells(self.buttons)
+
+
+class GameFrame(tk.Frame, Lifecycle):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -42,186 +90,440 @@ class GameFrame(tk.Frame):
                                      font=("Arial", 11, "bold"), command=self.back_to_menu)
         self.back_button.grid(row=0, column=8, padx=10)
 
+        tk.Label(self.frame_top, text="Сид:", font=("Arial", 11, "bold"), bg="#e8f0f7").grid(row=1, column=0, padx=5, pady=(8, 0))
+        self.seed_entry = tk.Entry(self.frame_top, width=12)
+        self.seed_entry.grid(row=1, column=1, columnspan=2, padx=5, pady=(8, 0))
+
+        self.safe_first = tk.BooleanVar(value=True)
+        tk.Checkbutton(self.frame_top, text="Бірінші жүріс қауіпсіз", variable=self.safe_first,
+                       font=("Arial", 11), bg="#e8f0f7").grid(row=1, column=3, columnspan=3, padx=5, pady=(8, 0))
+
+        self.hint_button = tk.Button(self.frame_top, text="💡 Кеңес", bg="#f0d14c",
+                                     font=("Arial", 11, "bold"), command=self.show_hint)
+        self.hint_button.grid(row=1, column=6, padx=10, pady=(8, 0))
+
+        self.auto_button = tk.Button(self.frame_top, text="🤖 Авто", bg="#9b59b6", fg="white",
+                                     font=("Arial", 11, "bold"), command=self.auto_play)
+        self.auto_button.grid(row=1, column=7, padx=10, pady=(8, 0))
+
+        self.infinite_button = tk.Button(self.frame_top, text="∞ Шексіз", bg="#00897b", fg="white",
+                                         font=("Arial", 11, "bold"), command=self.new_infinite_game)
+        self.infinite_button.grid(row=1, column=8, padx=10, pady=(8, 0))
+
+        self.seed_label = tk.Label(self.frame_top, text="", font=("Arial", 11), bg="#e8f0f7", fg="#555555")
+        self.seed_label.grid(row=2, column=0, columnspan=9, pady=(8, 0))
+
         # --- Игровое поле ---
         self.frame_board = tk.Frame(self, bg="#e8f0f7")
         self.frame_board.pack(pady=20)
 
         # --- Данные ---
-        self.buttons = {}
-        self.mines = set()
-        self.opened = set()
-        self.flags = set()
-        self.rows = 0
-        self.cols = 0
-        self.mine_count = 0
-
-        if os.path.exists(SAVE_FILE):
-            self.load_game()
+        self.view = None
+        self.game = None  # MinesweeperGame или InfiniteWorld — правила и состояние без интерфейса
+        self.infinite = False
+        self.started = time.monotonic()  # начало партии — для времени в истории
+        self.revealed = False
+        self.result_recorded = False  # итог партии уже записан и показан
+        self.hint_cell = None
+        self.moves_since_save = 0
+        self.reveals = deque()  # незавершённые каскады: (генератор частей, что сделать в конце)
+        self.reveal_id = None
+        self.auto_id = None
+        self.advice_id = None    # ожидание результата анализа
+        self.on_advice = None    # что сделать с результатом: подсказка или шаг автоигры
+        self.suspending = False  # экран выгружается: итоги пишутся, но не показываются
+
+        self.pool = BoardPool()
+        self.advisor = Advisor()
+        self.journal = SaveJournal(LEGACY_SAVE_FILES)
+        self.load_game()
 
     # --- Игровая логика ---
     def new_game(self):
         try:
-            self.rows = int(self.rows_entry.get())
-            self.cols = int(self.cols_entry.get())
-            self.mine_count = int(self.mines_entry.get())
-            if self.rows <= 0 or self.cols <= 0 or self.mine_count <= 0:
+            rows = int(self.rows_entry.get())
+            cols = int(self.cols_entry.get())
+            mine_count = int(self.mines_entry.get())
+            if rows <= 0 or cols <= 0 or mine_count <= 0:
                 raise ValueError
-            if self.mine_count >= self.rows * self.cols:
+            if mine_count >= rows * cols:
                 messagebox.showerror("Қате!", "Мина саны ұяшық санынан аз болуы керек!")
                 return
+            seed_text = self.seed_entry.get().strip()
+            seed = int(seed_text) if seed_text else None
+            if seed is not None and not 0 <= seed < 2 ** 64:
+                raise ValueError
         except ValueError:
             messagebox.showerror("Қате!", "Дұрыс мәндер енгізіңіз!")
             return
 
-        self.mines.clear()
-        self.opened.clear()
-        self.flags.clear()
+        # Поле с заданным сидом генерируется заново, иначе берётся готовое из пула
+        game = None if seed is not None else self.pool.take(rows, cols, mine_count)
+        if game is None:
+            game = MinesweeperGame(rows, cols, mine_count, seed=seed)
+        game.first_click_safe = self.safe_first.get()
+        self.game = game
+        self.infinite = False
+        self.started = time.monotonic()
+        self.build_board()
+        self.save_game()
 
+    def new_infinite_game(self):
+        # Бесконечный режим: участки генерируются по мере прокрутки и на диск не пишутся;
+        # сохранённая обычная партия остаётся нетронутой
+        try:
+            seed_text = self.seed_entry.get().strip()
+            seed = int(seed_text) if seed_text else new_seed()
+        except ValueError:
+            messagebox.showerror("Қате!", "Дұрыс мәндер енгізіңіз!")
+            return
+        self.game = InfiniteWorld(seed)
+        self.infinite = True
+        self.build_board()
+        self.open_cell(*self.game.start)
+
+    def build_board(self):
+        self.cancel_reveals()
+        self.cancel_advice()
+        self.stop_auto()
+        self.controller.scheduler.cancel_owner(self)
         for widget in self.frame_board.winfo_children():
             widget.destroy()
-        self.buttons.clear()
-
-        for r in range(self.rows):
-            for c in range(self.cols):
-                btn = tk.Button(
-                    self.frame_board, text="", width=4, height=2,
-                    bg="#cce7ff", relief="raised", font=("Arial", 12, "bold"),
-                    command=lambda r=r, c=c: self.open_cell(r, c)
-                )
-                btn.bind("<Button-3>", lambda e, r=r, c=c: self.toggle_flag(r, c))
-                btn.grid(row=r, column=c, padx=1, pady=1)
-                self.buttons[(r, c)] = btn
-
-        while len(self.mines) < self.mine_count:
-            self.mines.add((random.randint(0, self.rows - 1), random.randint(0, self.cols - 1)))
-
-        self.save_game()
+        self.revealed = False
+        self.result_recorded = False
+        self.hint_cell = None
+        self.update_status()
+        if self.infinite:
+            self.view = InfiniteCanvasBoard(self.frame_board, self, self.game.start)
+            self.view.pack()
+            return
+        self.advisor.reset(self.game)
+        rows, cols = self.game.rows, self.game.cols
+        if rows * cols >= CANVAS_MIN_CELLS:
+            self.view = CanvasBoard(self.frame_board, self, rows, cols)
+        else:
+            self.view = ButtonBoard(self.frame_board, self, rows, cols)
+        self.view.pack()
+
+    def update_status(self):
+        text = f"#{self.game.seed}" if self.game.seed is not None else ""
+        if self.infinite:
+            text += f"   Ашылған ұяшықтар: {self.game.opened_count}"
+        self.seed_label.config(text=text)
+
+    def cell_style(self, r, c):
+        # Внешний вид клетки: (текст, фон, цвет текста, открыта ли)
+        if self.infinite:
+            return self.infinite_cell_style(r, c)
+        game = self.game
+        if (r, c) in game.opened or (self.revealed and not game.board.is_mine(r, c)):
+            count = game.board.count(r, c)
+            return (str(count) if count else "", "#dfe6e9", NUMBER_COLORS.get(count, "black"), (r, c) in game.opened)
+        if self.revealed:
+            return ("💣", "#ff4c4c" if (r, c) == game.exploded else "#ff7675", "white", False)
+        if (r, c) in game.flags:
+            return ("🚩", "#f0d14c", "black", False)
+        if (r, c) == self.hint_cell:
+            return ("", "#7bed9f", "black", False)
+        return ("", "#cce7ff", "black", False)
+
+    def infinite_cell_style(self, r, c):
+        world = self.game
+        if world.is_opened(r, c):
+            count = world.count(r, c)
+            return (str(count) if count else "", "#dfe6e9", NUMBER_COLORS.get(count, "black"), True)
+        if self.revealed and world.is_mine(r, c):
+            return ("💣", "#ff4c4c" if (r, c) == world.exploded else "#ff7675", "white", False)
+        if world.is_flagged(r, c):
+            return ("🚩", "#f0d14c", "black", False)
+        return ("", "#cce7ff", "black", False)
 
     def reset_game(self):
-        if os.path.exists(SAVE_FILE):
-            os.remove(SAVE_FILE)
+        if self.infinite:
+            self.new_infinite_game()
+            return
+        self.journal.clear()
         self.new_game()
 
-    def count_mines_around(self, r, c):
-        return sum(
-            (i, j) in self.mines
-            for i in range(r - 1, r + 2)
-            for j in range(c - 1, c + 2)
-            if 0 <= i < self.rows and 0 <= j < self.cols
-        )
-
+    @perf.timed("minesweeper.open_cell")
     def open_cell(self, r, c):
-        if (r, c) in self.opened or (r, c) in self.flags:
+        if self.infinite:
+            self.start_reveal(self.game.open_steps(r, c), self.finish_infinite)
             return
-
-        btn = self.buttons[(r, c)]
-        if (r, c) in self.mines:
-            btn.config(text="💣", bg="#ff4c4c", fg="white")
+        if self.game.status != PLAYING or (r, c) in self.game.opened or (r, c) in self.game.flags:
+            return
+        if not self.game.opened and not self.reveals and self.game.secure_first_click(r, c):
+            # Мины переставлены ради безопасного первого хода — новое поле уходит в снимок
+            # до каскада, иначе ход из журнала при загрузке повторился бы на старом
+            self.save_game()
+            self.advisor.reset(self.game)
+        # Ход пишется в журнал сразу: при загрузке каскад повторится целиком
+        self.record_move("o", r, c)
+        self.start_reveal(self.game.open_steps(r, c), self.finish_open)
+
+    def finish_open(self):
+        # После конца партии могут завершиться и другие каскады той же порции
+        # (быстрые нажатия, автоигра) — итог записывается и показывается один раз
+        if self.result_recorded:
+            return
+        if self.game.status == LOST:
+            self.result_recorded = True
             self.reveal_all()
-            messagebox.showinfo("Ойын бітті!", "Келесі ойынға сәттілік!")
-            if os.path.exists(SAVE_FILE):
-                os.remove(SAVE_FILE)
+            self.journal.clear()
+            self.record_result(LOSS)
+            self.announce("Ойын бітті!", "Келесі ойынға сәттілік!")
             return
-
-        self.opened.add((r, c))
-        count = self.count_mines_around(r, c)
-        color = NUMBER_COLORS.get(count, "black")
-        btn.config(text=str(count) if count else "", bg="#dfe6e9", fg=color, relief="sunken", state="disabled")
-
-        if count == 0:
-            for i in range(r - 1, r + 2):
-                for j in range(c - 1, c + 2):
-                    if 0 <= i < self.rows and 0 <= j < self.cols:
-                        self.open_cell(i, j)
-
+        if self.moves_since_save >= COMPACT_EVERY and not self.reveals:
+            self.save_game()
         self.check_win()
-        self.save_game()
+
+    def finish_infinite(self):
+        # Счёт в бесконечном режиме — число открытых клеток до первой мины
+        if self.game.status == LOST and not self.result_recorded:
+            self.result_recorded = True
+            self.reveal_all()
+            self.announce("Ойын бітті!", f"Ашылған ұяшықтар: {self.game.opened_count}")
+
+    # --- Постепенное открытие ---
+    def start_reveal(self, steps, done):
+        self.reveals.append((steps, done))
+        if self.reveal_id is None:
+            self.reveal_step()
+
+    @perf.timed("minesweeper.reveal_step")
+    def reveal_step(self):
+        # Каскады открываются порциями: не дольше REVEAL_SLICE секунд за вызов, затем
+        # одна перерисовка изменившихся клеток и возврат в цикл событий, чтобы флаги
+        # и кнопки работали и во время открытия огромной области
+        self.reveal_id = None
+        deadline = time.perf_counter() + REVEAL_SLICE
+        changed = []
+        finished = []
+        while self.reveals and time.perf_counter() < deadline:
+            steps, done = self.reveals[0]
+            part = next(steps, None)
+            if part is None:
+                self.reveals.popleft()
+                finished.append(done)
+            else:
+                changed.extend(part)
+        if changed:
+            with perf.span("minesweeper.redraw"):
+                self.view.update_cells(changed)
+            if self.infinite:
+                self.update_status()
+            else:
+                self.advisor.opened(changed)
+        if self.reveals:
+            self.reveal_id = self.after(1, self.reveal_step)
+        for done in finished:
+            done()
+
+    def cancel_reveals(self):
+        if self.reveal_id is not None:
+            self.after_cancel(self.reveal_id)
+            self.reveal_id = None
+        self.reveals.clear()
 
     def toggle_flag(self, r, c):
-        if (r, c) in self.opened:
+        if not self.game.toggle_flag(r, c):
             return
-        btn = self.buttons[(r, c)]
-        if (r, c) in self.flags:
-            self.flags.remove((r, c))
-            btn.config(text="", bg="#cce7ff")
-        else:
-            self.flags.add((r, c))
-            btn.config(text="🚩", bg="#f0d14c")
-        self.save_game()
+        self.view.update_cells([(r, c)])
+        if not self.infinite:
+            self.record_move("f", r, c, int((r, c) in self.game.flags))
 
     def check_win(self):
-        if len(self.opened) + len(self.mines) == self.rows * self.cols:
+        if self.game.status == WON and not self.result_recorded:
+            self.result_recorded = True
             self.reveal_all()
-            messagebox.showinfo("🎉 Жеңіс!", "Барлық минаны таптыңыз!")
-            if os.path.exists(SAVE_FILE):
-                os.remove(SAVE_FILE)
+            self.journal.clear()
+            self.record_result(WIN)
+            self.announce("🎉 Жеңіс!", "Барлық минаны таптыңыз!")
+
+    def announce(self, title, text):
+        # Партия, доигранная при выгрузке экрана, только записывается — окна некому показывать
+        if not self.suspending:
+            messagebox.showinfo(title, text)
+
+    def record_result(self, result):
+        # Время загруженной партии считается с момента загрузки
+        game = self.game
+        history().record("minesweeper", f"{game.rows}×{game.cols} / {game.mine_count}", result,
+                         seconds=round(time.monotonic() - self.started, 1),
+                         rows=game.rows, cols=game.cols, mines=game.mine_count)
 
     def reveal_all(self):
-        for (r, c), btn in self.buttons.items():
-            if (r, c) in self.mines:
-                btn.config(text="💣", bg="#ff7675", fg="white")
-            elif (r, c) not in self.opened:
-                count = self.count_mines_around(r, c)
-                color = NUMBER_COLORS.get(count, "black")
-                btn.config(text=str(count) if count else "", bg="#dfe6e9", fg=color)
-
+        self.revealed = True
+        if not self.suspending:
+            self.view.redraw()
+
+    def record_move(self, *move):
+        # На диск уходит одна строка журнала на ход, и пишет её фоновый поток
+        self.journal.record(*move)
+        self.moves_since_save += 1
+        # Пока идёт каскад, снимок зафиксировал бы наполовину открытую область
+        # после записи хода, который её открывает, — сворачивание ждёт его конца
+        if self.moves_since_save >= COMPACT_EVERY and not self.reveals:
+            self.save_game()
+
+    @perf.timed("minesweeper.save_game")
     def save_game(self):
-        if not self.rows or not self.cols:
-            return
-        state = {
-            "rows": self.rows,
-            "cols": self.cols,
-            "mine_count": self.mine_count,
-            "mines": list(self.mines),
-            "opened": list(self.opened),
-            "flags": list(self.flags),
-        }
-        os.makedirs("games/data", exist_ok=True)
-        with open(SAVE_FILE, "w", encoding="utf-8") as f:
-            json.dump(state, f)
+        if self.game is None or self.infinite:
+            return
+        self.moves_since_save = 0
+        self.journal.snapshot(game_state(self.game))
 
     def load_game(self):
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data, moves = self.journal.load()
+        if data is None:
+            return
 
-        self.rows = data["rows"]
-        self.cols = data["cols"]
-        self.mine_count = data["mine_count"]
-        self.mines = set(tuple(x) for x in data["mines"])
-        self.opened = set(tuple(x) for x in data["opened"])
-        self.flags = set(tuple(x) for x in data["flags"])
+        game = restore_game(data, moves)
+        game.first_click_safe = self.safe_first.get()
+        self.game = game
+        self.started = time.monotonic()
+        self.moves_since_save = len(moves)
 
         self.rows_entry.delete(0, tk.END)
-        self.rows_entry.insert(0, str(self.rows))
+        self.rows_entry.insert(0, str(game.rows))
         self.cols_entry.delete(0, tk.END)
-        self.cols_entry.insert(0, str(self.cols))
+        self.cols_entry.insert(0, str(game.cols))
         self.mines_entry.delete(0, tk.END)
-        self.mines_entry.insert(0, str(self.mine_count))
-
-        for widget in self.frame_board.winfo_children():
-            widget.destroy()
-        self.buttons.clear()
+        self.mines_entry.insert(0, str(game.mine_count))
+
+        self.build_board()
+        self.view.redraw()
+        self.pool.prepare(game.rows, game.cols, game.mine_count)
+
+    # --- Подсказки ---
+    def ask_advice(self, then):
+        # Анализ идёт в потоке Advisor; результат забирается опросом через after()
+        self.on_advice = then
+        self.advisor.request()
+        if self.advice_id is None:
+            self.advice_id = self.after(10, self.poll_advice)
+
+    def poll_advice(self):
+        self.advice_id = None
+        result = self.advisor.poll()
+        if result is None:
+            self.advice_id = self.after(10, self.poll_advice)
+            return
+        then, self.on_advice = self.on_advice, None
+        if self.game.status == PLAYING:
+            then(result)
+
+    def cancel_advice(self):
+        self.advisor.cancel()
+        self.on_advice = None
+        if self.advice_id is not None:
+            self.after_cancel(self.advice_id)
+            self.advice_id = None
+
+    def show_hint(self):
+        if self.game is None or self.infinite or self.game.status != PLAYING:
+            return
+        self.ask_advice(self.apply_hint)
 
-        for r in range(self.rows):
-            for c in range(self.cols):
-                btn = tk.Button(
-                    self.frame_board, text="", width=4, height=2,
-                    bg="#cce7ff", relief="raised", font=("Arial", 12, "bold"),
-                    command=lambda r=r, c=c: self.open_cell(r, c)
-                )
-                btn.bind("<Button-3>", lambda e, r=r, c=c: self.toggle_flag(r, c))
-                btn.grid(row=r, column=c, padx=1, pady=1)
-                self.buttons[(r, c)] = btn
+    def apply_hint(self, result):
+        # Пока шёл анализ, клетку могли открыть или пометить
+        cell = result.best_guess()
+        if cell is None or cell in self.game.opened or cell in self.game.flags:
+            return
+        self.clear_hint()
+        self.hint_cell = cell
+        self.view.update_cells([cell])
+        self.controller.scheduler.later(1.5, lambda: self.clear_hint(cell), owner=self)
+
+    def clear_hint(self, cell=None):
+        if self.hint_cell is not None and cell in (None, self.hint_cell):
+            old, self.hint_cell = self.hint_cell, None
+            self.view.update_cells([old])
+
+    def auto_play(self):
+        # Открывает все гарантированно безопасные клетки; анализ каждого прохода
+        # запрашивается, когда каскады прошлого уже открылись
+        if self.game is None or self.infinite or self.game.status != PLAYING:
+            return
+        self.auto_id = None
+        if self.reveals:
+            self.auto_id = self.after(50, self.auto_play)
+            return
+        self.ask_advice(self.auto_step)
+
+    def auto_step(self, result):
+        # Безопасные клетки остаются безопасными, даже если позиция успела измениться
+        game = self.game
+        self.open_safe([cell for cell in sorted(result.safe) if cell not in game.opened and cell not in game.flags])
+
+    def open_safe(self, cells):
+        # Как и каскады, не дольше REVEAL_SLICE секунд за вызов; остаток — следующим
+        self.auto_id = None
+        game = self.game
+        deadline = time.perf_counter() + REVEAL_SLICE
+        for i, cell in enumerate(cells):
+            if game.status != PLAYING:
+                return
+            if time.perf_counter() >= deadline:
+                self.auto_id = self.after(1, lambda: self.open_safe(cells[i:]))
+                return
+            if cell not in game.opened and cell not in game.flags:
+                self.open_cell(*cell)
+        if cells and game.status == PLAYING:
+            self.auto_id = self.after(1, self.auto_play)
 
-        for (r, c) in self.opened:
-            count = self.count_mines_around(r, c)
-            color = NUMBER_COLORS.get(count, "black")
-            self.buttons[(r, c)].config(
-                text=str(count) if count else "", bg="#dfe6e9", fg=color, relief="sunken", state="disabled"
-            )
-        for (r, c) in self.flags:
-            self.buttons[(r, c)].config(text="🚩", bg="#f0d14c")
+    def stop_auto(self):
+        if self.auto_id is not None:
+            self.after_cancel(self.auto_id)
+            self.auto_id = None
 
     def back_to_menu(self):
-        self.pack_forget()
         self.controller.back_to_menu()
+
+    # --- Жизненный цикл ---
+    def on_hide(self):
+        # Скрытый экран ничего не открывает и не ждёт: каскад замирает до возвращения,
+        # автоигра и подсказка снимаются
+        self.controller.scheduler.cancel_owner(self)
+        self.clear_hint()
+        self.cancel_advice()
+        self.stop_auto()
+        if self.reveal_id is not None:
+            self.after_cancel(self.reveal_id)
+            self.reveal_id = None
+
+    def on_show(self):
+        if self.reveals and self.reveal_id is None:
+            self.reveal_step()
+
+    def suspend(self):
+        # Каскады доигрываются без отрисовки, и для каждого выполняется его завершение —
+        # проверка победы, запись в историю, очистка журнала; обычная партия уходит
+        # в снимок хранилища (при новой постройке её поднимет load_game), бесконечный
+        # мир — в памяти
+        self.suspending = True
+        reveals, self.reveals = self.reveals, deque()
+        for steps, done in reveals:
+            for _ in steps:
+                pass
+            done()
+        if self.game is None:
+            return None
+        if self.infinite:
+            return {"world": self.game}
+        if self.game.status == PLAYING:
+            self.save_game()
+        return {"saved": True}
+
+    def resume(self, state):
+        if "world" in state:
+            self.game = state["world"]
+            self.infinite = True
+            self.build_board()
+            self.view.redraw()
+
+    def dispose(self):
+        self.on_hide()
+        self.cancel_reveals()
+        self.pool.close()
+        self.advisor.close()
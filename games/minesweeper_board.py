@@ -0,0 +1,299 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate, chain
+
+MINE = 16  # клетка с миной в сетке счётчиков имеет значение не меньше MINE
+# Сетка счётчиков в пробелы и «x»: split() по ним даёт длины серий нулей и ненулей
+ZEROS = bytes([ord("x")] + [ord(" ")] * 255)
+NONZEROS = bytes([ord(" ")] + [ord("x")] * 255)
+NONZERO_BYTE = re.compile(b"[^\x00]")
+# Распаковка байта битового массива в 8 байт по клетке (младший бит — первая клетка)
+UNPACK = [bytes((b >> k) & 1 for k in range(8)) for b in range(256)]
+
+
+class CellSet:
+    # Множество клеток поля, хранимое упакованным битовым массивом: бит на клетку.
+    # Поддерживает тот же интерфейс, что и set из кортежей (r, c).
+    def __init__(self, rows, cols, data=None):
+        self.rows = rows
+        self.cols = cols
+        if data is None:
+            self.bits = bytearray((rows * cols + 7) // 8)
+            self.size = 0
+        else:
+            self.bits = bytearray(data)
+            self.size = int.from_bytes(self.bits, "little").bit_count()
+
+    @classmethod
+    def from_cells(cls, rows, cols, cells):
+        result = cls(rows, cols)
+        for r, c in cells:
+            result.add((r, c))
+        return result
+
+    @classmethod
+    def from_indices(cls, rows, cols, indices):
+        # Индексы должны быть различными
+        result = cls(rows, cols)
+        bits = result.bits
+        for i in indices:
+            bits[i >> 3] |= 1 << (i & 7)
+        result.size = len(indices)
+        return result
+
+    @classmethod
+    def full(cls, rows, cols):
+        n = rows * cols
+        result = cls(rows, cols)
+        result.bits = bytearray(b"\xff" * (n // 8))
+        if n % 8:
+            result.bits.append((1 << (n % 8)) - 1)
+        result.size = n
+        return result
+
+    def __contains__(self, cell):
+        i = cell[0] * self.cols + cell[1]
+        return self.bits[i >> 3] >> (i & 7) & 1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        cols, bits = self.cols, self.bits
+        for m in NONZERO_BYTE.finditer(bits):
+            base = m.start() * 8
+            byte = bits[m.start()]
+            for k in range(8):
+                if byte >> k & 1:
+                    yield divmod(base + k, cols)
+
+    def add(self, cell):
+        i = cell[0] * self.cols + cell[1]
+        if not self.bits[i >> 3] >> (i & 7) & 1:
+            self.bits[i >> 3] |= 1 << (i & 7)
+            self.size += 1
+
+    def discard(self, cell):
+        i = cell[0] * self.cols + cell[1]
+        if self.bits[i >> 3] >> (i & 7) & 1:
+            self.bits[i >> 3] &= ~(1 << (i & 7))
+            self.size -= 1
+
+    def discard_indices(self, indices):
+        # Индексы должны быть различными и входить в множество
+        bits = self.bits
+        for i in indices:
+            bits[i >> 3] &= ~(1 << (i & 7))
+        self.size -= len(indices)
+
+    def count_range(self, i, j):
+        # Сколько клеток с индексами i <= k < j входит в множество
+        if i >= j:
+            return 0
+        x = int.from_bytes(self.bits[i >> 3:((j - 1) >> 3) + 1], "little") >> (i & 7)
+        return (x & ((1 << (j - i)) - 1)).bit_count()
+
+    def add_range(self, i, j):
+        # Добавляет клетки с индексами i <= k < j; вызывающий проверяет, что их там не было
+        if i >= j:
+            return
+        lo, hi = i >> 3, ((j - 1) >> 3) + 1
+        x = int.from_bytes(self.bits[lo:hi], "little") | (((1 << (j - i)) - 1) << (i & 7))
+        self.bits[lo:hi] = x.to_bytes(hi - lo, "little")
+        self.size += j - i
+
+    def remove(self, cell):
+        if cell not in self:
+            raise KeyError(cell)
+        self.discard(cell)
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.size = 0
+
+    def tobytes(self):
+        return bytes(self.bits)
+
+    def unpack(self):
+        # Байт на клетку: 1 — клетка в множестве
+        return b"".join([UNPACK[b] for b in self.bits])[:self.rows * self.cols]
+
+
+class Board:
+    # Неизменяемое поле сапёра: сетка счётчиков и метки связных областей нулей
+    # строятся один раз при генерации. На поле 1000x1000 это десятки миллисекунд
+    # при редких минах и 0.15-0.25 с при десятках тысяч мин: разметка стоит около
+    # 2 мкс на серию нулей, поэтому поле генерируется в фоне (BoardPool).
+    def __init__(self, rows, cols, mines):
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.counts = self._build_counts()
+        self._label_regions()
+
+    # --- Сетка счётчиков ---
+    def _build_counts(self):
+        rows, cols = self.rows, self.cols
+        grid = self.mines.unpack()
+
+        # Каждая строка — большое целое по байту на клетку: сдвиг на байт даёт соседа
+        # слева/справа, а сумма трёх соседних строк — число мин в квадрате 3x3.
+        # Сами мины получают ещё +MINE, так что отдельный проход по ним не нужен.
+        mask = (1 << (8 * cols)) - 1
+        sums, own = [], []
+        for r in range(rows):
+            x = int.from_bytes(grid[r * cols:(r + 1) * cols], "big")
+            sums.append(x + ((x << 8) & mask) + (x >> 8))
+            own.append(x * MINE)
+
+        counts = bytearray(rows * cols)
+        for r in range(rows):
+            total = sums[r] + own[r]
+            if r > 0:
+                total += sums[r - 1]
+            if r + 1 < rows:
+                total += sums[r + 1]
+            counts[r * cols:(r + 1) * cols] = total.to_bytes(cols, "big")
+        return counts
+
+    def count(self, r, c):
+        return self.counts[r * self.cols + c]
+
+    def is_mine(self, r, c):
+        return self.counts[r * self.cols + c] >= MINE
+
+    # --- Области нулей ---
+    def _label_regions(self):
+        # Серии нулей всех строк и метки их областей размечаются один раз при постройке.
+        # Строки обходятся сверху вниз: серия получает метку серии строки выше, которой
+        # касается хотя бы по диагонали, а если касается нескольких — их метки сливаются
+        # (система непересекающихся множеств, корень — меньшая метка, то есть самая
+        # ранняя серия области). Состав области собирается только при нажатии в неё.
+        rows, cols, counts = self.rows, self.cols, self.counts
+        zeros, nonzeros = counts.translate(ZEROS), counts.translate(NONZEROS)
+        self._row_bounds = []   # строка -> границы серий нулей подряд: начало, конец, начало, ...
+        self._row_ids = []      # строка -> метки серий (до слияния)
+        self._parent = parent = []
+        self._first = first = []  # метка -> первая строка области
+        self._last = last = []    # метка -> последняя строка, верна для корня
+        self._borders = {}      # корень -> отрезки области с границей, после первого нажатия
+
+        prev, prev_ids = (), ()
+        for r in range(rows):
+            a = r * cols
+            # Длины серий нулей и ненулей по очереди, накопленные суммы — их границы
+            zero_runs = list(map(len, zeros[a:a + cols].split()))
+            bounds = []
+            if zero_runs:
+                other_runs = list(map(len, nonzeros[a:a + cols].split()))
+                if not counts[a]:
+                    other_runs.insert(0, 0)
+                bounds = list(accumulate(chain.from_iterable(zip(other_runs, zero_runs))))
+            ids = []
+            i, n = 0, len(prev)
+            for j in range(0, len(bounds), 2):
+                s, e = bounds[j], bounds[j + 1]
+                while i < n and prev[i + 1] < s:
+                    i += 2
+                own = -1
+                k = i
+                while k < n and prev[k] <= e:
+                    root = prev_ids[k >> 1]
+                    while parent[root] != root:
+                        parent[root] = root = parent[parent[root]]
+                    if own < 0:
+                        own = root
+                    elif root < own:
+                        parent[own] = root
+                        own = root
+                    elif root > own:
+                        parent[root] = own
+                    k += 2
+                if own < 0:
+                    own = len(parent)
+                    parent.append(own)
+                    first.append(r)
+                    last.append(r)
+                else:
+                    last[own] = r
+                ids.append(own)
+                # Последняя задетая серия может касаться и следующей серии этой строки
+                if k > i:
+                    i = k - 2
+            self._row_bounds.append(bounds)
+            self._row_ids.append(ids)
+            prev, prev_ids = bounds, ids
+
+    def _find(self, x):
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    def region_of(self, r, c):
+        # Метка области нулей клетки (корень её множества) или None для клетки с числом
+        if self.counts[r * self.cols + c] != 0:
+            return None
+        return self._find(self._row_ids[r][bisect_right(self._row_bounds[r], c) >> 1])
+
+    def _members(self, label):
+        # Серии области по строкам: просматриваются только строки между первой и последней
+        find = self._find
+        for r in range(self._first[label], self._last[label] + 1):
+            bounds = self._row_bounds[r]
+            for j, x in enumerate(self._row_ids[r]):
+                if find(x) == label:
+                    yield r, bounds[2 * j], bounds[2 * j + 1]
+
+    def region(self, r, c):
+        # Что открывается одним нажатием: сама клетка либо вся область нулей вместе
+        # с числовой границей — непересекающиеся отрезки (строка, от, до) по порядку
+        # строк. Генератор: отрезки отдаются по мере слияния, и только дойдя до конца,
+        # граница области запоминается для следующих нажатий.
+        label = self.region_of(r, c)
+        if label is None:
+            yield r, c, c + 1
+            return
+        spans = self._borders.get(label)
+        if spans is not None:
+            yield from spans
+            return
+        spans = []
+        for span in self._merge_border(label):
+            spans.append(span)
+            yield span
+        self._borders[label] = spans
+
+    def _merge_border(self, label):
+        # Серии области идут по строкам; строка i собирается из серий строк i-1..i+1,
+        # поэтому отдаётся, как только серии перешли на строку i+2
+        rows, cols = self.rows, self.cols
+        by_row = {}
+        current = None
+        for row, s, e in self._members(label):
+            if row != current:
+                current = row
+                for i in sorted(i for i in by_row if i < row - 1):
+                    yield from self._merge_row(i, by_row.pop(i))
+            lo, hi = max(s - 1, 0), min(e + 1, cols)
+            for i in range(max(row - 1, 0), min(row + 2, rows)):
+                by_row.setdefault(i, []).append((lo, hi))
+        for i in sorted(by_row):
+            yield from self._merge_row(i, by_row[i])
+
+    @staticmethod
+    def _merge_row(row, segs):
+        segs.sort()
+        lo, hi = segs[0]
+        for a, b in segs[1:]:
+            if a <= hi:
+                hi = max(hi, b)
+            else:
+                yield row, lo, hi
+                lo, hi = a, b
+        yield row, lo, hi
+
+    def region_cells(self, r, c):
+        for row, lo, hi in self.region(r, c):
+            for j in range(lo, hi):
+                yield row, j
@@ -0,0 +1,201 @@
+import tkinter as tk
+
+CELL = 26          # размер клетки в пикселях
+VIEW_WIDTH = 1000  # максимальный размер видимой области
+VIEW_HEIGHT = 500
+
+
+class CanvasBoard(tk.Frame):
+    # Режим для больших полей: всё поле рисуется на одном Canvas, клетка под курсором
+    # вычисляется арифметикой, а элементы создаются только для видимых клеток.
+    def __init__(self, parent, game, rows, cols):
+        super().__init__(parent, bg="#e8f0f7")
+        self.game = game
+        self.rows = rows
+        self.cols = cols
+        self.items = {}  # (r, c) -> (прямоугольник, текст) для видимых клеток
+        self.window = (0, 0, 0, 0)
+        self.sync_id = None
+
+        self.canvas = tk.Canvas(
+            self, width=min(cols * CELL, VIEW_WIDTH), height=min(rows * CELL, VIEW_HEIGHT),
+            bg="#e8f0f7", highlightthickness=0, scrollregion=(0, 0, cols * CELL, rows * CELL),
+            xscrollincrement=CELL, yscrollincrement=CELL
+        )
+        self.vbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.hbar = tk.Scrollbar(self, orient="horizontal", command=self.canvas.xview)
+        self.canvas.config(xscrollcommand=self.on_xscroll, yscrollcommand=self.on_yscroll)
+
+        self.canvas.grid(row=0, column=0)
+        if rows * CELL > VIEW_HEIGHT:
+            self.vbar.grid(row=0, column=1, sticky="ns")
+        if cols * CELL > VIEW_WIDTH:
+            self.hbar.grid(row=1, column=0, sticky="ew")
+
+        self.canvas.bind("<Button-1>", self.on_left_click)
+        self.canvas.bind("<Button-3>", self.on_right_click)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.focus_set())
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", self.on_shift_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(3, "units"))
+        self.schedule_sync()
+
+    # --- Ввод ---
+    def cell_at(self, event):
+        c = int(self.canvas.canvasx(event.x) // CELL)
+        r = int(self.canvas.canvasy(event.y) // CELL)
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r, c
+        return None
+
+    def on_left_click(self, event):
+        cell = self.cell_at(event)
+        if cell:
+            self.game.open_cell(*cell)
+
+    def on_right_click(self, event):
+        cell = self.cell_at(event)
+        if cell:
+            self.game.toggle_flag(*cell)
+
+    def on_wheel(self, event):
+        self.canvas.yview_scroll(-3 if event.delta > 0 else 3, "units")
+
+    def on_shift_wheel(self, event):
+        self.canvas.xview_scroll(-3 if event.delta > 0 else 3, "units")
+
+    def on_xscroll(self, first, last):
+        self.hbar.set(first, last)
+        self.schedule_sync()
+
+    def on_yscroll(self, first, last):
+        self.vbar.set(first, last)
+        self.schedule_sync()
+
+    # --- Отрисовка видимой области ---
+    def schedule_sync(self):
+        # Несколько событий прокрутки подряд приводят к одной перерисовке
+        if self.sync_id is None:
+            self.sync_id = self.after_idle(self.sync_viewport)
+
+    def visible_window(self):
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        width = int(self.canvas.cget("width"))
+        height = int(self.canvas.cget("height"))
+        r0, c0 = int(y0 // CELL), int(x0 // CELL)
+        r1 = min(self.rows, int((y0 + height) // CELL) + 1)
+        c1 = min(self.cols, int((x0 + width) // CELL) + 1)
+        return r0, r1, c0, c1
+
+    def cell_origin(self, r, c):
+        return c * CELL, r * CELL
+
+    def sync_viewport(self):
+        self.sync_id = None
+        window = self.visible_window()
+        if window == self.window:
+            return
+        self.window = r0, r1, c0, c1 = window
+
+        for cell in [cell for cell in self.items if not (r0 <= cell[0] < r1 and c0 <= cell[1] < c1)]:
+            rect, text = self.items.pop(cell)
+            self.canvas.delete(rect, text)
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if (r, c) not in self.items:
+                    self.create_cell(r, c)
+
+    def create_cell(self, r, c):
+        x, y = self.cell_origin(r, c)
+        rect = self.canvas.create_rectangle(x + 1, y + 1, x + CELL - 1, y + CELL - 1, outline="#9fb8cc")
+        text = self.canvas.create_text(x + CELL / 2, y + CELL / 2, font=("Arial", 10, "bold"))
+        self.items[(r, c)] = (rect, text)
+        self.paint(r, c)
+
+    def paint(self, r, c):
+        rect, text = self.items[(r, c)]
+        label, bg, fg, opened = self.game.cell_style(r, c)
+        self.canvas.itemconfig(rect, fill=bg, outline="#b2bec3" if opened else "#9fb8cc")
+        self.canvas.itemconfig(text, text=label, fill=fg)
+
+    def update_cells(self, cells):
+        # Перерисовываются только изменившиеся клетки, попавшие в видимую область
+        if len(cells) > len(self.items):
+            self.redraw()
+            return
+        items = self.items
+        for cell in cells:
+            if cell in items:
+                self.paint(*cell)
+
+    def redraw(self):
+        for r, c in self.items:
+            self.paint(r, c)
+
+
+class InfiniteCanvasBoard(CanvasBoard):
+    # Бесконечное поле: вместо scrollregion — смещение вида в мировых пикселях.
+    # Вид двигается перетаскиванием, стрелками и колесом; координаты клеток мировые.
+    def __init__(self, parent, game, center):
+        tk.Frame.__init__(self, parent, bg="#e8f0f7")
+        self.game = game
+        self.items = {}
+        self.window = None
+        self.sync_id = None
+        self.press = None
+        self.dragged = False
+        self.ox = center[1] * CELL - VIEW_WIDTH // 2
+        self.oy = center[0] * CELL - VIEW_HEIGHT // 2
+
+        self.canvas = tk.Canvas(self, width=VIEW_WIDTH, height=VIEW_HEIGHT, bg="#e8f0f7", highlightthickness=0)
+        self.canvas.pack()
+
+        self.canvas.bind("<ButtonPress-1>", self.on_press)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+        self.canvas.bind("<Button-3>", self.on_right_click)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.focus_set())
+        self.canvas.bind("<MouseWheel>", lambda e: self.pan(0, -3 * CELL if e.delta > 0 else 3 * CELL))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.pan(-3 * CELL if e.delta > 0 else 3 * CELL, 0))
+        self.canvas.bind("<Button-4>", lambda e: self.pan(0, -3 * CELL))
+        self.canvas.bind("<Button-5>", lambda e: self.pan(0, 3 * CELL))
+        for key, dx, dy in (("Left", -1, 0), ("Right", 1, 0), ("Up", 0, -1), ("Down", 0, 1)):
+            self.canvas.bind(f"<{key}>", lambda e, dx=dx, dy=dy: self.pan(dx * 3 * CELL, dy * 3 * CELL))
+        self.schedule_sync()
+
+    def cell_at(self, event):
+        return int((event.y + self.oy) // CELL), int((event.x + self.ox) // CELL)
+
+    # Короткое нажатие открывает клетку, перетаскивание двигает вид
+    def on_press(self, event):
+        self.press = (event.x, event.y)
+        self.dragged = False
+
+    def on_drag(self, event):
+        if self.press is None:
+            return
+        dx, dy = self.press[0] - event.x, self.press[1] - event.y
+        if not self.dragged and abs(dx) + abs(dy) < 5:
+            return
+        self.dragged = True
+        self.press = (event.x, event.y)
+        self.pan(dx, dy)
+
+    def on_release(self, event):
+        if self.press is not None and not self.dragged:
+            self.game.open_cell(*self.cell_at(event))
+        self.press = None
+
+    def pan(self, dx, dy):
+        self.ox += dx
+        self.oy += dy
+        self.canvas.move("all", -dx, -dy)
+        self.schedule_sync()
+
+    def visible_window(self):
+        r0, c0 = self.oy // CELL, self.ox // CELL
+        return r0, (self.oy + VIEW_HEIGHT) // CELL + 1, c0, (self.ox + VIEW_WIDTH) // CELL + 1
+
+    def cell_origin(self, r, c):
+        return c * CELL - self.ox, r * CELL - self.oy
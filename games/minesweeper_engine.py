@@ -0,0 +1,128 @@
+import random
+
+from games.minesweeper_board import Board, CellSet
+
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+
+def new_seed():
+    return random.getrandbits(32)
+
+
+def place_mines(rows, cols, mine_count, seed, safe=None):
+    # Точная выборка без повторных попыток: mine_count различных клеток вне зоны safe.
+    # На плотных полях выбираются пустые клетки — их меньше, чем мин.
+    # Поле полностью определяется (rows, cols, mine_count, seed, safe).
+    rng = random.Random(seed)
+    n = rows * cols
+    excluded = set()
+    if safe is not None:
+        r, c = safe
+        excluded = {i * cols + j
+                    for i in range(max(r - 1, 0), min(r + 2, rows))
+                    for j in range(max(c - 1, 0), min(c + 2, cols))}
+        if n - len(excluded) < mine_count:
+            excluded = {r * cols + c}
+
+    def pick(k):
+        # Первые k неисключённых элементов случайной выборки — равномерный k-набор
+        # из свободных клеток
+        picks = rng.sample(range(n), k + len(excluded))
+        if excluded:
+            picks = [i for i in picks if i not in excluded][:k]
+        return picks
+
+    free = n - len(excluded)
+    if mine_count <= free // 2:
+        return CellSet.from_indices(rows, cols, pick(mine_count))
+    mines = CellSet.full(rows, cols)
+    mines.discard_indices(pick(free - mine_count) + list(excluded))
+    return mines
+
+
+class MinesweeperGame:
+    # Правила сапёра без интерфейса: генерация поля, открытие клеток, флаги,
+    # победа и поражение. GameFrame только рисует это состояние.
+    def __init__(self, rows, cols, mine_count, seed=None, first_click_safe=False,
+                 mines=None, opened=None, flags=None):
+        if rows <= 0 or cols <= 0 or mine_count <= 0:
+            raise ValueError("board size and mine count must be positive")
+        if mine_count >= rows * cols:
+            raise ValueError("mine count must be less than the number of cells")
+        self.rows = rows
+        self.cols = cols
+        self.mine_count = mine_count
+        if mines is None:
+            seed = seed if seed is not None else new_seed()
+            mines = place_mines(rows, cols, mine_count, seed)
+        self.seed = seed
+        self.first_click_safe = first_click_safe
+        self.mines = mines
+        self.opened = opened if opened is not None else CellSet(rows, cols)
+        self.flags = flags if flags is not None else CellSet(rows, cols)
+        self.board = Board(rows, cols, self.mines)
+        self.status = PLAYING
+        self.exploded = None
+
+    def open(self, r, c):
+        # Возвращает список открывшихся клеток; при попадании на мину игра проиграна
+        return [cell for part in self.open_steps(r, c) for cell in part]
+
+    def open_steps(self, r, c):
+        # То же открытие по частям: генератор отдаёт клетки, открытые очередной строкой
+        # области, и интерфейс может растянуть большой каскад на несколько итераций
+        # цикла событий. Между частями можно ставить флаги и открывать другие клетки —
+        # уже открытые и помеченные клетки пропускаются.
+        if self.status != PLAYING or (r, c) in self.opened or (r, c) in self.flags:
+            return
+        self.secure_first_click(r, c)
+        if self.board.is_mine(r, c):
+            self.status = LOST
+            self.exploded = (r, c)
+            return
+
+        # Область нулей открывается отрезками строк, без рекурсии
+        opened, flags, cols = self.opened, self.flags, self.cols
+        for row, lo, hi in self.board.region(r, c):
+            if self.status != PLAYING:
+                return
+            i, j = row * cols + lo, row * cols + hi
+            if not opened.count_range(i, j) and not flags.count_range(i, j):
+                # Обычный случай — отрезок ещё нетронут и отмечается целиком
+                opened.add_range(i, j)
+                part = [(row, k) for k in range(lo, hi)]
+            else:
+                part = [(row, k) for k in range(lo, hi) if (row, k) not in opened and (row, k) not in flags]
+                for cell in part:
+                    opened.add(cell)
+            if part:
+                yield part
+        if self.status == PLAYING and len(opened) + self.mine_count == self.rows * self.cols:
+            self.status = WON
+
+    def secure_first_click(self, r, c):
+        # Первый ход без мин вокруг: поле перегенерируется с тем же сидом,
+        # так что (seed, первая клетка) однозначно задают его. True, если мины переставлены
+        if not (self.first_click_safe and not self.opened and self.board.count(r, c)):
+            return False
+        self.mines = place_mines(self.rows, self.cols, self.mine_count, self.seed, safe=(r, c))
+        self.board = Board(self.rows, self.cols, self.mines)
+        return True
+
+    def set_flag(self, r, c, value):
+        if self.status != PLAYING or (r, c) in self.opened:
+            return False
+        if value:
+            if (r, c) in self.flags:
+                return False
+            self.flags.add((r, c))
+        else:
+            if (r, c) not in self.flags:
+                return False
+            self.flags.discard((r, c))
+        return True
+
+    def toggle_flag(self, r, c):
+        return self.set_flag(r, c, (r, c) not in self.flags)
@@ -0,0 +1,151 @@
+from collections import OrderedDict, deque
+
+from games.minesweeper_board import Board, CellSet
+from games.minesweeper_engine import PLAYING, LOST, place_mines
+
+CHUNK = 32           # сторона участка в клетках
+DENSITY = 0.16       # доля мин в каждом участке
+CACHE_CHUNKS = 256   # сколько участков держать в памяти целиком
+MINE_CACHE = 1024    # сколько наборов мин держать для подсчёта границ
+MAX_CASCADE = 200000  # предохранитель: при малой плотности области нулей бесконечны
+STEP_CELLS = 1024     # клеток в одной части постепенного открытия
+
+
+class Chunk:
+    # Участок мира: счётчики (с рамкой из соседних участков) и изменения игрока
+    def __init__(self, board, opened, flags):
+        self.board = board
+        self.opened = opened
+        self.flags = flags
+
+
+class InfiniteWorld:
+    # Бесконечное поле из участков CHUNK x CHUNK. Мины участка однозначно задаются
+    # сидом мира и координатами участка, поэтому участок можно выбросить из памяти
+    # и построить заново — сохраняются только открытые клетки и флаги.
+    def __init__(self, seed, density=DENSITY, cache_size=CACHE_CHUNKS):
+        self.seed = seed
+        self.mines_per_chunk = round(density * CHUNK * CHUNK)
+        self.cache_size = cache_size
+        self.chunks = OrderedDict()      # (cy, cx) -> Chunk, порядок — давность использования
+        self.mine_cache = OrderedDict()  # (cy, cx) -> CellSet мин участка
+        self.saved = {}                  # (cy, cx) -> (opened, flags) выгруженных участков
+        self.start = (CHUNK // 2, CHUNK // 2)  # первая клетка, вокруг неё мин нет
+        self.status = PLAYING
+        self.exploded = None
+        self.opened_count = 0
+
+    # --- Участки ---
+    def chunk_mines(self, cy, cx):
+        key = (cy, cx)
+        mines = self.mine_cache.get(key)
+        if mines is None:
+            safe = self.start if key == (0, 0) else None
+            mines = place_mines(CHUNK, CHUNK, self.mines_per_chunk, f"{self.seed}:{cy}:{cx}", safe)
+            self.mine_cache[key] = mines
+            if len(self.mine_cache) > MINE_CACHE:
+                self.mine_cache.popitem(last=False)
+        else:
+            self.mine_cache.move_to_end(key)
+        return mines
+
+    def chunk(self, cy, cx):
+        key = (cy, cx)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        # Поле участка с рамкой в одну клетку: мины рамки берутся из соседей,
+        # поэтому числа на краях участка верные
+        size = CHUNK + 2
+        picks = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                for r, c in self.chunk_mines(cy + dy, cx + dx):
+                    pr, pc = r + dy * CHUNK + 1, c + dx * CHUNK + 1
+                    if 0 <= pr < size and 0 <= pc < size:
+                        picks.append(pr * size + pc)
+        board = Board(size, size, CellSet.from_indices(size, size, picks))
+
+        saved = self.saved.pop(key, None)
+        if saved:
+            opened, flags = CellSet(CHUNK, CHUNK, saved[0]), CellSet(CHUNK, CHUNK, saved[1])
+        else:
+            opened, flags = CellSet(CHUNK, CHUNK), CellSet(CHUNK, CHUNK)
+        chunk = self.chunks[key] = Chunk(board, opened, flags)
+        while len(self.chunks) > self.cache_size:
+            self.evict()
+        return chunk
+
+    def evict(self):
+        key, chunk = self.chunks.popitem(last=False)
+        if chunk.opened or chunk.flags:
+            self.saved[key] = (chunk.opened.tobytes(), chunk.flags.tobytes())
+
+    def locate(self, r, c):
+        cy, y = divmod(r, CHUNK)
+        cx, x = divmod(c, CHUNK)
+        return self.chunk(cy, cx), y, x
+
+    # --- Клетки в мировых координатах ---
+    def count(self, r, c):
+        chunk, y, x = self.locate(r, c)
+        return chunk.board.count(y + 1, x + 1)
+
+    def is_mine(self, r, c):
+        chunk, y, x = self.locate(r, c)
+        return chunk.board.is_mine(y + 1, x + 1)
+
+    def is_opened(self, r, c):
+        chunk, y, x = self.locate(r, c)
+        return (y, x) in chunk.opened
+
+    def is_flagged(self, r, c):
+        chunk, y, x = self.locate(r, c)
+        return (y, x) in chunk.flags
+
+    def open(self, r, c):
+        return [cell for part in self.open_steps(r, c) for cell in part]
+
+    def open_steps(self, r, c):
+        # Обход в ширину по мировым координатам — каскад свободно пересекает границы участков.
+        # Открытые клетки отдаются частями по STEP_CELLS, как в MinesweeperGame.open_steps.
+        if self.status != PLAYING or self.is_opened(r, c) or self.is_flagged(r, c):
+            return
+        if self.is_mine(r, c):
+            self.status = LOST
+            self.exploded = (r, c)
+            return
+
+        part = []
+        total = 0
+        queue = deque([(r, c)])
+        while queue and total < MAX_CASCADE and self.status == PLAYING:
+            r, c = queue.popleft()
+            chunk, y, x = self.locate(r, c)
+            if (y, x) in chunk.opened or (y, x) in chunk.flags:
+                continue
+            chunk.opened.add((y, x))
+            self.opened_count += 1
+            total += 1
+            part.append((r, c))
+            if chunk.board.count(y + 1, x + 1) == 0:
+                queue.extend((i, j) for i in (r - 1, r, r + 1) for j in (c - 1, c, c + 1))
+            if len(part) >= STEP_CELLS:
+                yield part
+                part = []
+        if part:
+            yield part
+
+    def toggle_flag(self, r, c):
+        if self.status != PLAYING:
+            return False
+        chunk, y, x = self.locate(r, c)
+        if (y, x) in chunk.opened:
+            return False
+        if (y, x) in chunk.flags:
+            chunk.flags.discard((y, x))
+        else:
+            chunk.flags.add((y, x))
+        return True
@@ -0,0 +1,55 @@
+import threading
+
+from games.minesweeper_engine import MinesweeperGame
+
+POOL_SIZE = 2  # сколько готовых полей держать для текущих настроек
+
+
+class BoardPool:
+    # Фоновый пул заранее сгенерированных полей для текущих размеров и числа мин,
+    # чтобы «Бастау» и «Қайта бастау» не ждали генерации в потоке Tk.
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self.config = None
+        self.ready = []
+        self.closed = False
+        self.lock = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="mina-pool", daemon=True)
+        self.thread.start()
+
+    def prepare(self, rows, cols, mine_count):
+        # Переключает пул на новые настройки; старые поля выбрасываются
+        config = (rows, cols, mine_count)
+        with self.lock:
+            if config != self.config:
+                self.config = config
+                self.ready = []
+                self.lock.notify()
+
+    def take(self, rows, cols, mine_count):
+        # Готовое поле или None, если для этих настроек пул ещё пуст
+        self.prepare(rows, cols, mine_count)
+        with self.lock:
+            if not self.ready:
+                return None
+            game = self.ready.pop(0)
+            self.lock.notify()
+            return game
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.lock.notify()
+
+    def run(self):
+        while True:
+            with self.lock:
+                while not self.closed and (self.config is None or len(self.ready) >= self.size):
+                    self.lock.wait()
+                if self.closed:
+                    return
+                config = self.config
+            game = MinesweeperGame(*config)
+            with self.lock:
+                if config == self.config and len(self.ready) < self.size:
+                    self.ready.append(game)
@@ -0,0 +1,148 @@
+import json
+import os
+import struct
+
+from games.minesweeper_board import CellSet
+from games.minesweeper_engine import MinesweeperGame
+from games.storage import storage
+
+SNAPSHOT_KEY = "minesweeper/snapshot"
+JOURNAL_KEY = "minesweeper/journal"
+
+# Двоичный снимок: заголовок, затем битовые массивы мин, открытых клеток и флагов
+MAGIC = b"MINA"
+VERSION = 2
+HEADER = struct.Struct("<4sHIIIQQ")  # сигнатура, версия, rows, cols, mine_count, seq, seed
+HEADER_V1 = struct.Struct("<4sHIIIQ")  # версия 1 — без сида
+
+
+def read_snapshot(buffer):
+    magic, version = struct.unpack_from("<4sH", buffer, 0)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError("unsupported minesweeper save format")
+    if version == 1:
+        _, _, rows, cols, mine_count, seq = HEADER_V1.unpack_from(buffer, 0)
+        seed, offset = None, HEADER_V1.size
+    else:
+        _, _, rows, cols, mine_count, seq, seed = HEADER.unpack_from(buffer, 0)
+        offset = HEADER.size
+    size = (rows * cols + 7) // 8
+    state = {"rows": rows, "cols": cols, "mine_count": mine_count, "seq": seq, "seed": seed}
+    for key in ("mines", "opened", "flags"):
+        state[key] = CellSet(rows, cols, buffer[offset:offset + size])
+        offset += size
+    return state
+
+
+def pack_snapshot(state):
+    return (HEADER.pack(MAGIC, VERSION, state["rows"], state["cols"], state["mine_count"], state["seq"],
+                        state["seed"] or 0)
+            + bytes(state["mines"]) + bytes(state["opened"]) + bytes(state["flags"]))
+
+
+def game_state(game):
+    return {
+        "rows": game.rows,
+        "cols": game.cols,
+        "mine_count": game.mine_count,
+        "seed": game.seed if game.seed is not None else 0,
+        "mines": game.mines.tobytes(),
+        "opened": game.opened.tobytes(),
+        "flags": game.flags.tobytes(),
+    }
+
+
+def restore_game(state, moves):
+    # Партия из снимка с повтором ходов, записанных после него
+    game = MinesweeperGame(state["rows"], state["cols"], state["mine_count"], seed=state["seed"],
+                           mines=state["mines"], opened=state["opened"], flags=state["flags"])
+    for kind, r, c, *rest in moves:
+        if kind == "o" and not game.board.is_mine(r, c):
+            game.open(r, c)
+        elif kind == "f":
+            game.set_flag(r, c, rest[0])
+    return game
+
+
+def read_legacy(path):
+    # Старый формат mina_save.json со списками координат
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    rows, cols = state["rows"], state["cols"]
+    for key in ("mines", "opened", "flags"):
+        state[key] = CellSet.from_cells(rows, cols, state[key])
+    state.setdefault("seq", 0)
+    state.setdefault("seed", None)
+    return state
+
+
+class SaveJournal:
+    # Сохранение сапёра: снимок состояния плюс журнал ходов в общем хранилище.
+    # Ход — одно дописывание строки к журналу, снимок вместе с очисткой журнала —
+    # одна атомарная запись. На диск пишет фоновый поток хранилища, не поток Tk.
+    def __init__(self, legacy_files=(), store=None):
+        self.store = store or storage()
+        self.seq = 0
+        self.store.migrate("minesweeper-save", lambda: self.legacy_ops(*legacy_files))
+
+    # --- Вызывается из потока Tk ---
+    def record(self, *move):
+        self.seq += 1
+        self.store.append_blob(JOURNAL_KEY, (" ".join(map(str, (self.seq,) + move)) + "\n").encode())
+
+    def snapshot(self, state):
+        # Ходы с номером не больше seq снимка при загрузке пропускаются, а снимок и
+        # очистка журнала фиксируются одной транзакцией
+        state["seq"] = self.seq
+        self.store.write([("blob", SNAPSHOT_KEY, pack_snapshot(state)), ("blob", JOURNAL_KEY, b"")])
+
+    def clear(self):
+        self.store.write([("delete", SNAPSHOT_KEY), ("delete", JOURNAL_KEY)])
+
+    def flush(self):
+        self.store.flush()
+
+    def load(self):
+        # Возвращает снимок и ходы журнала, сделанные после него
+        data = self.store.get_blob(SNAPSHOT_KEY)
+        if data is None:
+            return None, []
+        state = read_snapshot(data)
+        last = state["seq"]
+        journal = self.store.get_blob(JOURNAL_KEY, b"")
+        if journal and not journal.endswith(b"\n"):
+            # Следующий ход дописался бы к оборванной строке — она отрезается и в хранилище
+            journal = journal[:journal.rfind(b"\n") + 1]
+            self.store.set_blob(JOURNAL_KEY, journal)
+        moves = []
+        for line in journal.decode("ascii").splitlines():
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            seq = int(parts[0])
+            if seq > last:
+                moves.append((parts[1],) + tuple(int(x) for x in parts[2:]))
+                last = seq
+        self.seq = last
+        return state, moves
+
+    # --- Разовый перенос из файлов прежних версий ---
+    def legacy_ops(self, snapshot_file=None, journal_file=None, legacy_file=None):
+        if snapshot_file and os.path.exists(snapshot_file):
+            with open(snapshot_file, "rb") as f:
+                snapshot = f.read()
+            read_snapshot(snapshot)  # битый файл не переносим
+        elif legacy_file and os.path.exists(legacy_file):
+            state = read_legacy(legacy_file)
+            for key in ("mines", "opened", "flags"):
+                state[key] = state[key].tobytes()
+            snapshot = pack_snapshot(state)
+        else:
+            return []
+        journal = b""
+        if journal_file and os.path.exists(journal_file):
+            with open(journal_file, "rb") as f:
+                journal = f.read()
+            # Оборванная при сбое последняя строка отбрасывается: дописывать следующие ходы к ней нельзя
+            journal = journal[:journal.rfind(b"\n") + 1]
+        return [("blob", SNAPSHOT_KEY, snapshot), ("blob", JOURNAL_KEY, journal)]
@@ -0,0 +1,149 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from games.minesweeper_board import CellSet
+from games.minesweeper_engine import MinesweeperGame, PLAYING, WON
+from games.minesweeper_solver import Frontier, grade
+
+CHUNK = 500  # партий в одном задании для процесса-исполнителя
+
+
+# --- Стратегии: по состоянию игры возвращают список клеток для открытия ---
+# Стратегия создаётся на партию; opened() получает клетки, открытые её ходами
+class RandomStrategy:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, game):
+        while True:
+            cell = (self.rng.randrange(game.rows), self.rng.randrange(game.cols))
+            if cell not in game.opened:
+                return [cell]
+
+    def opened(self, cells):
+        pass
+
+
+class SolverStrategy:
+    # Граница ведётся по ходу партии, как в Advisor, а не строится заново на каждый ход.
+    # Заводится после первого хода: безопасный первый ход мог переставить мины
+    def __init__(self, rng):
+        self.frontier = None
+
+    def choose(self, game):
+        if not game.opened:
+            return [(game.rows // 2, game.cols // 2)]
+        if self.frontier is None:
+            self.frontier = Frontier(game.rows, game.cols, game.mine_count, game.board.count,
+                                     CellSet(game.rows, game.cols, game.opened.tobytes()))
+        result = self.frontier.analyze()
+        safe = sorted(result.safe)
+        return safe if safe else [result.best_guess()]
+
+    def opened(self, cells):
+        if self.frontier is not None:
+            self.frontier.add(cells)
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+}
+
+
+def play(seed, rows, cols, mine_count, strategy, first_click_safe=False, graded=False):
+    # Одна партия с воспроизводимым полем; возвращает (выиграна ли, ходов, оценка поля).
+    # Оценка — grade() от центра того поля, на котором шла партия, или None
+    rng = random.Random(seed)
+    game = MinesweeperGame(rows, cols, mine_count, seed=seed, first_click_safe=first_click_safe)
+    player = STRATEGIES[strategy](rng)
+    moves = 0
+    while game.status == PLAYING:
+        for cell in player.choose(game):
+            player.opened(game.open(*cell))
+            moves += 1
+            if game.status != PLAYING:
+                break
+    verdict = grade(game.board, mine_count, (rows // 2, cols // 2)) if graded else None
+    return game.status == WON, moves, verdict
+
+
+def play_chunk(first_seed, count, rows, cols, mine_count, strategy, first_click_safe, graded=False):
+    wins = moves = logical = guesses = 0
+    for seed in range(first_seed, first_seed + count):
+        won, n, verdict = play(seed, rows, cols, mine_count, strategy, first_click_safe, graded)
+        wins += won
+        moves += n
+        if verdict is not None:
+            solved, g, _ = verdict
+            logical += solved and not g
+            guesses += g
+    return count, wins, moves, logical, guesses
+
+
+def run_batch(games, rows, cols, mine_count, strategy="solver", workers=None, seed=0, first_click_safe=False,
+              graded=False):
+    # Партии раздаются процессам пачками по CHUNK; партия i играется с сидом seed + i,
+    # поэтому результат не зависит от числа процессов
+    workers = workers or os.cpu_count() or 1
+    chunks = [(seed + i, min(CHUNK, games - i)) for i in range(0, games, CHUNK)]
+    played = wins = moves = logical = guesses = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, first, count, rows, cols, mine_count, strategy, first_click_safe, graded)
+                   for first, count in chunks]
+        for future in futures:
+            n, w, m, lg, g = future.result()
+            played += n
+            wins += w
+            moves += m
+            logical += lg
+            guesses += g
+    elapsed = time.perf_counter() - started
+
+    rate = wins / played if played else 0.0
+    stats = {
+        "games": played,
+        "wins": wins,
+        "win_rate": rate,
+        "ci95": 1.96 * math.sqrt(rate * (1 - rate) / played) if played else 0.0,
+        "moves_per_game": moves / played if played else 0.0,
+        "elapsed": elapsed,
+        "games_per_sec": played / elapsed if elapsed else 0.0,
+    }
+    if graded:
+        # Сколько полей решаются от центра без единого угадывания
+        stats["logical_rate"] = logical / played if played else 0.0
+        stats["guesses_per_board"] = guesses / played if played else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная симуляция сапёра без интерфейса")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=9)
+    parser.add_argument("--cols", type=int, default=9)
+    parser.add_argument("--mines", type=int, default=10)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="solver")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--safe-first", action="store_true", help="первый ход всегда без мин вокруг")
+    parser.add_argument("--grade", action="store_true", help="оценить поля: решаются ли они без угадываний")
+    args = parser.parse_args()
+
+    stats = run_batch(args.games, args.rows, args.cols, args.mines, args.strategy, args.workers, args.seed,
+                      args.safe_first, args.grade)
+    print(f"{stats['games']} партий за {stats['elapsed']:.2f} с — {stats['games_per_sec']:.0f} партий/с")
+    print(f"побед: {stats['wins']} ({stats['win_rate']:.2%} ± {stats['ci95']:.2%}), "
+          f"ходов на партию: {stats['moves_per_game']:.1f}")
+    if args.grade:
+        print(f"полей без угадываний: {stats['logical_rate']:.2%}, "
+              f"угадываний на поле: {stats['guesses_per_board']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
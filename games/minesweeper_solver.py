@@ -0,0 +1,402 @@
+import queue
+import threading
+from functools import lru_cache
+from math import exp, lgamma
+
+from games.minesweeper_board import CellSet
+
+MAX_VARS = 60        # компоненты крупнее сразу оцениваются приближённо
+MAX_NODES = 20000    # предел узлов перебора на одну компоненту
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class Analysis:
+    # Результат анализа позиции: гарантированно безопасные клетки и мины,
+    # вероятности мин на границе и вероятность для остальных закрытых клеток.
+    def __init__(self, safe, mines, probabilities, other, other_cells, exact):
+        self.safe = safe
+        self.mines = mines
+        self.probabilities = probabilities
+        self.other = other
+        self.other_cells = other_cells
+        self.exact = exact
+
+    def best_guess(self):
+        # Клетка с наименьшей вероятностью мины
+        if self.safe:
+            return min(self.safe)
+        best, best_p = None, 2.0
+        for cell, p in self.probabilities.items():
+            if p < best_p:
+                best, best_p = cell, p
+        if self.other_cells and self.other < best_p:
+            best = self.other_cells[0]
+        return best
+
+
+def neighbors(r, c, rows, cols):
+    for i in range(max(r - 1, 0), min(r + 2, rows)):
+        for j in range(max(c - 1, 0), min(c + 2, cols)):
+            if i != r or j != c:
+                yield i, j
+
+
+def analyze(rows, cols, mine_count, opened, count):
+    # Разовый анализ позиции: opened — множество открытых клеток, count(r, c) — число
+    # на открытой клетке. Флаги игрока не учитываются: они могут быть ошибочными.
+    return Frontier(rows, cols, mine_count, count, CellSet(rows, cols, opened.tobytes())).analyze()
+
+
+class Frontier:
+    # Граница открытой области, которая обновляется по мере открытия клеток:
+    # ограничения — открытые клетки с числом и их закрытые соседи. Анализ строится
+    # по ней, не перебирая всю открытую область и не просматривая поле заново.
+    def __init__(self, rows, cols, mine_count, count, opened=None):
+        self.rows = rows
+        self.cols = cols
+        self.mine_count = mine_count
+        self.count = count
+        self.opened = CellSet(rows, cols)
+        self.constraints = {}  # открытая клетка с числом -> [закрытые соседи, число]
+        self.watch = {}        # закрытая клетка границы -> открытые клетки с числом рядом
+        self.cursor = 0        # до этого индекса закрытых клеток вне границы нет
+        if opened is not None:
+            self.opened = opened
+            self.add(opened)
+
+    def add(self, cells):
+        # Новые открытые клетки уходят с границы; клетка с числом и закрытыми
+        # соседями добавляет ограничение
+        rows, cols, count = self.rows, self.cols, self.count
+        opened, constraints, watch = self.opened, self.constraints, self.watch
+        cells = list(cells)
+        for cell in cells:
+            opened.add(cell)
+        for cell in cells:
+            for owner in watch.pop(cell, ()):
+                entry = constraints.get(owner)
+                if entry is not None:
+                    entry[0].discard(cell)
+                    if not entry[0]:
+                        del constraints[owner]
+            n = count(*cell)
+            if not n:
+                continue
+            rest = {x for x in neighbors(*cell, rows, cols) if x not in opened}
+            if rest:
+                constraints[cell] = [rest, n]
+                for x in rest:
+                    watch.setdefault(x, []).append(cell)
+
+    def free_cells(self, limit=16):
+        # Несколько закрытых клеток вне границы — кандидаты на угадывание. Клетка,
+        # открывшись или попав на границу, свободной уже не станет, поэтому просмотр
+        # продолжается с первой свободной клетки прошлого раза
+        opened, watch, cols = self.opened, self.watch, self.cols
+        result = []
+        i, n = self.cursor, self.rows * cols
+        while i < n and len(result) < limit:
+            cell = divmod(i, cols)
+            if cell not in opened and cell not in watch:
+                if not result:
+                    self.cursor = i
+                result.append(cell)
+            i += 1
+        if not result:
+            self.cursor = n
+        return result
+
+    def analyze(self):
+        constraints = [(frozenset(cells), n) for cells, n in self.constraints.values()]
+        safe, mines = propagate(constraints)
+        reduced = {}
+        for cells, need in constraints:
+            rest = cells - safe - mines
+            if rest:
+                reduced[rest] = need - len(cells & mines)
+
+        probabilities, expected, exact = {}, 0.0, True
+        components = [solve_component(comp) for comp in split_components(reduced)]
+        free = self.rows * self.cols - len(self.opened) - len(self.watch)
+        remaining = self.mine_count - len(mines)
+
+        if components:
+            probabilities, expected, exact = combine(components, free, remaining)
+        else:
+            expected = float(remaining)
+        other = expected / free if free > 0 else 1.0
+
+        other_cells = self.free_cells()
+        if free > 0 and other == 0.0:
+            safe |= set(other_cells)
+        return Analysis(safe, mines, probabilities, other, other_cells, exact)
+
+
+class Advisor:
+    # Анализ для подсказки и автоигры в отдельном потоке. Поток Tk передаёт ему
+    # новую позицию и открывшиеся клетки, а результат забирает через poll(), так что
+    # ни анализ, ни поддержка границы окно не останавливают.
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.generation = 0
+        self.thread = threading.Thread(target=self.run, name="mina-solver", daemon=True)
+        self.thread.start()
+
+    def reset(self, game):
+        # Новая позиция: копия открытых клеток, граница по ней строится в потоке
+        self.generation += 1
+        self.requests.put(("reset", (game.rows, game.cols, game.mine_count, game.board.count,
+                                     game.opened.tobytes())))
+
+    def opened(self, cells):
+        self.requests.put(("open", list(cells)))
+
+    def request(self):
+        # Анализ видит все клетки, переданные до запроса
+        self.generation += 1
+        self.requests.put(("analyze", self.generation))
+
+    def poll(self):
+        # Analysis для последнего запроса или None, если анализ ещё идёт
+        while True:
+            try:
+                generation, result = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self.generation:
+                return result
+
+    def cancel(self):
+        # Идущий анализ не прерывается — его результат просто отбрасывается
+        self.generation += 1
+
+    def close(self):
+        self.requests.put(("close", None))
+
+    def run(self):
+        frontier = None
+        while True:
+            kind, payload = self.requests.get()
+            if kind == "close":
+                return
+            if kind == "reset":
+                rows, cols, mine_count, count, bits = payload
+                frontier = Frontier(rows, cols, mine_count, count, CellSet(rows, cols, bits))
+            elif frontier is None:
+                continue
+            elif kind == "open":
+                frontier.add(payload)
+            else:
+                self.results.put((payload, frontier.analyze()))
+
+
+# --- Тривиальные выводы ---
+def propagate(constraints):
+    # «Все соседи — мины» и «мин больше нет» до неподвижной точки
+    safe, mines = set(), set()
+    changed = True
+    while changed:
+        changed = False
+        for cells, need in constraints:
+            rest = cells - safe - mines
+            if not rest:
+                continue
+            left = need - len(cells & mines)
+            if left == 0:
+                safe |= rest
+                changed = True
+            elif left == len(rest):
+                mines |= rest
+                changed = True
+    return safe, mines
+
+
+# --- Независимые компоненты ---
+def split_components(constraints):
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for cells in constraints:
+        first = None
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            if first is None:
+                first = find(cell)
+            else:
+                root = find(cell)
+                if root != first:
+                    parent[root] = first
+
+    groups = {}
+    for cells, need in constraints.items():
+        root = find(next(iter(cells)))
+        groups.setdefault(root, []).append((tuple(sorted(cells)), need))
+    # Канонический вид нужен для кэша: неизменившиеся компоненты не пересчитываются
+    return [tuple(sorted(group)) for group in groups.values()]
+
+
+@lru_cache(maxsize=4096)
+def solve_component(constraints):
+    # Перебор с отсечениями: для каждого числа мин k — число решений и сколько
+    # из них ставят мину в каждую переменную. Возвращает (клетки, counts, hits, exact).
+    order, index, seen = [], {}, set()
+    cons_of = {}
+    for ci, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            cons_of.setdefault(cell, []).append(ci)
+    # Переменные в порядке обхода графа ограничений — так отсечения срабатывают раньше
+    queue = [0]
+    seen.add(0)
+    while queue:
+        ci = queue.pop(0)
+        for cell in constraints[ci][0]:
+            if cell not in index:
+                index[cell] = len(order)
+                order.append(cell)
+                for cj in cons_of[cell]:
+                    if cj not in seen:
+                        seen.add(cj)
+                        queue.append(cj)
+
+    if len(order) <= MAX_VARS:
+        try:
+            counts, hits = enumerate_solutions(constraints, order, cons_of)
+            if counts:
+                return tuple(order), counts, hits, True
+        except _BudgetExceeded:
+            pass
+    return tuple(order), *estimate(constraints, order), False
+
+
+def enumerate_solutions(constraints, order, cons_of):
+    n = len(order)
+    need = [c[1] for c in constraints]
+    left = [len(c[0]) for c in constraints]
+    var_cons = [cons_of[cell] for cell in order]
+    assign = [0] * n
+    counts, hits = {}, {}
+    nodes = 0
+
+    def step(i, placed):
+        nonlocal nodes
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise _BudgetExceeded
+        if i == n:
+            counts[placed] = counts.get(placed, 0) + 1
+            row = hits.setdefault(placed, [0] * n)
+            for j in range(n):
+                row[j] += assign[j]
+            return
+        cons = var_cons[i]
+        for value in (0, 1):
+            if all(0 <= need[ci] - value <= left[ci] - 1 for ci in cons):
+                for ci in cons:
+                    need[ci] -= value
+                    left[ci] -= 1
+                assign[i] = value
+                step(i + 1, placed + value)
+                for ci in cons:
+                    need[ci] += value
+                    left[ci] += 1
+        assign[i] = 0
+
+    step(0, 0)
+    return counts, hits
+
+
+def estimate(constraints, order):
+    # Приближение для слишком больших компонент: средняя локальная плотность
+    sums = {cell: [0.0, 0] for cell in order}
+    for cells, need in constraints:
+        for cell in cells:
+            sums[cell][0] += need / len(cells)
+            sums[cell][1] += 1
+    probs = [min(sums[cell][0] / sums[cell][1], 1.0) for cell in order]
+    k = round(sum(probs))
+    return {k: 1}, {k: probs}
+
+
+# --- Сборка компонент с учётом общего числа мин ---
+def lcomb(n, k):
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def convolve(a, b):
+    result = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            result[i + j] = result.get(i + j, 0) + x * y
+    return result
+
+
+def combine(components, free, remaining):
+    # Вес решения с s минами на границе пропорционален C(free, remaining - s):
+    # столько способов разложить остальные мины по клеткам вне границы.
+    prefix = [{0: 1}]
+    for _, counts, _, _ in components:
+        prefix.append(convolve(prefix[-1], counts))
+    suffix = [{0: 1}]
+    for _, counts, _, _ in reversed(components):
+        suffix.append(convolve(suffix[-1], counts))
+    suffix.reverse()
+    total = prefix[-1]
+
+    feasible = [s for s in total if 0 <= remaining - s <= free]
+    if not feasible:
+        # Противоречие с общим числом мин — остаются только локальные оценки
+        feasible = list(total)
+        weight = {s: 1.0 for s in feasible}
+    else:
+        base = max(lcomb(free, remaining - s) for s in feasible)
+        weight = {s: exp(lcomb(free, remaining - s) - base) for s in feasible}
+
+    z = sum(total[s] * weight[s] for s in feasible)
+    expected = sum(total[s] * weight[s] * (remaining - s) for s in feasible) / z
+    probabilities = {}
+    exact = True
+    for i, (cells, counts, hits, comp_exact) in enumerate(components):
+        exact = exact and comp_exact
+        rest = convolve(prefix[i], suffix[i + 1])
+        acc = [0.0] * len(cells)
+        for k, row in hits.items():
+            factor = sum(n * weight.get(k + s, 0.0) for s, n in rest.items())
+            if factor:
+                for j, h in enumerate(row):
+                    acc[j] += h * factor
+        for cell, value in zip(cells, acc):
+            probabilities[cell] = value / z
+    return probabilities, max(expected, 0.0), exact
+
+
+# --- Оценка сгенерированного поля ---
+def grade(board, mine_count, start):
+    # Играет поле от клетки start только логическими ходами; угадывает, когда их нет.
+    # Возвращает (решено ли, число угадываний, число ходов).
+    frontier = Frontier(board.rows, board.cols, mine_count, board.count)
+    opened = frontier.opened
+    guesses, steps = 0, 0
+    pending = [start]
+    while True:
+        for cell in pending:
+            if board.is_mine(*cell):
+                return False, guesses, steps
+            if cell not in opened:
+                frontier.add([x for x in board.region_cells(*cell) if x not in opened])
+                steps += 1
+        if len(opened) + mine_count == board.rows * board.cols:
+            return True, guesses, steps
+        result = frontier.analyze()
+        pending = sorted(result.safe)
+        if not pending:
+            guesses += 1
+            pending = [result.best_guess()]
@@ -0,0 +1,214 @@
+import functools
+import json
+import marshal
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+PERF_DIR = "games/data/perf"
+ENV_FLAG = "MINIGAME_PERF"  # MINIGAME_PERF=1 — замеры включены с запуска
+SUB_BUCKETS = 4             # корзин гистограммы на каждое удвоение задержки
+BUCKETS = 40 * SUB_BUCKETS  # от микросекунды до дней
+
+ENABLED = os.environ.get(ENV_FLAG, "") not in ("", "0")
+NULL_SPAN = nullcontext()
+
+_probes = {}
+_probes_lock = threading.Lock()
+_started = time.time()
+
+
+class Histogram:
+    # Задержки в логарифмических корзинах: четыре на каждое удвоение, то есть
+    # точность около 20% при любой величине и фиксированная память
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        us = seconds * 1e6
+        if us < 1:
+            index = 0
+        else:
+            m, e = math.frexp(us)
+            index = min(e * SUB_BUCKETS + int((m - 0.5) * 2 * SUB_BUCKETS), BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def upper(index):
+        # Верхняя граница корзины, в секундах
+        e, sub = divmod(index, SUB_BUCKETS)
+        return (0.5 + (sub + 1) / (2 * SUB_BUCKETS)) * 2.0 ** e / 1e6
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        need = self.count * p / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= need:
+                return min(self.upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class Probe:
+    # Точка замера: гистограмма за весь сеанс и отдельная — за текущее окно оверлея.
+    # Пишут в неё и поток Tk, и фоновые потоки (запись хранилища), поэтому под замком.
+    def __init__(self, name, key):
+        self.name = name
+        self.key = key  # (файл, строка, функция) — для выгрузки в формате pstats
+        self.lock = threading.Lock()
+        self.session = Histogram()
+        self.window = Histogram()
+        self.window_started = time.perf_counter()
+
+    def record(self, seconds):
+        with self.lock:
+            self.session.add(seconds)
+            self.window.add(seconds)
+
+    def take_window(self):
+        # Окно для оверлея: гистограмма и её длительность; начинается новое
+        with self.lock:
+            window, self.window = self.window, Histogram()
+            started, self.window_started = self.window_started, time.perf_counter()
+        return window, self.window_started - started
+
+
+class Span:
+    def __init__(self, probe):
+        self.probe = probe
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.probe.record(time.perf_counter() - self.started)
+        return False
+
+
+def probe(name, key=None):
+    with _probes_lock:
+        found = _probes.get(name)
+        if found is None:
+            found = _probes[name] = Probe(name, key or ("~", 0, name))
+        return found
+
+
+# --- Включение ---
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    global _started
+    with _probes_lock:
+        _probes.clear()
+    _started = time.time()
+
+
+# --- Замеры ---
+def timed(name=None):
+    # Декоратор: время каждого вызова. Выключенный стоит одной проверки флага
+    def wrap(func):
+        code = func.__code__
+        point = probe(name or func.__qualname__, (code.co_filename, code.co_firstlineno, func.__qualname__))
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                point.record(time.perf_counter() - started)
+        return inner
+    return wrap
+
+
+def span(name):
+    # with perf.span("snake.draw"): ... — выключенный возвращает общий пустой контекст
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(probe(name))
+
+
+def record(name, seconds):
+    # Готовое значение — например, опоздание такта относительно расписания
+    if ENABLED:
+        probe(name).record(seconds)
+
+
+def probes():
+    with _probes_lock:
+        return list(_probes.values())
+
+
+# --- Выгрузка ---
+def snapshot():
+    # Копия сеанса: сводки и непустые корзины каждой точки замера
+    result = {"started": _started, "duration": time.time() - _started, "probes": {}}
+    for point in probes():
+        with point.lock:
+            hist = point.session
+            stats = hist.summary()
+            stats["histogram"] = [[Histogram.upper(i), n] for i, n in enumerate(hist.counts) if n]
+        stats["key"] = list(point.key)
+        result["probes"][point.name] = stats
+    return result
+
+
+def to_pstats(data):
+    # Словарь в формате, который pstats.Stats читает из файла cProfile:
+    # (файл, строка, функция) -> (вызовы, вызовы, собственное время, общее время, вызывающие)
+    stats = {}
+    for name, item in data["probes"].items():
+        if not item["count"]:
+            continue
+        stats[tuple(item["key"])] = (item["count"], item["count"], item["total"], item["total"], {})
+    return stats
+
+
+def export(directory=PERF_DIR):
+    # Сеанс в JSON и в .prof для pstats/snakeviz. Снимок берётся сразу, файлы пишет
+    # фоновый поток; возвращает путь без расширения
+    data = snapshot()
+    base = os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S", time.localtime()))
+
+    def write():
+        os.makedirs(directory, exist_ok=True)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        with open(base + ".prof", "wb") as f:
+            marshal.dump(to_pstats(data), f)
+
+    threading.Thread(target=write, name="perf-export", daemon=True).start()
+    return base
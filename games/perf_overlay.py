@@ -0,0 +1,73 @@
+import tkinter as tk
+
+from games import perf
+from games.registry import log
+
+REFRESH = 0.5  # секунд между обновлениями оверлея
+ROWS = 8       # сколько точек замера показывать
+
+
+class PerfOverlay:
+    # Оверлей замеров поверх экрана любой игры: F3 — показать/скрыть (на это время
+    # включает замеры), F4 — выгрузить сеанс. Одна метка в общем контейнере,
+    # поэтому экранам игр ничего о нём знать не нужно.
+    def __init__(self, container, controller):
+        self.container = container
+        self.controller = controller
+        self.label = tk.Label(container, text="", font=("Courier", 10), justify=tk.LEFT, anchor="nw",
+                              bg="#111111", fg="#7CFC00", padx=6, pady=4)
+        self.task = None
+        self.was_enabled = perf.ENABLED
+
+    @property
+    def visible(self):
+        return self.task is not None
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self.was_enabled = perf.ENABLED
+        perf.enable()
+        for point in perf.probes():
+            point.take_window()  # окно начинается с момента показа
+        self.label.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self.label.config(text="Замеры включены…")
+        self.label.lift()
+        self.task = self.controller.scheduler.every(REFRESH, self.refresh, owner=self)
+
+    def hide(self):
+        self.controller.scheduler.cancel(self.task)
+        self.task = None
+        self.label.place_forget()
+        # Замеры, включённые только ради оверлея, выключаются вместе с ним; собранный
+        # сеанс остаётся и по-прежнему выгружается по F4
+        if not self.was_enabled:
+            perf.disable()
+
+    def refresh(self):
+        # За окно: вызовов в секунду (для тактов — кадры/с), p50, p99 и максимум в мс
+        rows = []
+        for point in perf.probes():
+            window, duration = point.take_window()
+            if window.count:
+                rows.append((window.total, point.name, window, duration))
+        rows.sort(reverse=True)
+        lines = [f"{'':<24}{'в с':>7}{'p50':>8}{'p99':>8}{'макс':>8}"]
+        for _, name, window, duration in rows[:ROWS]:
+            lines.append(f"{name[:24]:<24}{window.count / max(duration, 1e-6):>7.1f}"
+                         f"{window.percentile(50) * 1000:>8.2f}{window.percentile(99) * 1000:>8.2f}"
+                         f"{window.max * 1000:>8.2f}")
+        if not rows:
+            lines.append("нет вызовов")
+        lines.append("F3 — скрыть, F4 — сохранить сеанс")
+        self.label.config(text="\n".join(lines))
+        # Экран игры, построенный позже, ложится поверх — поднимаем метку обратно
+        self.label.lift()
+
+    def export(self):
+        base = perf.export()
+        log.info("замеры сохранены: %s.json, %s.prof", base, base)
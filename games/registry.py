@@ -0,0 +1,124 @@
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+USAGE_KEY = "launcher/usage"
+LEGACY_USAGE_FILE = "games/data/launcher.json"  # счётчик прежних версий, переносится в хранилище
+ENTRY_POINT_GROUP = "minigame_center.games"
+
+log = logging.getLogger("minigame")
+
+# Встроенные игры: название в меню и модуль с классом GameFrame. Модуль
+# импортируется только при первом открытии игры (или фоновым прогревом).
+BUILTIN = (
+    ("Змейка", "games.snake"),
+    ("Арена змей", "games.snake_arena"),
+    ("Крестики-нолики", "games.tictactoe"),
+    ("Сапёр", "games.minesweeper"),
+)
+
+
+class GameEntry:
+    def __init__(self, title, module, attr="GameFrame"):
+        self.title = title
+        self.module = module
+        self.attr = attr
+
+    @property
+    def loaded(self):
+        return self.module in sys.modules
+
+    def load(self):
+        # Класс экрана игры; импорт модуля — здесь, а не при старте приложения
+        return getattr(importlib.import_module(self.module), self.attr)
+
+
+def discover():
+    # Встроенные игры; сами модули не импортируются — только читаются их адреса
+    return [GameEntry(title, module) for title, module in BUILTIN]
+
+
+def discover_plugins(known=()):
+    # Сторонние игры, объявленные через entry points:
+    #   [project.entry-points."minigame_center.games"]
+    #   "Моя игра" = "my_package.my_game:GameFrame"
+    # importlib.metadata сам по себе импортируется долго, поэтому плагины
+    # ищутся уже после показа меню.
+    from importlib import metadata
+
+    entries = []
+    titles = set(known)
+    try:
+        points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except Exception:
+        points = ()
+    for point in points:
+        if point.name in titles:
+            continue
+        module, _, attr = point.value.partition(":")
+        entries.append(GameEntry(point.name, module.strip(), attr.strip() or "GameFrame"))
+        titles.add(point.name)
+    return entries
+
+
+def legacy_usage():
+    # Разовый перенос launcher.json; битый файл просто пропускается
+    if not os.path.exists(LEGACY_USAGE_FILE):
+        return []
+    try:
+        with open(LEGACY_USAGE_FILE, "r", encoding="utf-8") as f:
+            return [("set", USAGE_KEY, dict(json.load(f).get("launches", {})))]
+    except (OSError, ValueError, AttributeError, TypeError):
+        return []
+
+
+class Usage:
+    # Сколько раз открывалась каждая игра — по этому счётчику выбирается,
+    # какую игру прогреть заранее. Хранилище (и sqlite3) открывается при первом
+    # обращении — уже после показа меню, а не на старте приложения.
+    def __init__(self, store=None):
+        self.store = store
+        self._counts = None
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            if self.store is None:
+                from games.storage import storage
+                self.store = storage()
+            self.store.migrate("launcher-usage", legacy_usage)
+            self._counts = dict(self.store.get(USAGE_KEY, {}))
+        return self._counts
+
+    def record(self, title):
+        self.counts[title] = self.counts.get(title, 0) + 1
+        self.store.set(USAGE_KEY, self.counts)
+
+    def favourite(self, entries):
+        # Самая часто открываемая игра; без истории — первая в меню
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: self.counts.get(entry.title, 0))
+
+
+def prewarm(entry):
+    # Фоновый импорт модуля игры: к моменту клика останется только построить экран.
+    # Виджеты здесь не создаются — Tk работает только в своём потоке.
+    def run():
+        started = time.perf_counter()
+        try:
+            entry.load()
+        except Exception:
+            log.exception("прогрев %s не удался", entry.title)
+            return
+        log.info("прогрев %s: %.0f мс", entry.title, (time.perf_counter() - started) * 1000)
+
+    if entry is None or entry.loaded:
+        return None
+    thread = threading.Thread(target=run, name="prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,116 @@
+import logging
+import time
+import tkinter as tk
+
+from games import perf
+
+TICK = 0.016  # секунд между кадрами анимаций
+
+log = logging.getLogger("minigame")
+
+
+class Task:
+    def __init__(self, owner, callback, due, interval=None, duration=None, done=None):
+        self.owner = owner
+        self.callback = callback
+        self.due = due
+        self.interval = interval  # для периодических задач
+        self.start = due
+        self.duration = duration  # для анимаций (tween)
+        self.done = done
+        self.cancelled = False
+
+
+class Scheduler:
+    # Общий таймер приложения. Анимации, периодические и отложенные задачи всех игр
+    # обслуживаются одним after(): за тик выполняется всё, что созрело, и следующий
+    # тик ставится на ближайший срок. Когда задач нет, таймер не крутится.
+    # Всё выполняется в потоке Tk, так что задачи могут свободно менять виджеты.
+    def __init__(self, root, tick=TICK):
+        self.root = root
+        self.tick = tick
+        self.tasks = []
+        self.after_id = None
+        self.due = None
+
+    # --- Регистрация ---
+    def tween(self, duration, step, done=None, owner=None):
+        # step(t) на каждом кадре, t растёт от 0 до 1; последний вызов — step(1), затем done()
+        return self.add(Task(owner, step, time.perf_counter(), duration=duration, done=done))
+
+    def every(self, interval, callback, owner=None):
+        # callback() раз в interval секунд, пока он не вернёт False или задачу не отменят
+        return self.add(Task(owner, callback, time.perf_counter() + interval, interval=interval))
+
+    def later(self, delay, callback, owner=None):
+        return self.add(Task(owner, callback, time.perf_counter() + delay))
+
+    def add(self, task):
+        self.tasks.append(task)
+        self.schedule(task.due)
+        return task
+
+    # --- Отмена ---
+    def cancel(self, task):
+        if task is not None:
+            task.cancelled = True
+
+    def cancel_owner(self, owner):
+        # Снимает все задачи игры — при перезапуске партии или выходе в меню
+        for task in self.tasks:
+            if task.owner is owner:
+                task.cancelled = True
+
+    # --- Цикл ---
+    def schedule(self, due):
+        # Если ближайший тик уже стоит не позже нужного срока, новый не нужен
+        if self.after_id is not None and self.due <= due:
+            return
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.due = due
+        delay = max(due - time.perf_counter(), 0)
+        self.after_id = self.root.after(max(int(delay * 1000), 1), self.run)
+
+    def run(self):
+        self.after_id = None
+        now = time.perf_counter()
+        # Опоздание тика относительно срока — дрожание цикла событий Tk
+        perf.record("scheduler.lateness", now - self.due)
+        try:
+            for task in list(self.tasks):
+                if task.cancelled or task.due > now:
+                    continue
+                try:
+                    self.fire(task, now)
+                except tk.TclError:
+                    # Виджет уже уничтожен — задача больше не нужна
+                    task.cancelled = True
+                except Exception:
+                    # Ошибка одной задачи не должна останавливать общий таймер всех экранов
+                    log.exception("задача таймера %r упала и снята", task.callback)
+                    task.cancelled = True
+        finally:
+            self.tasks = [task for task in self.tasks if not task.cancelled]
+            if self.tasks:
+                self.schedule(min(task.due for task in self.tasks))
+
+    def fire(self, task, now):
+        if task.duration is not None:
+            t = min((now - task.start) / task.duration, 1.0) if task.duration else 1.0
+            task.callback(t)
+            if t >= 1.0:
+                task.cancelled = True
+                if task.done is not None:
+                    task.done()
+            else:
+                task.due = now + self.tick
+        elif task.interval is not None:
+            if task.callback() is False:
+                task.cancelled = True
+            else:
+                # Без накопления опозданий: следующий срок считается от запланированного
+                task.due = max(task.due + task.interval, now)
+        else:
+            task.cancelled = True
+            task.callback()
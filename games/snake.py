@@ -1,16 +1,46 @@
 # games/snake.py
 import tkinter as tk
-import random
 import os
+import threading
+import time
+from collections import deque
+
+from games.snake_ai import Autopilot
+from games import perf
+from games.history import WIN, LOSS, history
+from games.lifecycle import Lifecycle
+from games.snake_engine import SnakeGame, LOST, WON, UP, DOWN, LEFT, RIGHT
+from games.snake_replay import Replay, ReplayStore
+from games.storage import storage
 
 WIDTH = 700
 HEIGHT = 400
 SEG_SIZE = 25
-RECORD_FILE = "games/data/record.txt"
+COLS = WIDTH // SEG_SIZE
+ROWS = HEIGHT // SEG_SIZE
+RECORD_KEY = "snake/record"
+LEGACY_RECORD_FILE = "games/data/record.txt"  # рекорд прежних версий, переносится в хранилище
+# Период такта по уровням скорости; уровень растёт каждые SPEED_STEP очков
+SPEED_LEVELS = (0.1, 0.09, 0.08, 0.07, 0.06, 0.05, 0.04)
+SPEED_STEP = 5
+MAX_CATCH_UP = 5   # больше тактов подряд не догоняем — пропускаем
+KEYS = {"Up": UP, "Down": DOWN, "Left": LEFT, "Right": RIGHT}
+AUTOPILOT = "safe"  # стратегия режима «Смотреть ИИ»
 after_id = None
 
 
-class GameFrame(tk.Frame):
+def legacy_record():
+    # Разовый перенос рекорда из record.txt; битый файл просто пропускается
+    if not os.path.exists(LEGACY_RECORD_FILE):
+        return []
+    try:
+        with open(LEGACY_RECORD_FILE, "r") as f:
+            return [("set", RECORD_KEY, int(f.read().strip()))]
+    except (OSError, ValueError):
+        return []
+
+
+class GameFrame(tk.Frame, Lifecycle):
     def __init__(self, parent, controller):
         super().__init__(parent, bg="white")
         self.controller = controller
@@ -19,30 +49,6 @@ class GameFrame(tk.Frame):
         self.after_id = None
         self.in_game = True
         self.paused = False
-        self.needs_restart = False  # если True — при следующем show будет рестарт
-
-        # Сохраняем оригинальные pack/pack_forget чтобы переопределить поведение
-        self._orig_pack = self.pack
-        self._orig_pack_forget = self.pack_forget
-        # Переопределяем pack: если нужно — рестартим перед показом
-        def _pack_wrapper(*args, **kwargs):
-            if self.needs_restart:
-                # Убедимся, что игра стартует "с нуля"
-                self.restart_game()
-                self.needs_restart = False
-            return self._orig_pack(*args, **kwargs)
-
-        # Переопределяем pack_forget: останавливаем игру и помечаем, что нужен рестарт
-        def _pack_forget_wrapper(*args, **kwargs):
-            # Останавливаем игровой цикл
-            self.in_game = False
-            # Пометим, что при следующем показе игра должна запуститься заново
-            self.needs_restart = True
-            return self._orig_pack_forget(*args, **kwargs)
-
-        # Привязываем обёртки к экземпляру
-        self.pack = _pack_wrapper
-        self.pack_forget = _pack_forget_wrapper
 
         # Верхняя панель
         top = tk.Frame(self, bg="white")
@@ -72,15 +78,32 @@ class GameFrame(tk.Frame):
         self.record_label = tk.Label(bottom, text="Рекорд: 0", font=("Arial", 16), bg="white", fg="#0077cc")
         self.record_label.pack(side=tk.LEFT, padx=20)
 
+        self.timing_label = tk.Label(bottom, text="", font=("Arial", 11), bg="white", fg="#777777")
+        self.timing_label.pack(side=tk.LEFT, padx=20)
+
         tk.Button(bottom, text="Назад в меню", bg="#4285f4", fg="white", font=("Arial", 14), width=10, command=self.back_to_menu).pack(side=tk.RIGHT, padx=20)
 
+        self.autopilot = None
+        self.autopilot_button = tk.Button(bottom, text="Смотреть ИИ", bg="#7b1fa2", fg="white", font=("Arial", 14),
+                                          width=12, command=self.toggle_autopilot)
+        self.autopilot_button.pack(side=tk.RIGHT, padx=10)
+
+        # Повторы: каждая законченная партия сохраняется, «Повтор» показывает последнюю
+        self.replays = ReplayStore()
+        self.replay = None  # смены направления воспроизводимой партии
+        tk.Button(bottom, text="Повтор", bg="#00897b", fg="white", font=("Arial", 14), width=8,
+                  command=self.watch_replay).pack(side=tk.RIGHT, padx=10)
+
         # --- Инициализация ---
+        self.timing = self.Timing()
         self.score = self.Score(self)
+        self.game = SnakeGame(COLS, ROWS)
+        self.items = self.draw_snake()
         self.create_block()
-        self.snake = self.create_snake()
         self.canvas.focus_set()
-        self.canvas.bind("<KeyPress>", self.snake.change_direction)
+        self.canvas.bind("<KeyPress>", self.change_direction)
         # Запускаем цикл; он сам будет управлять дальнейшими вызовами
+        self.next_tick = time.perf_counter()
         self.main_loop()
 
     # ------------------------ Вложенные классы ------------------------
@@ -92,22 +115,16 @@ class GameFrame(tk.Frame):
             self.update_labels()
 
         def load_record(self):
-            if os.path.exists(RECORD_FILE):
-                try:
-                    with open(RECORD_FILE, "r") as f:
-                        return int(f.read().strip())
-                except:
-                    return 0
-            return 0
+            storage().migrate("snake-record", legacy_record)
+            return storage().get(RECORD_KEY, 0)
 
         def save_record(self):
-            os.makedirs(os.path.dirname(RECORD_FILE) or ".", exist_ok=True)
-            with open(RECORD_FILE, "w") as f:
-                f.write(str(self.record))
+            storage().set(RECORD_KEY, self.record)
 
         def increment(self):
             self.value += 1
-            if self.value > self.record:
+            # Рекорд ставит только человек, не автопилот
+            if self.value > self.record and self.game.autopilot is None and self.game.replay is None:
                 self.record = self.value
                 self.save_record()
             self.update_labels()
@@ -120,91 +137,137 @@ class GameFrame(tk.Frame):
             self.game.score_label.config(text=f"Счёт: {self.value}")
             self.game.record_label.config(text=f"Рекорд: {self.record}")
 
-    class Segment:
-        def __init__(self, canvas, x, y):
-            self.canvas = canvas
-            self.instance = canvas.create_rectangle(
-                x, y, x + SEG_SIZE, y + SEG_SIZE, fill="green", outline=""
-            )
+    class Timing:
+        # Статистика реальных интервалов между тактами: насколько цикл отклоняется
+        # от заданного периода и сколько тактов пришлось догонять или пропускать
+        def __init__(self, window=200):
+            self.intervals = deque(maxlen=window)
+            self.errors = deque(maxlen=window)
+            self.last = None
+            self.caught_up = 0
+            self.skipped = 0
+
+        def tick(self, now, period):
+            if self.last is not None:
+                self.intervals.append(now - self.last)
+                self.errors.append(abs(now - self.last - period))
+            self.last = now
 
-    class Snake:
-        def __init__(self, game, segments):
-            self.game = game
-            self.canvas = game.canvas
-            self.segments = segments
-            self.mapping = {
-                "Down": (0, 1),
-                "Up": (0, -1),
-                "Left": (-1, 0),
-                "Right": (1, 0),
+        def reset(self):
+            self.last = None
+
+        def summary(self):
+            if not self.intervals:
+                return None
+            errors = sorted(self.errors)
+            return {
+                "mean": sum(self.intervals) / len(self.intervals),
+                "jitter": sum(errors) / len(errors),
+                "p95": errors[int(len(errors) * 0.95)],
+                "max": errors[-1],
+                "caught_up": self.caught_up,
+                "skipped": self.skipped,
             }
-            self.vector = self.mapping["Right"]
-
-        def move(self):
-            for index in range(len(self.segments) - 1):
-                segment = self.segments[index].instance
-                x1, y1, x2, y2 = self.canvas.coords(self.segments[index + 1].instance)
-                self.canvas.coords(segment, x1, y1, x2, y2)
-
-            x1, y1, x2, y2 = self.canvas.coords(self.segments[-2].instance)
-            self.canvas.coords(
-                self.segments[-1].instance,
-                x1 + self.vector[0] * SEG_SIZE,
-                y1 + self.vector[1] * SEG_SIZE,
-                x2 + self.vector[0] * SEG_SIZE,
-                y2 + self.vector[1] * SEG_SIZE,
-            )
-
-        def add_segment(self):
-            self.game.score.increment()
-            last_seg = self.canvas.coords(self.segments[0].instance)
-            x = last_seg[2] - SEG_SIZE
-            y = last_seg[3] - SEG_SIZE
-            self.segments.insert(0, GameFrame.Segment(self.canvas, x, y))
-
-        def change_direction(self, event):
-            if event.keysym in self.mapping:
-                opposite = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
-                if self.vector != self.mapping[opposite[event.keysym]]:
-                    self.vector = self.mapping[event.keysym]
-
-        def reset_snake(self):
-            for segment in self.segments:
-                self.canvas.delete(segment.instance)
 
     # ------------------------ Игровая логика ------------------------
+    def period(self):
+        return SPEED_LEVELS[min(self.score.value // SPEED_STEP, len(SPEED_LEVELS) - 1)]
+
+    @perf.timed("snake.tick")
+    def tick(self):
+        # Правила — в SnakeGame; здесь только перенос результата такта на Canvas
+        vector = None
+        if self.replay is not None:
+            if self.replay and self.replay[0][0] == self.game.ticks:
+                vector = self.replay.popleft()[1]
+        elif self.autopilot is not None:
+            with perf.span("snake.autopilot"):
+                self.game.turn(self.autopilot.choose(self.game))
+        with perf.span("snake.step"):
+            self.game.step(vector)
+        # столкновение со стеной или с собой
+        if self.game.status == LOST:
+            self.game_over()
+            return
+        # Стоимость отрисовки не зависит от длины: прямоугольник хвоста переезжает
+        # на место новой головы, а при росте создаётся один новый
+        x, y = self.game.head
+        with perf.span("snake.draw"):
+            if self.game.freed is not None:
+                item = self.items.popleft()
+                self.canvas.coords(item, x * SEG_SIZE, y * SEG_SIZE, (x + 1) * SEG_SIZE, (y + 1) * SEG_SIZE)
+            else:
+                item = self.create_item(x, y)
+            self.items.append(item)
+        # поедание яблока
+        if self.game.ate:
+            self.score.increment()
+            self.canvas.delete(self.block)
+            self.create_block()
+
     def main_loop(self):
+        # Фиксированный шаг: такты идут по расписанию next_tick, а не «через 100 мс
+        # после окончания работы», поэтому скорость игры не плывёт от нагрузки.
+        # Отставший цикл догоняет до MAX_CATCH_UP тактов, дальше такты пропускаются.
         global IN_GAME, PAUSED, after_id
         if self.in_game:
-            if not self.paused:
-                self.snake.move()
-                head_coords = self.canvas.coords(self.snake.segments[-1].instance)
-                x1, y1, x2, y2 = head_coords
-
-                # столкновение со стеной
-                if x2 > WIDTH or x1 < 0 or y1 < 0 or y2 > HEIGHT:
-                    self.game_over()
-                # поедание яблока
-                elif head_coords == self.canvas.coords(self.block):
-                    self.snake.add_segment()
-                    self.canvas.delete(self.block)
-                    self.create_block()
-                # столкновение с собой
-                else:
-                    for index in range(len(self.snake.segments) - 1):
-                        if head_coords == self.canvas.coords(self.snake.segments[index].instance):
-                            game_over()
-                            break
-
-            self.after_id = self.after(100, self.main_loop)
+            now = time.perf_counter()
+            if self.paused:
+                self.next_tick = now + self.period()
+                self.timing.reset()
+            else:
+                steps = 0
+                while self.in_game and now >= self.next_tick and steps < MAX_CATCH_UP:
+                    perf.record("snake.lateness", now - self.next_tick)
+                    self.timing.tick(now, self.period())
+                    self.tick()
+                    self.next_tick += self.period()
+                    steps += 1
+                self.timing.caught_up += max(steps - 1, 0)
+                if now >= self.next_tick:
+                    missed = int((now - self.next_tick) / self.period()) + 1
+                    self.timing.skipped += missed
+                    self.next_tick += missed * self.period()
+                if steps:
+                    self.update_timing_label()
+
+            delay = max(self.next_tick - time.perf_counter(), 0.001)
+            self.after_id = self.after(int(delay * 1000) or 1, self.main_loop)
         else:
-            self.canvas.create_text(WIDTH / 2, HEIGHT / 2, text="Ты проиграл!", fill="red", font=("Arial", 22))
+            if self.replay is not None:
+                text = "Конец повтора"
+            else:
+                text = "Поле заполнено!" if self.game.status == WON else "Ты проиграл!"
+            self.canvas.create_text(WIDTH / 2, HEIGHT / 2, text=text, fill="red", font=("Arial", 22))
+
+    def update_timing_label(self):
+        stats = self.timing.summary()
+        if stats is not None:
+            text = (f"Такт: {stats['mean'] * 1000:.0f} мс, разброс {stats['jitter'] * 1000:.1f} мс "
+                    f"(p95 {stats['p95'] * 1000:.1f}), пропущено: {stats['skipped']}")
+            if self.autopilot is not None and self.game.ticks:
+                text += f", поиск пути: {self.autopilot.plan_time / self.game.ticks * 1e6:.0f} мкс"
+            self.timing_label.config(text=text)
 
     def game_over(self):
         # Останавливаем цикл игры — main_loop не будет запланирован дальше
         self.in_game = False
-
-    def restart_game(self):
+        if self.replay is None and self.game.ticks:
+            # Файл повтора пишется в фоне, чтобы не задерживать поток Tk
+            threading.Thread(target=self.save_replay, args=(Replay.from_game(self.game),),
+                             name="snake-replay", daemon=True).start()
+        if self.replay is None and self.autopilot is None and self.game.ticks:
+            # В историю идут только партии человека — как и рекорд
+            history().record("snake", f"{COLS}×{ROWS}", WIN if self.game.status == WON else LOSS,
+                             score=self.game.score, length=len(self.game.cells), moves=self.game.ticks)
+
+    def save_replay(self, replay):
+        try:
+            self.replays.save(replay)
+        except OSError:
+            pass
+
+    def restart_game(self, replay=None):
         global s, s, PAUSED, after_id
         # если есть активный таймер — отменяем его
         if hasattr(self, 'after_id') and self.after_id:
@@ -217,11 +280,18 @@ class GameFrame(tk.Frame):
 
         self.canvas.delete("all")
         self.score.reset()
+        if self.autopilot is not None:
+            self.autopilot = Autopilot(AUTOPILOT)
+        # Повтор — та же партия с тем же сидом: яблоки появятся в тех же клетках
+        self.replay = deque(replay.turns) if replay is not None else None
+        self.game = SnakeGame(COLS, ROWS, seed=replay.seed if replay is not None else None)
+        self.items = self.draw_snake()
         self.create_block()
-        self.snake = self.create_snake()
         self.canvas.focus_set()
-        self.canvas.bind("<KeyPress>", self.snake.change_direction)
+        self.canvas.bind("<KeyPress>", self.change_direction)
 
+        self.timing = self.Timing()
+        self.next_tick = time.perf_counter()
         self.main_loop()
 
     def pause_game(self):
@@ -231,23 +301,97 @@ class GameFrame(tk.Frame):
         else:
             self.pause_button.config(text="Пауза", bg="#00cc00")
 
-    def create_snake(self):
-        segments = [
-            self.Segment(self.canvas, SEG_SIZE, SEG_SIZE),
-            self.Segment(self.canvas, SEG_SIZE * 2, SEG_SIZE),
-            self.Segment(self.canvas, SEG_SIZE * 3, SEG_SIZE),
-        ]
-        return self.Snake(self, segments)
+    def toggle_autopilot(self):
+        # Режим «Смотреть ИИ»: направление перед каждым тактом выбирает автопилот
+        if self.autopilot is None:
+            self.autopilot = Autopilot(AUTOPILOT)
+            self.game.inputs.clear()
+            self.autopilot_button.config(text="Играть самому", bg="#555555")
+        else:
+            self.autopilot = None
+            self.autopilot_button.config(text="Смотреть ИИ", bg="#7b1fa2")
+        self.canvas.focus_set()
+
+    def watch_replay(self):
+        # Последняя партия в реальном темпе: период такта считается по тому же счёту
+        try:
+            replay = self.replays.latest()
+        except (OSError, ValueError):
+            replay = None
+        if replay is not None and (replay.cols, replay.rows) == (COLS, ROWS):
+            self.restart_game(replay)
+
+    def change_direction(self, event):
+        if event.keysym in KEYS and self.autopilot is None and self.replay is None:
+            self.game.turn(KEYS[event.keysym])
+
+    def create_item(self, x, y):
+        return self.canvas.create_rectangle(
+            x * SEG_SIZE, y * SEG_SIZE, (x + 1) * SEG_SIZE, (y + 1) * SEG_SIZE, fill="green", outline=""
+        )
+
+    def draw_snake(self):
+        # Прямоугольники Canvas в том же порядке, что и клетки змейки: от хвоста к голове
+        return deque(self.create_item(x, y) for x, y in self.game.cells)
 
     def create_block(self):
-        # Создаёт яблоко; простая реализация (можно добавить проверку, чтобы не появлялось на змее)
-        posx = SEG_SIZE * random.randint(1, (WIDTH - SEG_SIZE) // SEG_SIZE)
-        posy = SEG_SIZE * random.randint(1, (HEIGHT - SEG_SIZE) // SEG_SIZE)
+        apple = self.game.apple
+        if apple is None:
+            # Змейка заняла всё поле
+            self.game_over()
+            return
+        posx, posy = apple[0] * SEG_SIZE, apple[1] * SEG_SIZE
         self.block = self.canvas.create_oval(
             posx, posy, posx + SEG_SIZE, posy + SEG_SIZE, fill="red", outline=""
         )
 
     def back_to_menu(self):
         # Вызывается при нажатии кнопки "Назад в меню"
-        # Мы используем контроллер (MainApp) — он вызовет pack_forget(), который мы переопределили
+        # Мы используем контроллер (MainApp) — он скроет экран и вызовет on_hide()
         self.controller.back_to_menu()
+
+    # ------------------------ Жизненный цикл ------------------------
+    def stop_loop(self):
+        if self.after_id:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+
+    def on_hide(self):
+        # Скрытая игра не тикает: цикл останавливается, партия ждёт на паузе
+        self.stop_loop()
+        if self.in_game and not self.paused:
+            self.pause_game()
+
+    def on_show(self):
+        # Законченная партия при возвращении начинается заново, незаконченная — продолжается
+        if not self.in_game:
+            self.restart_game()
+            return
+        self.canvas.focus_set()
+        if self.after_id is None:
+            self.timing.reset()
+            self.next_tick = time.perf_counter()
+            self.main_loop()
+
+    def suspend(self):
+        # Незаконченная партия сохраняется как повтор: сид и смены направления
+        if not self.in_game or self.replay is not None:
+            return None
+        return {"replay": Replay.from_game(self.game).to_bytes(), "autopilot": self.autopilot is not None}
+
+    def resume(self, state):
+        # Партия пересчитывается по повтору до того же такта и перерисовывается
+        self.stop_loop()
+        self.canvas.delete("all")
+        self.game = Replay.from_bytes(state["replay"]).play()
+        self.score.value = self.game.score
+        self.score.update_labels()
+        self.items = self.draw_snake()
+        self.create_block()
+        if state["autopilot"] and self.autopilot is None:
+            self.toggle_autopilot()
+        if not self.paused:
+            self.pause_game()
+
+    def dispose(self):
+        self.stop_loop()
@@ -0,0 +1,268 @@
+import heapq
+import time
+from collections import deque
+
+from games.snake_engine import UP, DOWN, LEFT, RIGHT
+
+_cycles = {}
+
+
+def hamiltonian_cycle(cols, rows):
+    # Цикл, проходящий по всем клеткам поля ровно один раз: для каждой клетки —
+    # следующая за ней. Строки 1..rows-1 обходятся «змейкой» по столбцам 1..cols-1,
+    # столбец 0 — обратный путь. Нужна чётная сторона; при двух нечётных цикла нет.
+    key = (cols, rows)
+    if key not in _cycles:
+        if rows % 2 == 0 and cols >= 2:
+            order = [y * cols + x for x, y in cycle_order(cols, rows)]
+        elif cols % 2 == 0 and rows >= 2:
+            # Тот же обход на транспонированном поле
+            order = [y * cols + x for y, x in cycle_order(rows, cols)]
+        else:
+            order = None
+        if order is None:
+            _cycles[key] = None
+        else:
+            succ = [0] * (cols * rows)
+            for a, b in zip(order, order[1:] + order[:1]):
+                succ[a] = b
+            _cycles[key] = succ
+    return _cycles[key]
+
+
+def cycle_order(width, height):
+    # Клетки (x, y) в порядке обхода; height чётная
+    order = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        order.extend((x, y) for x in xs)
+    order.extend((0, y) for y in range(height - 1, 0, -1))
+    return order
+
+
+class Autopilot:
+    # Автопилот змейки. Перед каждым тактом choose(game) возвращает направление.
+    #   greedy   — кратчайший путь A* до яблока, без оглядки на хвост;
+    #   safe     — путь A* до яблока, только если после него голова ещё может дойти
+    #              до хвоста; иначе идёт за хвостом, а в тупике — по гамильтонову циклу;
+    #   hamilton — строго по гамильтонову циклу, без срезов: медленно, но змейка не
+    #              гибнет и поле заполняется целиком (см. hamilton()). Если тело не
+    #              лежит на цикле подряд (ИИ включили посреди партии человека) или
+    #              цикла нет (обе стороны нечётные), играет как safe, пока тело не
+    #              окажется на цикле.
+    # nodes — сколько клеток раскрыл поиск, plan_time — сколько секунд он занял.
+    STRATEGIES = ("greedy", "safe", "hamilton")
+
+    def __init__(self, strategy="safe"):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.nodes = 0
+        self.plan_time = 0.0
+        self.cycle = None  # (cols, rows, следующая клетка по циклу)
+        self.orders = None   # (cols, rows, [(следующая клетка, номер на цикле)] для обоих направлений)
+        self.aligned = None  # (партия, такт, направление) — тело лежит на цикле подряд
+
+    def choose(self, game):
+        started = time.perf_counter()
+        cols = game.cols
+        head = game.head[1] * cols + game.head[0]
+        nxt = None
+        if self.strategy == "hamilton":
+            nxt = self.hamilton(game, head)
+        if nxt is None:
+            nxt = self.plan(game, head)
+        if nxt is None:
+            nxt = self.next_on_cycle(game, head)
+        if nxt is None:
+            nxt = self.any_free(game, head)
+        self.plan_time += time.perf_counter() - started
+        if nxt is None:
+            return game.vector  # выхода нет
+        delta = nxt - head
+        return RIGHT if delta == 1 else LEFT if delta == -1 else DOWN if delta > 0 else UP
+
+    # --- Стратегии ---
+    def plan(self, game, head):
+        cols = game.cols
+        occupied = game.grid.occupied
+        tail = game.cells[0][1] * cols + game.cells[0][0]
+        # Хвост на этом такте уйдёт, если змейка не растёт, — его клетка проходима
+        moving_tail = tail if not game.grow else None
+        if game.apple is None:
+            return None
+        apple = game.apple[1] * cols + game.apple[0]
+        path = self.find_path(occupied, cols, game.rows, head, apple, moving_tail)
+        if self.strategy == "greedy":
+            return path[0] if path else None
+        if path and self.safe_after(game, path):
+            return path[0]
+        return self.follow_tail(game, head)
+
+    def safe_after(self, game, path):
+        # Виртуально проходим путь и проверяем, что из новой головы виден хвост:
+        # тогда змейка не запрёт себя, даже если следующее яблоко окажется в тупике
+        cols = game.cols
+        occupied = bytearray(game.grid.occupied)
+        body = deque(y * cols + x for x, y in game.cells)
+        grow = game.grow
+        for i in path:
+            if grow:
+                grow -= 1
+            else:
+                occupied[body.popleft()] = 0
+            occupied[i] = 1
+            body.append(i)
+        # После яблока хвост один такт стоит на месте
+        if len(body) >= game.cols * game.rows:
+            return True
+        route = self.find_path(occupied, cols, game.rows, body[-1], body[0], None)
+        return route is not None and len(route) > 1
+
+    def follow_tail(self, game, head):
+        # Шаг к соседней клетке, из которой дальше всего (но достижимо) до хвоста:
+        # змейка тянет время, пока хвост освобождает место
+        cols, rows = game.cols, game.rows
+        occupied = bytearray(game.grid.occupied)
+        body = deque(y * cols + x for x, y in game.cells)
+        if not game.grow:
+            occupied[body.popleft()] = 0
+        tail = body[0]
+        best, best_len = None, -1
+        for j in self.neighbours(cols, rows, head):
+            if occupied[j]:
+                continue
+            occupied[j] = 1
+            route = self.find_path(occupied, cols, rows, j, tail, None)
+            occupied[j] = 0
+            if route is not None and len(route) > best_len and (len(route) > 1 or not game.grow):
+                best, best_len = j, len(route)
+        return best
+
+    def next_on_cycle(self, game, head):
+        cols, rows = game.cols, game.rows
+        if self.cycle is None or self.cycle[:2] != (cols, rows):
+            succ = hamiltonian_cycle(cols, rows)
+            if succ is None:
+                self.cycle = (cols, rows, None)
+            else:
+                # Цикл проходится в ту сторону, в которую уже лежит тело змейки
+                neck = game.cells[-2][1] * cols + game.cells[-2][0]
+                if succ[head] == neck:
+                    pred = [0] * len(succ)
+                    for a, b in enumerate(succ):
+                        pred[b] = a
+                    succ = pred
+                self.cycle = (cols, rows, succ)
+        succ = self.cycle[2]
+        if succ is None:
+            return None
+        nxt = succ[head]
+        tail = game.cells[0][1] * cols + game.cells[0][0]
+        if game.grid.occupied[nxt] and not (nxt == tail and not game.grow):
+            return None
+        return nxt
+
+    def hamilton(self, game, head):
+        # Тело занимает отрезок цикла подряд, от хвоста к голове; тогда следующая
+        # клетка цикла — свободная или уходящий хвост, пока поле не заполнено, и
+        # змейка не может погибнуть. Срезы пути к яблоку оставляли бы в отрезке
+        # дыры, а с ними растущая змейка может упереться в стоящий хвост, поэтому
+        # их нет. None — тело не лежит по циклу подряд (или цикла нет), решает plan().
+        order = self.cycle_order_for(game)
+        if order is None:
+            return None
+        nxt = order[0][head]
+        tail = game.cells[0][1] * game.cols + game.cells[0][0]
+        if game.grid.occupied[nxt] and not (nxt == tail and not game.grow):
+            return None
+        return nxt
+
+    def cycle_order_for(self, game):
+        # Направление обхода, в котором тело лежит на цикле подряд, или None.
+        # Проверка — O(длины), поэтому повторяется, только если прошлый ход делал
+        # не этот же автопилот на предыдущем такте той же партии
+        cols, rows = game.cols, game.rows
+        if self.orders is None or self.orders[:2] != (cols, rows):
+            succ = hamiltonian_cycle(cols, rows)
+            orders = []
+            if succ is not None:
+                pred = [0] * len(succ)
+                for a, b in enumerate(succ):
+                    pred[b] = a
+                for nexts in (succ, pred):
+                    pos = [0] * len(nexts)
+                    i = 0
+                    for k in range(len(nexts)):
+                        pos[i] = k
+                        i = nexts[i]
+                    orders.append((nexts, pos))
+            self.orders = (cols, rows, orders)
+        if self.aligned is not None and self.aligned[0] is game and self.aligned[1] == game.ticks - 1:
+            order = self.aligned[2]
+        else:
+            order = next((o for o in self.orders[2] if self.on_cycle(game, o[1])), None)
+        self.aligned = (game, game.ticks, order) if order is not None else None
+        return order
+
+    def on_cycle(self, game, pos):
+        n = len(pos)
+        cols = game.cols
+        base = pos[game.cells[0][1] * cols + game.cells[0][0]]
+        return all((pos[y * cols + x] - base) % n == k for k, (x, y) in enumerate(game.cells))
+
+    def any_free(self, game, head):
+        for j in self.neighbours(game.cols, game.rows, head):
+            if not game.grid.occupied[j]:
+                return j
+        return None
+
+    # --- Поиск пути ---
+    def neighbours(self, cols, rows, i):
+        y, x = divmod(i, cols)
+        if x + 1 < cols:
+            yield i + 1
+        if x > 0:
+            yield i - 1
+        if y + 1 < rows:
+            yield i + cols
+        if y > 0:
+            yield i - cols
+
+    def find_path(self, occupied, cols, rows, start, goal, passable):
+        # A* с манхэттенской эвристикой на индексах клеток. Занятые клетки
+        # непроходимы, кроме цели и клетки passable (уходящего хвоста).
+        # Возвращает путь без стартовой клетки или None.
+        gy, gx = divmod(goal, cols)
+        came = {start: start}
+        cost = {start: 0}
+        heap = [(0, 0, start)]
+        expanded = 0
+        while heap:
+            _, d, i = heapq.heappop(heap)
+            d = -d
+            if i == goal:
+                break
+            if d > cost[i]:
+                continue
+            expanded += 1
+            nd = d + 1
+            for j in self.neighbours(cols, rows, i):
+                if occupied[j] and j != goal and j != passable:
+                    continue
+                if nd < cost.get(j, nd + 1):
+                    cost[j] = nd
+                    came[j] = i
+                    y, x = divmod(j, cols)
+                    # При равной оценке первыми раскрываются более глубокие клетки
+                    heapq.heappush(heap, (nd + abs(y - gy) + abs(x - gx), -nd, j))
+        self.nodes += expanded
+        if goal not in came:
+            return None
+        path = []
+        i = goal
+        while i != start:
+            path.append(i)
+            i = came[i]
+        path.reverse()
+        return path
@@ -0,0 +1,183 @@
+import time
+import tkinter as tk
+
+from games import perf
+from games.lifecycle import Lifecycle
+from games.snake_arena_engine import Arena, EMPTY_CELL, FOOD, SNAKE
+
+COLS = 300
+ROWS = 200
+CELL = 4           # размер клетки в пикселях
+VIEW_WIDTH = 1000  # размер видимой области, остальное — прокруткой
+VIEW_HEIGHT = 480
+PERIOD = 0.1       # секунд на такт
+SNAKE_COUNTS = (100, 250, 500, 1000)
+BACKGROUND = "#1e1e1e"
+FOOD_COLOR = "#e53935"
+PALETTE = ("#43a047", "#1e88e5", "#fdd835", "#8e24aa", "#00acc1", "#fb8c00",
+           "#7cb342", "#3949ab", "#f06292", "#26a69a", "#c0ca33", "#ffffff")
+
+
+class GameFrame(tk.Frame, Lifecycle):
+    # Арена змей. Всё поле — один PhotoImage: за такт перекрашиваются только клетки
+    # из списка изменений движка, поэтому стоимость отрисовки зависит от числа
+    # сдвинувшихся змей, а не от размера поля.
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="white")
+        self.controller = controller
+        self.arena = None
+        self.task = None
+        self.running = False  # шла ли арена, когда экран скрыли
+        self.engine_time = 0.0
+        self.render_time = 0.0
+        self.last_tick = None
+        self.tick_rate = 0.0
+
+        # Верхняя панель
+        top = tk.Frame(self, bg="white")
+        top.pack(pady=10)
+
+        tk.Label(top, text="Арена змей", bg="white", font=("Arial", 18)).pack(side=tk.LEFT, padx=20)
+
+        tk.Label(top, text="Змей:", bg="white", font=("Arial", 14)).pack(side=tk.LEFT)
+        self.count_var = tk.IntVar(value=500)
+        menu = tk.OptionMenu(top, self.count_var, *SNAKE_COUNTS, command=lambda _: self.restart_game())
+        menu.config(font=("Arial", 12))
+        menu.pack(side=tk.LEFT, padx=10)
+
+        tk.Button(top, text="Заново", bg="#d32f2f", fg="white", font=("Arial", 14), width=10,
+                  command=self.restart_game).pack(side=tk.LEFT, padx=10)
+        self.pause_button = tk.Button(top, text="Пауза", bg="#00cc00", fg="white", font=("Arial", 14), width=10,
+                                      command=self.pause_game)
+        self.pause_button.pack(side=tk.LEFT, padx=10)
+
+        # Поле с прокруткой: колесо, Shift+колесо и перетаскивание мышью
+        field = tk.Frame(self, bg="white")
+        field.pack()
+        self.canvas = tk.Canvas(field, width=VIEW_WIDTH, height=VIEW_HEIGHT, bg=BACKGROUND, highlightthickness=0,
+                                scrollregion=(0, 0, COLS * CELL, ROWS * CELL))
+        vbar = tk.Scrollbar(field, orient="vertical", command=self.canvas.yview)
+        hbar = tk.Scrollbar(field, orient="horizontal", command=self.canvas.xview)
+        self.canvas.config(xscrollcommand=hbar.set, yscrollcommand=vbar.set)
+        self.canvas.grid(row=0, column=0)
+        vbar.grid(row=0, column=1, sticky="ns")
+        hbar.grid(row=1, column=0, sticky="ew")
+        self.canvas.bind("<ButtonPress-1>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B1-Motion>", lambda e: self.canvas.scan_dragto(e.x, e.y, gain=1))
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(-3 if e.delta > 0 else 3, "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.canvas.xview_scroll(-3 if e.delta > 0 else 3, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(3, "units"))
+
+        self.image = tk.PhotoImage(width=COLS * CELL, height=ROWS * CELL)
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+
+        # Нижняя панель
+        bottom = tk.Frame(self, bg="white")
+        bottom.pack(pady=10)
+        self.stats_label = tk.Label(bottom, text="", font=("Arial", 12), bg="white", fg="#555555")
+        self.stats_label.pack(side=tk.LEFT, padx=20)
+        tk.Button(bottom, text="Назад в меню", bg="#4285f4", fg="white", font=("Arial", 14), width=10,
+                  command=self.back_to_menu).pack(side=tk.RIGHT, padx=20)
+
+        self.restart_game()
+
+    # ------------------------ Игровой цикл ------------------------
+    def restart_game(self):
+        self.stop()
+        self.arena = Arena(COLS, ROWS, self.count_var.get())
+        # Полная перерисовка — один раз; дальше только изменённые клетки
+        self.image.put(BACKGROUND, to=(0, 0, COLS * CELL, ROWS * CELL))
+        self.draw(self.arena.changes)
+        self.start()
+
+    def start(self):
+        self.pause_button.config(text="Пауза", bg="#00cc00")
+        self.last_tick = None
+        self.task = self.controller.scheduler.every(PERIOD, self.tick, owner=self)
+
+    def stop(self):
+        self.controller.scheduler.cancel(self.task)
+        self.task = None
+
+    def pause_game(self):
+        if self.task is None:
+            self.start()
+        else:
+            self.stop()
+            self.pause_button.config(text="Продолжить", bg="#cccc00")
+
+    @perf.timed("arena.tick")
+    def tick(self):
+        started = time.perf_counter()
+        changes = self.arena.step()
+        drawn = time.perf_counter()
+        self.draw(changes)
+        finished = time.perf_counter()
+        # Скользящие средние: время движка, отрисовки и фактическая частота тактов
+        self.engine_time += (drawn - started - self.engine_time) * 0.1
+        self.render_time += (finished - drawn - self.render_time) * 0.1
+        if self.last_tick is not None:
+            self.tick_rate += (1 / max(started - self.last_tick, 1e-6) - self.tick_rate) * 0.1
+        self.last_tick = started
+        if self.arena.ticks % 5 == 0:
+            alive = sum(bot.alive for bot in self.arena.bots)
+            self.stats_label.config(
+                text=f"Змей: {alive}, такт {self.arena.ticks}, {self.tick_rate:.1f} тактов/с — "
+                     f"движок {self.engine_time * 1000:.1f} мс, отрисовка {self.render_time * 1000:.1f} мс, "
+                     f"гибелей: {self.arena.deaths}"
+            )
+
+    @perf.timed("arena.draw")
+    def draw(self, changes):
+        # Клетка могла меняться за такт несколько раз — рисуется последнее состояние
+        put = self.image.put
+        cols = COLS
+        for i, state in dict(changes).items():
+            y, x = divmod(i, cols)
+            if state == EMPTY_CELL:
+                color = BACKGROUND
+            elif state == FOOD:
+                color = FOOD_COLOR
+            else:
+                color = PALETTE[(state - SNAKE) % len(PALETTE)]
+            put(color, to=(x * CELL, y * CELL, x * CELL + CELL, y * CELL + CELL))
+
+    def back_to_menu(self):
+        self.controller.back_to_menu()
+
+    # ------------------------ Жизненный цикл ------------------------
+    def on_hide(self):
+        # Скрытая арена не тикает; при возвращении продолжит, если шла
+        self.running = self.task is not None
+        self.stop()
+
+    def on_show(self):
+        if self.running and self.task is None:
+            self.start()
+
+    def suspend(self):
+        # Арена без интерфейса — обычный объект Python, её можно просто сохранить
+        return {"arena": self.arena, "running": self.task is not None or self.running}
+
+    def resume(self, state):
+        self.stop()
+        self.arena = state["arena"]
+        self.count_var.set(len(self.arena.bots))
+        self.image.put(BACKGROUND, to=(0, 0, COLS * CELL, ROWS * CELL))
+        self.draw(self.full_state())
+        self.running = state["running"]
+        if not self.running:
+            self.pause_button.config(text="Продолжить", bg="#cccc00")
+
+    def full_state(self):
+        # Все непустые клетки арены — для перерисовки с нуля
+        arena = self.arena
+        cells = [(i, FOOD) for i, v in enumerate(arena.food) if v]
+        for bot in arena.bots:
+            if bot.alive:
+                cells.extend((i, SNAKE + bot.id) for i in bot.body)
+        return cells
+
+    def dispose(self):
+        self.stop()
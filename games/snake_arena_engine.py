@@ -0,0 +1,238 @@
+import argparse
+import random
+import time
+from collections import deque
+
+from games.snake_engine import new_seed
+
+# Состояния клеток в списке изменений: пустая, еда, иначе — номер змейки + SNAKE
+EMPTY_CELL = 0
+FOOD = 1
+SNAKE = 2
+
+BUCKET = 16          # сторона квадрата пространственного индекса еды, в клетках
+SEARCH_RINGS = 3     # насколько далеко (в квадратах индекса) бот ищет еду
+START_LENGTH = 3
+FOOD_PER_SNAKE = 1   # сколько еды держать на поле в расчёте на одну змейку
+DROP_EVERY = 2       # погибшая змейка оставляет еду в каждой DROP_EVERY-й клетке тела
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Bot:
+    def __init__(self, sid):
+        self.id = sid
+        self.body = deque()   # индексы клеток от хвоста к голове
+        self.vector = (1, 0)
+        self.grow = 0
+        self.alive = False
+        self.target = None    # клетка с едой, к которой бот идёт
+        self.score = 0
+
+
+class Arena:
+    # Арена: сотни змей-ботов на одном большом поле без интерфейса.
+    # occupied — общая сетка занятости (bytearray) для тел всех змей, food — для еды.
+    # Такт разрешается пакетно: сначала уходят хвосты, потом все головы проверяются
+    # по сетке, а столкновения голов — по словарю «клетка -> змеи». Каждое изменение
+    # клетки попадает в changes, поэтому интерфейс перерисовывает только их.
+    def __init__(self, cols, rows, snakes, seed=None):
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = random.Random(self.seed)
+        self.occupied = bytearray(cols * rows)
+        self.food = bytearray(cols * rows)
+        # Пространственный индекс еды: квадрат BUCKET × BUCKET -> множество клеток
+        self.bucket_cols = (cols + BUCKET - 1) // BUCKET
+        self.bucket_rows = (rows + BUCKET - 1) // BUCKET
+        self.buckets = [set() for _ in range(self.bucket_cols * self.bucket_rows)]
+        self.food_count = 0
+        self.food_target = snakes * FOOD_PER_SNAKE
+        self.bots = [Bot(sid) for sid in range(snakes)]
+        self.ticks = 0
+        self.deaths = 0
+        self.changes = []  # (клетка, состояние) за последний такт
+        for bot in self.bots:
+            self.spawn(bot)
+        self.spawn_food()
+
+    # --- Еда ---
+    def bucket(self, i):
+        y, x = divmod(i, self.cols)
+        return (y // BUCKET) * self.bucket_cols + x // BUCKET
+
+    def add_food(self, i):
+        if not self.food[i] and not self.occupied[i]:
+            self.food[i] = 1
+            self.buckets[self.bucket(i)].add(i)
+            self.food_count += 1
+            self.changes.append((i, FOOD))
+
+    def remove_food(self, i):
+        self.food[i] = 0
+        self.buckets[self.bucket(i)].discard(i)
+        self.food_count -= 1
+
+    def spawn_food(self):
+        # Поле почти пустое, поэтому случайная клетка почти всегда свободна
+        n = self.cols * self.rows
+        for _ in range(2 * (self.food_target - self.food_count)):
+            if self.food_count >= self.food_target:
+                break
+            self.add_food(self.rng.randrange(n))
+
+    def nearest_food(self, i):
+        # Ближайшая еда ищется по кольцам квадратов индекса вокруг головы,
+        # а не перебором всей еды на поле
+        y, x = divmod(i, self.cols)
+        by, bx = y // BUCKET, x // BUCKET
+        for ring in range(SEARCH_RINGS + 1):
+            best, best_dist = None, None
+            for qy in range(max(by - ring, 0), min(by + ring + 1, self.bucket_rows)):
+                for qx in range(max(bx - ring, 0), min(bx + ring + 1, self.bucket_cols)):
+                    if ring and max(abs(qy - by), abs(qx - bx)) != ring:
+                        continue
+                    for j in self.buckets[qy * self.bucket_cols + qx]:
+                        jy, jx = divmod(j, self.cols)
+                        dist = abs(jy - y) + abs(jx - x)
+                        if best_dist is None or dist < best_dist:
+                            best, best_dist = j, dist
+            if best is not None:
+                return best
+        return None
+
+    # --- Змеи ---
+    def spawn(self, bot):
+        # Новая змейка — прямой отрезок в случайном свободном месте
+        cols, rows = self.cols, self.rows
+        for _ in range(20):
+            dx, dy = self.rng.choice(DIRECTIONS)
+            x = self.rng.randrange(START_LENGTH, cols - START_LENGTH)
+            y = self.rng.randrange(START_LENGTH, rows - START_LENGTH)
+            cells = [(y + dy * k) * cols + x + dx * k for k in range(START_LENGTH)]
+            if any(self.occupied[i] or self.food[i] for i in cells):
+                continue
+            bot.body = deque(cells)
+            bot.vector = (dx, dy)
+            bot.grow = 0
+            bot.target = None
+            bot.alive = True
+            state = SNAKE + bot.id
+            for i in cells:
+                self.occupied[i] = 1
+                self.changes.append((i, state))
+            return True
+        return False
+
+    def steer(self, bot):
+        # Жадный бот: из трёх направлений (без разворота) — свободное и ближайшее к еде
+        cols, rows = self.cols, self.rows
+        head = bot.body[-1]
+        y, x = divmod(head, cols)
+        target = bot.target
+        if target is None or not self.food[target]:
+            target = bot.target = self.nearest_food(head)
+        if target is not None:
+            ty, tx = divmod(target, cols)
+        vx, vy = bot.vector
+        best, best_score = bot.vector, None
+        for dx, dy in DIRECTIONS:
+            if dx == -vx and dy == -vy:
+                continue
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows) or self.occupied[ny * cols + nx]:
+                continue
+            score = abs(tx - nx) + abs(ty - ny) if target is not None else 0
+            score += self.rng.random()  # случайный выбор среди равных
+            if best_score is None or score < best_score:
+                best, best_score = (dx, dy), score
+        return best
+
+    # --- Такт ---
+    def step(self):
+        self.ticks += 1
+        self.changes = []
+        changes = self.changes
+        cols, rows = self.cols, self.rows
+        occupied = self.occupied
+        bots = [bot for bot in self.bots if bot.alive]
+
+        for bot in bots:
+            bot.vector = self.steer(bot)
+
+        # Сначала уходят хвосты — в освободившуюся клетку можно входить на этом же такте
+        for bot in bots:
+            if bot.grow:
+                bot.grow -= 1
+            else:
+                tail = bot.body.popleft()
+                occupied[tail] = 0
+                changes.append((tail, EMPTY_CELL))
+
+        # Головы: стена и занятая клетка — гибель, две головы в одной клетке — гибнут обе
+        dead = []
+        targets = {}
+        for bot in bots:
+            y, x = divmod(bot.body[-1], cols)
+            nx, ny = x + bot.vector[0], y + bot.vector[1]
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                dead.append(bot)
+                continue
+            head = ny * cols + nx
+            if occupied[head]:
+                dead.append(bot)
+            elif head in targets:
+                targets[head].append(bot)
+            else:
+                targets[head] = [bot]
+        for head, group in targets.items():
+            if len(group) > 1:
+                dead.extend(group)
+                continue
+            bot = group[0]
+            occupied[head] = 1
+            bot.body.append(head)
+            changes.append((head, SNAKE + bot.id))
+            if self.food[head]:
+                self.remove_food(head)
+                bot.grow += 1
+                bot.score += 1
+
+        # Погибшие змеи освобождают клетки и оставляют еду, на их место приходят новые
+        for bot in dead:
+            bot.alive = False
+            self.deaths += 1
+            for k, i in enumerate(bot.body):
+                occupied[i] = 0
+                changes.append((i, EMPTY_CELL))
+                if k % DROP_EVERY == 0:
+                    self.add_food(i)
+        for bot in self.bots:
+            if not bot.alive:
+                self.spawn(bot)
+        self.spawn_food()
+        return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер скорости арены змей без интерфейса")
+    parser.add_argument("--snakes", type=int, default=500)
+    parser.add_argument("--cols", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    arena = Arena(args.cols, args.rows, args.snakes, seed=args.seed)
+    changes = 0
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        changes += len(arena.step())
+    elapsed = time.perf_counter() - started
+    print(f"{args.snakes} змей, поле {args.cols}×{args.rows}: {args.ticks} тактов за {elapsed:.2f} с — "
+          f"{args.ticks / elapsed:.0f} тактов/с, {elapsed / args.ticks * 1000:.1f} мс на такт")
+    print(f"изменённых клеток на такт: {changes / args.ticks:.0f}, гибелей: {arena.deaths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import random
+from collections import deque
+
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+START = ((1, 1), (2, 1), (3, 1))  # от хвоста к голове, голова смотрит вправо
+INPUT_BUFFER = 3  # сколько поворотов запоминается между тактами
+
+
+def new_seed():
+    return random.getrandbits(32)
+
+
+class Grid:
+    # Занятость клеток поля (bytearray) и индекс свободных клеток: список плюс
+    # позиция каждой клетки в нём. Проверка, занятие, освобождение и выбор
+    # случайной свободной клетки — O(1) при любой длине змейки.
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.occupied = bytearray(cols * rows)
+        self.free = list(range(cols * rows))
+        self.index = list(range(cols * rows))  # клетка -> позиция в free
+
+    def inside(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def is_occupied(self, x, y):
+        return self.occupied[y * self.cols + x]
+
+    def occupy(self, x, y):
+        i = y * self.cols + x
+        self.occupied[i] = 1
+        # Удаление из списка свободных: на место клетки встаёт последняя
+        pos = self.index[i]
+        last = self.free.pop()
+        if last != i:
+            self.free[pos] = last
+            self.index[last] = pos
+
+    def release(self, x, y):
+        i = y * self.cols + x
+        self.occupied[i] = 0
+        self.index[i] = len(self.free)
+        self.free.append(i)
+
+    def random_free(self, rng):
+        if not self.free:
+            return None
+        return divmod(self.free[rng.randrange(len(self.free))], self.cols)[::-1]
+
+
+class SnakeGame:
+    # Правила змейки без интерфейса: поле — сетка клеток, яблоки выбираются
+    # генератором с сидом, поэтому партия полностью определяется сидом и
+    # последовательностью поворотов. GameFrame только рисует это состояние.
+    def __init__(self, cols, rows, seed=None, start=START):
+        if cols * rows <= len(start):
+            raise ValueError("board is too small for the snake")
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = random.Random(self.seed)
+        self.grid = Grid(cols, rows)
+        # Клетки от хвоста к голове
+        self.cells = deque(start)
+        for x, y in start:
+            self.grid.occupy(x, y)
+        self.vector = RIGHT
+        self.inputs = deque(maxlen=INPUT_BUFFER)
+        self.grow = 0  # сколько следующих ходов хвост остаётся на месте
+        self.score = 0
+        self.ticks = 0
+        # Журнал смен направления (такт, направление) — по нему партия воспроизводится
+        self.turns = []
+        self.status = PLAYING
+        # Итог последнего такта для отрисовки: освободившаяся клетка хвоста
+        # (None, если змейка выросла) и было ли съедено яблоко
+        self.freed = None
+        self.ate = False
+        self.apple = None
+        self.spawn_apple()
+
+    @property
+    def head(self):
+        return self.cells[-1]
+
+    def turn(self, vector):
+        # Повороты копятся в буфере, поэтому два быстрых нажатия за один такт не теряются;
+        # разворот проверяется относительно последнего направления в буфере
+        last = self.inputs[-1] if self.inputs else self.vector
+        if vector != last and vector != (-last[0], -last[1]):
+            self.inputs.append(vector)
+
+    def step(self, vector=None):
+        # Один такт. Возвращает False, если партия закончилась: змейка врезалась
+        # в стену или в себя (LOST) либо заняла всё поле (WON).
+        # vector задаёт направление такта напрямую — так идёт воспроизведение повтора.
+        if self.status != PLAYING:
+            return False
+        # За такт применяется один запомненный поворот, остальные ждут следующих тактов
+        if vector is None and self.inputs:
+            vector = self.inputs.popleft()
+        if vector is not None and vector != self.vector:
+            self.vector = vector
+            self.turns.append((self.ticks, vector))
+        self.ticks += 1
+        self.ate = False
+        self.freed = None
+        x, y = self.cells[-1]
+        head = (x + self.vector[0], y + self.vector[1])
+        if not self.grid.inside(*head):
+            self.status = LOST
+            return False
+        if self.grow:
+            self.grow -= 1
+        else:
+            # Хвост уходит раньше, чем голова занимает клетку, — в его место входить можно
+            self.freed = self.cells.popleft()
+            self.grid.release(*self.freed)
+        if self.grid.is_occupied(*head):
+            self.status = LOST
+            return False
+        self.grid.occupy(*head)
+        self.cells.append(head)
+        if head == self.apple:
+            self.ate = True
+            self.score += 1
+            self.grow += 1
+            self.spawn_apple()
+        return self.status == PLAYING
+
+    def spawn_apple(self):
+        # Яблоко — всегда в свободной клетке: выбор из индекса свободных клеток за O(1)
+        self.apple = self.grid.random_free(self.rng)
+        if self.apple is None:
+            # Змейка заняла всё поле
+            self.status = WON
@@ -0,0 +1,178 @@
+import argparse
+import os
+import struct
+import time
+
+from games.snake_engine import SnakeGame, PLAYING, UP, DOWN, LEFT, RIGHT
+
+REPLAY_DIR = "games/data/replays"
+MAX_BYTES = 1024 * 1024  # предел размера хранилища повторов
+SUFFIX = ".snr"
+
+# Повтор: заголовок, затем смены направления. Каждая смена — одно varint-число
+# (разница тактов с предыдущей сменой << 2 | код направления), обычно 1–2 байта.
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHQII")  # сигнатура, версия, cols, rows, seed, score, ticks
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+CODES = {vector: code for code, vector in enumerate(DIRECTIONS)}
+
+
+class Replay:
+    # Партия целиком определяется размером поля, сидом и сменами направления:
+    # яблоки SnakeGame берёт из генератора с этим сидом
+    def __init__(self, cols, rows, seed, turns, score=0, ticks=0):
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed
+        self.turns = turns  # [(такт, направление)]
+        self.score = score
+        self.ticks = ticks
+
+    @classmethod
+    def from_game(cls, game):
+        return cls(game.cols, game.rows, game.seed, list(game.turns), game.score, game.ticks)
+
+    # --- Формат ---
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.cols, self.rows, self.seed, self.score, self.ticks))
+        last = 0
+        for tick, vector in self.turns:
+            value = (tick - last) << 2 | CODES[vector]
+            last = tick
+            while value >= 0x80:
+                out.append(value & 0x7F | 0x80)
+                value >>= 7
+            out.append(value)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("truncated snake replay")
+        magic, version, cols, rows, seed, score, ticks = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("unsupported snake replay format")
+        turns = []
+        tick = value = shift = 0
+        for byte in data[HEADER.size:]:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                tick += value >> 2
+                turns.append((tick, DIRECTIONS[value & 3]))
+                value = shift = 0
+        if shift:
+            raise ValueError("truncated snake replay")
+        return cls(cols, rows, seed, turns, score, ticks)
+
+    # --- Воспроизведение ---
+    def play(self, limit=None):
+        # Пересчёт партии без интерфейса: возвращает SnakeGame в конечном состоянии
+        game = SnakeGame(self.cols, self.rows, seed=self.seed)
+        limit = self.ticks if limit is None else limit
+        turns = iter(self.turns)
+        turn = next(turns, None)
+        while game.status == PLAYING and game.ticks < limit:
+            vector = None
+            if turn is not None and turn[0] == game.ticks:
+                vector = turn[1]
+                turn = next(turns, None)
+            game.step(vector)
+        return game
+
+    def verify(self):
+        # Совпадают ли счёт и длина пересчитанной партии с записанными
+        game = self.play()
+        return game.score == self.score and game.ticks == self.ticks
+
+
+class ReplayStore:
+    # Повторы — отдельные файлы «время-счёт.snr» в одном каталоге. Когда суммарный
+    # размер превышает max_bytes, удаляются самые старые; повтор с лучшим счётом
+    # не удаляется никогда, чтобы рекорд всегда можно было проверить.
+    def __init__(self, directory=REPLAY_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def save(self, replay):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{time.time_ns() // 1000000}-{replay.score}{SUFFIX}")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(replay.to_bytes())
+        os.replace(tmp, path)
+        self.evict()
+        return path
+
+    def entries(self):
+        # [(путь, счёт, размер)] от новых к старым
+        if not os.path.isdir(self.directory):
+            return []
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                stamp, score = map(int, name[:-len(SUFFIX)].split("-"))
+                size = os.path.getsize(os.path.join(self.directory, name))
+            except (ValueError, OSError):
+                continue
+            result.append((stamp, os.path.join(self.directory, name), score, size))
+        result.sort(reverse=True)
+        return [entry[1:] for entry in result]
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            return Replay.from_bytes(f.read())
+
+    def latest(self):
+        entries = self.entries()
+        return self.load(entries[0][0]) if entries else None
+
+    def best(self):
+        entries = self.entries()
+        return self.load(max(entries, key=lambda e: e[1])[0]) if entries else None
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        if not entries or total <= self.max_bytes:
+            return
+        best = max(entries, key=lambda e: e[1])[0]
+        for path, _, size in reversed(entries):
+            if total <= self.max_bytes:
+                break
+            if path == best:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка повторов змейки пересчётом без интерфейса")
+    parser.add_argument("files", nargs="*", help="файлы повторов; по умолчанию — всё хранилище")
+    parser.add_argument("--dir", default=REPLAY_DIR)
+    args = parser.parse_args()
+
+    store = ReplayStore(args.dir)
+    paths = args.files or [path for path, _, _ in store.entries()]
+    ticks = bad = 0
+    started = time.perf_counter()
+    for path in paths:
+        replay = store.load(path)
+        ok = replay.verify()
+        ticks += replay.ticks
+        bad += not ok
+        print(f"{os.path.basename(path)}: счёт {replay.score}, тактов {replay.ticks}, "
+              f"смен направления {len(replay.turns)} — {'совпадает' if ok else 'НЕ СОВПАДАЕТ'}")
+    elapsed = time.perf_counter() - started
+    print(f"проверено повторов: {len(paths)}, расхождений: {bad}, "
+          f"{ticks / elapsed if elapsed else 0:.0f} тактов/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from games.snake_ai import Autopilot
+from games.snake_engine import SnakeGame, PLAYING, WON
+
+CHUNK = 20  # партий в одном задании для процесса-исполнителя
+STALL = 2   # партия прерывается, если яблока нет дольше STALL * (клеток поля) тактов
+
+
+def play(seed, cols, rows, strategy, max_ticks=None):
+    # Одна партия автопилота с воспроизводимыми яблоками;
+    # возвращает (очки, тактов, выиграна ли, раскрыто клеток поиском, время поиска)
+    game = SnakeGame(cols, rows, seed=seed)
+    pilot = Autopilot(strategy)
+    stall = STALL * cols * rows
+    last_apple = 0
+    while game.status == PLAYING:
+        game.turn(pilot.choose(game))
+        game.step()
+        if game.ate:
+            last_apple = game.ticks
+        elif game.ticks - last_apple > stall or (max_ticks and game.ticks >= max_ticks):
+            break
+    return game.score, game.ticks, game.status == WON, pilot.nodes, pilot.plan_time
+
+
+def play_chunk(first_seed, count, cols, rows, strategy, max_ticks):
+    score = ticks = wins = nodes = 0
+    plan_time = 0.0
+    for seed in range(first_seed, first_seed + count):
+        s, t, won, n, p = play(seed, cols, rows, strategy, max_ticks)
+        score += s
+        ticks += t
+        wins += won
+        nodes += n
+        plan_time += p
+    return count, score, ticks, wins, nodes, plan_time
+
+
+def run_batch(games, cols, rows, strategy="safe", workers=None, seed=0, max_ticks=None):
+    # Партии раздаются процессам пачками по CHUNK; партия i играется с сидом seed + i,
+    # поэтому результат не зависит от числа процессов
+    workers = workers or os.cpu_count() or 1
+    chunks = [(seed + i, min(CHUNK, games - i)) for i in range(0, games, CHUNK)]
+    played = score = ticks = wins = nodes = 0
+    plan_time = 0.0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, first, count, cols, rows, strategy, max_ticks)
+                   for first, count in chunks]
+        for future in futures:
+            n, s, t, w, e, p = future.result()
+            played += n
+            score += s
+            ticks += t
+            wins += w
+            nodes += e
+            plan_time += p
+    elapsed = time.perf_counter() - started
+
+    return {
+        "games": played,
+        "wins": wins,
+        "avg_score": score / played if played else 0.0,
+        "ticks": ticks,
+        "elapsed": elapsed,
+        "ticks_per_sec": ticks / elapsed if elapsed else 0.0,
+        "nodes_per_tick": nodes / ticks if ticks else 0.0,
+        "plan_us_per_tick": plan_time / ticks * 1e6 if ticks else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная симуляция змейки с автопилотом")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=28)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--strategy", choices=Autopilot.STRATEGIES, default="safe")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=None, help="предел тактов на партию")
+    args = parser.parse_args()
+
+    stats = run_batch(args.games, args.cols, args.rows, args.strategy, args.workers, args.seed, args.max_ticks)
+    print(f"{stats['games']} партий, {stats['ticks']} тактов за {stats['elapsed']:.2f} с — "
+          f"{stats['ticks_per_sec']:.0f} тактов/с")
+    print(f"средний счёт: {stats['avg_score']:.1f}, поле заполнено: {stats['wins']}")
+    print(f"поиск пути: {stats['nodes_per_tick']:.1f} клеток и {stats['plan_us_per_tick']:.1f} мкс на такт")
+
+
+if __name__ == "__main__":
+    main()
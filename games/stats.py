@@ -0,0 +1,111 @@
+import time
+import tkinter as tk
+
+from games.history import history
+from games.lifecycle import Lifecycle
+
+GAMES = (("snake", "Змейка"), ("minesweeper", "Сапёр"), ("tictactoe", "Крестики-нолики"))
+METRIC_NAMES = {"snake": "очки", "minesweeper": "время победы, с", "tictactoe": "ходов до победы"}
+PERCENTILES = (50, 90, 99)
+
+
+class GameFrame(tk.Frame, Lifecycle):
+    # Статистика партий: таблица лидеров, перцентили и серии по каждой игре и варианту.
+    # Экран читает только сводки истории и верх индекса, поэтому при каждом показе
+    # просто перечитывает их — это доли миллисекунды при любом числе партий.
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="white")
+        self.controller = controller
+        self.game = GAMES[0][0]
+        self.variant = None
+
+        # Верхняя панель: игра и вариант
+        top = tk.Frame(self, bg="white")
+        top.pack(pady=10)
+
+        tk.Label(top, text="Статистика", bg="white", font=("Arial", 18)).pack(side=tk.LEFT, padx=20)
+
+        self.game_var = tk.StringVar(value=GAMES[0][1])
+        game_menu = tk.OptionMenu(top, self.game_var, *(title for _, title in GAMES), command=self.select_game)
+        game_menu.config(font=("Arial", 12))
+        game_menu.pack(side=tk.LEFT, padx=10)
+
+        self.variant_var = tk.StringVar(value="")
+        self.variant_menu = tk.OptionMenu(top, self.variant_var, "")
+        self.variant_menu.config(font=("Arial", 12))
+        self.variant_menu.pack(side=tk.LEFT, padx=10)
+
+        # Сводка и таблица лидеров
+        self.summary_label = tk.Label(self, text="", bg="white", font=("Arial", 14), justify=tk.LEFT)
+        self.summary_label.pack(pady=10)
+
+        self.board_title = tk.Label(self, text="", bg="white", font=("Arial", 14, "bold"))
+        self.board_title.pack()
+        self.leaderboard = tk.Listbox(self, font=("Courier", 13), width=60, height=10, activestyle="none")
+        self.leaderboard.pack(pady=5)
+
+        # Нижняя панель
+        bottom = tk.Frame(self, bg="white")
+        bottom.pack(pady=10)
+        tk.Button(bottom, text="Назад в меню", bg="#4285f4", fg="white", font=("Arial", 14), width=12,
+                  command=self.back_to_menu).pack()
+
+    # ------------------------ Выбор ------------------------
+    def select_game(self, title):
+        self.game = next(game for game, name in GAMES if name == title)
+        self.variant = None
+        self.refresh()
+
+    def select_variant(self, variant):
+        self.variant = variant
+        self.variant_var.set(variant)
+        self.show()
+
+    def refresh(self):
+        # Список вариантов мог пополниться, пока экран был скрыт
+        variants = history().variants(self.game)
+        menu = self.variant_menu["menu"]
+        menu.delete(0, tk.END)
+        for variant in variants:
+            menu.add_command(label=variant, command=lambda v=variant: self.select_variant(v))
+        if self.variant not in variants:
+            self.variant = variants[0] if variants else None
+        self.variant_var.set(self.variant or "")
+        self.show()
+
+    # ------------------------ Отрисовка ------------------------
+    def show(self):
+        self.leaderboard.delete(0, tk.END)
+        totals = history().totals(self.game, self.variant) if self.variant is not None else None
+        if totals is None:
+            self.summary_label.config(text="Сыгранных партий пока нет")
+            self.board_title.config(text="")
+            return
+
+        lines = [f"Партий: {totals['plays']} — побед {totals['wins']}, поражений {totals['losses']}, "
+                 f"ничьих {totals['draws']}",
+                 f"Серия побед: {totals['streak']} (лучшая: {totals['best_streak']})"]
+        if totals["seconds"]:
+            lines.append(f"Среднее время партии: {totals['seconds'] / totals['plays']:.1f} с")
+        metric = METRIC_NAMES[self.game]
+        percentiles = history().percentiles(self.game, self.variant, PERCENTILES)
+        if percentiles:
+            lines.append(f"Перцентили ({metric}): " + ", ".join(f"{p}-й — {percentiles[p]}" for p in PERCENTILES))
+        rank = history().rank(self.game, self.variant, totals["last_value"])
+        if rank is not None:
+            lines.append(f"Последняя партия лучше {rank:.0f}% партий")
+        self.summary_label.config(text="\n".join(lines))
+
+        self.board_title.config(text=f"Лучшие партии ({metric})")
+        for place, (value, result, length, moves, seconds, finished) in enumerate(
+                history().leaderboard(self.game, self.variant), 1):
+            details = f"длина {length}" if length is not None else f"ходов {moves}" if moves is not None else ""
+            when = time.strftime("%d.%m.%Y %H:%M", time.localtime(finished))
+            self.leaderboard.insert(tk.END, f"{place:>2}. {value:>8g}   {details:<12} {when}")
+
+    def back_to_menu(self):
+        self.controller.back_to_menu()
+
+    # ------------------------ Жизненный цикл ------------------------
+    def on_show(self):
+        self.refresh()
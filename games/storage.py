@@ -0,0 +1,265 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from games import perf
+
+DB_FILE = "games/data/minigame.db"
+FLUSH_INTERVAL = 0.25  # сколько секунд фоновый поток собирает записи в одну транзакцию
+
+log = logging.getLogger("minigame")
+
+APPEND = object()  # значение blob неизвестно: к записанному на диск что-то дописывается
+
+_storage = None
+_storage_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS blobs (key TEXT PRIMARY KEY, data BLOB NOT NULL, seq INTEGER NOT NULL DEFAULT 0);
+"""
+
+
+class Storage:
+    # Общее хранилище всех игр: SQLite в режиме WAL, два пространства ключей —
+    # значения JSON (kv) и двоичные данные (blobs); модули со своими таблицами
+    # (история партий) добавляют их через ensure_schema() и пишут операцией "sql".
+    # Запись идёт через очередь в фоновый поток: он собирает записи за FLUSH_INTERVAL,
+    # оставляет по каждому ключу последнее значение и фиксирует всё одной транзакцией.
+    # Значения kv целиком держатся в памяти, поэтому get() не ходит на диск;
+    # поток Tk на диск не пишет никогда.
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = self.connect()
+        self.db.executescript(SCHEMA)
+        if "seq" not in [column[1] for column in self.db.execute("PRAGMA table_info(blobs)")]:
+            self.db.execute("ALTER TABLE blobs ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+        # Номер последней операции с blob: по нему get_blob отличает уже
+        # зафиксированные дописывания от стоящих в очереди
+        self.seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM blobs").fetchone()[0]
+        self.values = {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM kv")}
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="storage", daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # --- Ключ-значение ---
+    def get(self, key, default=None):
+        with self.lock:
+            return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.write([("set", key, value)])
+
+    def delete(self, key):
+        self.write([("delete", key)])
+
+    # --- Двоичные данные ---
+    def get_blob(self, key, default=None):
+        # Ещё не записанное значение берётся из памяти; если в очереди только
+        # дописывания к сохранённому — к записанному на диск добавляются те из них,
+        # что новее его номера. Фоновую запись не ждёт
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is not None and entry[1] is not APPEND:
+                return entry[1] if entry[1] is not None else default
+            row = self.db.execute("SELECT data, seq FROM blobs WHERE key = ?", (key,)).fetchone()
+            chunks = [data for seq, data in entry[2] if row is None or seq > row[1]] if entry is not None else []
+        if row is None and not chunks:
+            return default
+        return (bytes(row[0]) if row is not None else b"") + b"".join(chunks)
+
+    def set_blob(self, key, data):
+        self.write([("blob", key, bytes(data))])
+
+    def append_blob(self, key, data):
+        # Дописывание в конец; отсутствующий ключ создаётся
+        self.write([("append", key, bytes(data))])
+
+    # --- Свои таблицы ---
+    def ensure_schema(self, script):
+        # CREATE ... IF NOT EXISTS, один раз при первом обращении модуля к своим таблицам
+        with self.lock:
+            self.db.executescript(script)
+
+    def query(self, sql, params=()):
+        # Чтение своих таблиц; в режиме WAL не ждёт фоновую запись. Строки, ещё
+        # стоящие в очереди записи, не видны
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    # --- Запись ---
+    def write(self, ops):
+        # Операции одного вызова попадают в одну транзакцию — изменение атомарно:
+        #   ("set", key, value) | ("blob", key, data) | ("append", key, data) | ("delete", key)
+        #   | ("sql", statement, params) — выполняется как есть, после ключей, в порядке вызовов
+        # Значения сериализуются сразу: дальнейшие изменения объекта у вызывающего
+        # на запись не влияют
+        ops = [(op[0], op[1], json.dumps(op[2], ensure_ascii=False)) if op[0] == "set" else op for op in ops]
+        with self.lock:
+            for i, op in enumerate(ops):
+                kind, key = op[0], op[1]
+                if kind == "sql":
+                    continue
+                if kind == "set":
+                    self.values[key] = json.loads(op[2])
+                    continue
+                if kind == "delete":
+                    self.values.pop(key, None)
+                    op = ops[i] = (kind, key, None)
+                # Операции с blob нумеруются; номер пишется в строку вместе с данными
+                self.seq += 1
+                op = ops[i] = op + (self.seq,)
+                # pending: ключ blob -> [операций в очереди, итоговое значение,
+                # дописывания (номер, данные), пока значение неизвестно]
+                entry = self.pending.setdefault(key, [0, APPEND, []])
+                entry[0] += 1
+                if kind == "blob":
+                    entry[1] = op[2]
+                elif kind == "delete":
+                    entry[1] = None
+                elif entry[1] is None:
+                    entry[1] = op[2]
+                elif entry[1] is not APPEND:
+                    entry[1] += op[2]
+                else:
+                    entry[2].append((op[3], op[2]))
+                if entry[1] is not APPEND:
+                    entry[2].clear()
+        self.queue.put(("write", ops))
+
+    def flush(self):
+        # Ждёт, пока всё поставленное в очередь будет зафиксировано
+        if self.thread.is_alive():
+            self.queue.put(("flush", None))
+            self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(("close", None))
+            self.thread.join()
+
+    # --- Разовый перенос старых файлов ---
+    def migrate(self, name, convert):
+        # convert() читает прежние файлы игры и возвращает операции записи; выполняется
+        # один раз на базу, отметка об этом пишется в той же транзакции, что и данные
+        key = f"storage/migrated/{name}"
+        if self.get(key):
+            return
+        ops = convert() or []
+        self.write(list(ops) + [("set", key, True)])
+
+    # --- Фоновый поток записи ---
+    def run(self):
+        db = self.connect()
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while batch[-1][0] == "write":
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            writes = [payload for kind, payload in batch if kind == "write"]
+            ops = [op for payload in writes for op in payload]
+            try:
+                if ops:
+                    with perf.span("storage.commit"):
+                        self.commit(db, ops)
+            except sqlite3.Error:
+                # Общая транзакция откатилась целиком — повторяем записи по одной,
+                # чтобы ошибочная потеряла только себя
+                log.exception("хранилище: пачка из %d записей не зафиксирована, пишем по одной", len(writes))
+                for payload in writes:
+                    try:
+                        self.commit(db, payload)
+                    except sqlite3.Error:
+                        log.exception("хранилище: запись отброшена (%s)",
+                                      ", ".join(op[1] if op[0] != "sql" else "sql" for op in payload))
+            finally:
+                self.release(ops)
+                for _ in batch:
+                    self.queue.task_done()
+            if batch[-1][0] == "close":
+                db.close()
+                return
+
+    def commit(self, db, ops):
+        # По каждому ключу остаётся итоговая операция: из нескольких записей подряд —
+        # последняя, дописывания склеиваются
+        final = {}
+        statements = []
+        for op in ops:
+            kind, key = op[0], op[1]
+            if kind == "sql":
+                statements.append((op[1], op[2]))
+            elif kind == "delete":
+                final[("kv", key)] = ("delete", None, None)
+                final[("blobs", key)] = ("delete", None, None)
+            elif kind == "set":
+                final[("kv", key)] = ("set", op[2], None)
+            elif kind == "blob":
+                final[("blobs", key)] = ("blob", op[2], op[3])
+            else:
+                prev = final.get(("blobs", key))
+                if prev is None:
+                    final[("blobs", key)] = ("append", op[2], op[3])
+                elif prev[0] == "delete":
+                    final[("blobs", key)] = ("blob", op[2], op[3])
+                else:
+                    final[("blobs", key)] = (prev[0], prev[1] + op[2], op[3])
+        db.execute("BEGIN")
+        try:
+            for (table, key), (kind, value, seq) in final.items():
+                if kind == "delete":
+                    db.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+                elif kind == "set":
+                    db.execute("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", (key, value))
+                elif kind == "blob":
+                    db.execute("INSERT OR REPLACE INTO blobs (key, data, seq) VALUES (?, ?, ?)", (key, value, seq))
+                else:
+                    db.execute("INSERT INTO blobs (key, data, seq) VALUES (?, ?, ?) "
+                               "ON CONFLICT(key) DO UPDATE SET data = CAST(data || excluded.data AS BLOB), "
+                               "seq = excluded.seq", (key, value, seq))
+            for sql, params in statements:
+                db.execute(sql, params)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            db.execute("ROLLBACK")
+            raise
+
+    def release(self, ops):
+        # Записанное больше не нужно держать в памяти — если по ключу нет новых операций
+        with self.lock:
+            for op in ops:
+                entry = self.pending.get(op[1]) if op[0] not in ("set", "sql") else None
+                if entry is not None:
+                    entry[0] -= 1
+                    if entry[2] and entry[2][0][0] == op[3]:
+                        entry[2].pop(0)
+                    if not entry[0]:
+                        del self.pending[op[1]]
+
+
+def storage(path=DB_FILE):
+    # Одно хранилище на процесс; закрывается при выходе, дописав очередь
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = Storage(path)
+            atexit.register(_storage.close)
+        return _storage
@@ -1,32 +1,54 @@
 import tkinter as tk
 from tkinter import messagebox
 import json
-import time
-import threading
 import os
 
-DATA_FILE = "games/data/data.json"
+from games import perf
+from games.history import WIN, LOSS, DRAW, history
+from games.lifecycle import Lifecycle
+from games.tictactoe_ai import AIPlayer, HUMAN, LEVELS, MCTS
+from games.tictactoe_board import Board, VARIANTS, X, O
+from games.tictactoe_net import NetClient
+from games.storage import storage
 
-class GameFrame(tk.Frame):
+DATA_KEY = "tictactoe"
+LEGACY_DATA_FILE = "games/data/data.json"  # настройки прежних версий, переносятся в хранилище
+NETWORK = "Желі"  # соперник по сети через games/tictactoe_server.py
+
+
+def legacy_data():
+    # Разовый перенос data.json; битый файл просто пропускается
+    if not os.path.exists(LEGACY_DATA_FILE):
+        return []
+    try:
+        with open(LEGACY_DATA_FILE, "r", encoding="utf-8") as f:
+            return [("set", DATA_KEY, json.load(f))]
+    except (OSError, ValueError):
+        return []
+
+
+class GameFrame(tk.Frame, Lifecycle):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
 
         # --- Загрузка данных ---
-        if not os.path.exists(DATA_FILE):
-            self.data = {"x_wins": 0, "o_wins": 0, "dark_mode": False}
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=4)
-        else:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                self.data = json.load(f)
+        storage().migrate("tictactoe-data", legacy_data)
+        self.data = storage().get(DATA_KEY, {"x_wins": 0, "o_wins": 0, "dark_mode": False})
 
         self.x_wins = self.data.get("x_wins", 0)
         self.o_wins = self.data.get("o_wins", 0)
         self.dark_mode = self.data.get("dark_mode", False)
-        self.board = [""] * 9
-        self.current_player = "X"
+        self.variant = tk.StringVar(value=self.data.get("variant", "3×3"))
+        if self.variant.get() not in VARIANTS:
+            self.variant.set("3×3")
+        self.board = Board(*VARIANTS[self.variant.get()])
         self.buttons = []
+        self.ai = None  # компьютер отвечает на каждый ход человека
+        self.net = None  # соединение с сервером партий в сетевом режиме
+        self.my_stone = None
+        self.thinking = False  # ждём ход компьютера или подтверждение хода от сервера
+        self.resume_ai = False  # экран скрыли, пока компьютер думал
 
         # --- Интерфейс ---
         self.frame = tk.Frame(self)
@@ -35,11 +57,28 @@ class GameFrame(tk.Frame):
         self.score_label = tk.Label(self.frame, text=f"X: {self.x_wins}   O: {self.o_wins}", font=("Arial", 22, "bold"))
         self.score_label.grid(row=0, column=0, columnspan=3, pady=20)
 
-        for i in range(9):
-            b = tk.Button(self.frame, text="", font=("Arial", 36, "bold"), width=5, height=2,
-                          command=lambda i=i: self.on_click(i))
-            b.grid(row=(i // 3) + 1, column=i % 3, padx=10, pady=10)
-            self.buttons.append(b)
+        self.grid_frame = tk.Frame(self.frame)
+        self.grid_frame.grid(row=1, column=0, columnspan=3)
+        self.build_grid()
+
+        self.variant_label = tk.Label(self.frame, text="Өлшем:", font=("Arial", 16))
+        self.variant_label.grid(row=2, column=0, pady=10)
+
+        self.variant_menu = tk.OptionMenu(self.frame, self.variant, *VARIANTS, command=self.change_variant)
+        self.variant_menu.config(font=("Arial", 14))
+        self.variant_menu.grid(row=2, column=1, pady=10)
+
+        self.opponent_label = tk.Label(self.frame, text="Қарсылас:", font=("Arial", 16))
+        self.opponent_label.grid(row=4, column=0, pady=10)
+
+        self.opponent = tk.StringVar(value=self.data.get("opponent", HUMAN))
+        self.opponent_menu = tk.OptionMenu(self.frame, self.opponent, HUMAN, *LEVELS, MCTS, NETWORK,
+                                           command=self.change_opponent)
+        self.opponent_menu.config(font=("Arial", 14))
+        self.opponent_menu.grid(row=4, column=1, pady=10)
+
+        self.status_label = tk.Label(self.frame, text="", font=("Arial", 14))
+        self.status_label.grid(row=4, column=2, pady=10)
 
         self.restart_button = tk.Button(self.frame, text="Қайта бастау", font=("Arial", 16), command=self.restart_game)
         self.restart_button.grid(row=5, column=0, pady=10)
@@ -54,6 +93,7 @@ class GameFrame(tk.Frame):
         self.back_button.grid(row=6, column=0, columnspan=3, pady=10)
 
         self.update_theme()
+        self.set_opponent(self.opponent.get())
 
     # --- Логика темы ---
     def get_colors(self):
@@ -67,64 +107,205 @@ class GameFrame(tk.Frame):
         self.config(bg=bg)
         self.frame.config(bg=bg)
         self.score_label.config(bg=bg, fg=fg)
+        self.grid_frame.config(bg=bg)
+        self.variant_label.config(bg=bg, fg=fg)
+        self.variant_menu.config(bg=cell, fg=fg, activebackground=accent)
+        self.opponent_label.config(bg=bg, fg=fg)
+        self.status_label.config(bg=bg, fg=fg)
+        self.opponent_menu.config(bg=cell, fg=fg, activebackground=accent)
         self.restart_button.config(bg=accent, fg=fg)
         self.reset_scores_button.config(bg=accent, fg=fg)
         self.theme_button.config(bg=cell, fg=fg)
         for b in self.buttons:
             b.config(bg=cell, fg=fg, activebackground=accent)
 
+    # --- Поле ---
+    def build_grid(self):
+        # Кнопки строятся по размеру поля; на больших полях — мельче и плотнее
+        for b in self.buttons:
+            b.destroy()
+        self.buttons = []
+        n = self.board.n
+        if n <= 3:
+            font, width, height, pad = 36, 5, 2, 10
+        elif n <= 5:
+            font, width, height, pad = 24, 3, 1, 4
+        else:
+            font, width, height, pad = max(8, 140 // n), 2, 1, 1
+        for i in range(n * n):
+            b = tk.Button(self.grid_frame, text="", font=("Arial", font, "bold"), width=width, height=height,
+                          command=lambda i=i: self.on_click(i))
+            b.grid(row=i // n, column=i % n, padx=pad, pady=pad)
+            self.buttons.append(b)
+
+    def change_variant(self, name):
+        self.stop_animations()
+        self.board = Board(*VARIANTS[name])
+        self.build_grid()
+        self.update_theme()
+        self.set_opponent(self.opponent.get())
+        self.save_data()
+
     # --- Логика игры ---
     def check_winner(self):
-        wins = [
-            (0,1,2), (3,4,5), (6,7,8),
-            (0,3,6), (1,4,7), (2,5,8),
-            (0,4,8), (2,4,6)
-        ]
-        for a,b,c in wins:
-            if self.board[a] == self.board[b] == self.board[c] and self.board[a] != "":
-                self.animate_win((a,b,c))
-                if self.board[a] == "X":
-                    self.x_wins += 1
-                else:
-                    self.o_wins += 1
-                self.save_data()
-                self.update_score_label()
-                self.disable_all()
-                return True
-        if "" not in self.board:
+        # Сам ход уже проверен полем за O(k); здесь только реакция интерфейса
+        board = self.board
+        if board.win_line is not None:
+            self.animate_win(board.win_line)
+            if board.player() == "X":
+                self.x_wins += 1
+            else:
+                self.o_wins += 1
+            self.record_result(board.player())
+            self.save_data()
+            self.update_score_label()
+            self.disable_all()
+            return True
+        if board.is_over():
+            self.record_result(None)
             messagebox.showinfo("Нәтиже", "Тең ойын!")
             return True
         return False
 
+    def record_result(self, winner):
+        # Исход — со стороны игрока за этим окном: против компьютера он играет X,
+        # по сети — своим знаком; вдвоём за одним окном — со стороны X
+        me = self.my_stone if self.net is not None and self.my_stone else "X"
+        result = DRAW if winner is None else WIN if winner == me else LOSS
+        history().record("tictactoe", f"{self.variant.get()}, {self.opponent.get()}", result, moves=self.board.moves)
+
     def animate_win(self, indices):
+        # Пять миганий за 2.5 с на общем таймере приложения, в потоке Tk
+        bg, fg, cell, accent = self.get_colors()
+        buttons = [self.buttons[i] for i in indices]
+
+        def blink(t):
+            color = accent if int(t * 10) % 2 == 0 and t < 1 else cell
+            for b in buttons:
+                b.config(bg=color)
+
+        self.controller.scheduler.tween(2.5, blink, owner=self)
+
+    def stop_animations(self):
+        self.controller.scheduler.cancel_owner(self)
         bg, fg, cell, accent = self.get_colors()
-        def blink():
-            for _ in range(5):
-                for i in indices:
-                    self.buttons[i].config(bg=accent)
-                time.sleep(0.25)
-                for i in indices:
-                    self.buttons[i].config(bg=cell)
-                time.sleep(0.25)
-        threading.Thread(target=blink).start()
+        for b in self.buttons:
+            b.config(bg=cell)
 
     def on_click(self, index):
-        if self.board[index] == "":
-            self.board[index] = self.current_player
-            self.buttons[index].config(text=self.current_player)
-            if self.check_winner():
+        if self.thinking or self.board[index] != "" or self.board.is_over():
+            return
+        if self.net is not None:
+            # Знак ставится, только когда сервер подтвердит ход
+            if self.my_stone == self.board.player():
+                self.thinking = True
+                self.net.send(f"MOVE {index}")
+            return
+        if self.place(index):
+            return
+        if self.ai is not None:
+            self.start_ai()
+
+    @perf.timed("tictactoe.place")
+    def place(self, index):
+        # Ставит знак текущего игрока; True, если партия закончилась
+        self.buttons[index].config(text=self.board.player())
+        self.board.play(index)
+        return self.check_winner()
+
+    # --- Компьютерный соперник ---
+    def change_opponent(self, level):
+        self.set_opponent(level)
+        self.save_data()
+
+    def set_opponent(self, level):
+        if self.ai is not None:
+            self.ai.cancel()
+        self.leave_network()
+        self.thinking = False
+        self.status_label.config(text="")
+        self.ai = AIPlayer(self.board.n, self.board.k, level) if level in LEVELS or level == MCTS else None
+        if level == NETWORK:
+            self.join_network()
+
+    def start_ai(self):
+        # Поиск идёт в фоновом потоке, окно только периодически проверяет результат
+        self.thinking = True
+        self.status_label.config(text="Ойлануда...")
+        self.ai.start(self.board)
+        self.after(10, self.poll_ai)
+
+    def poll_ai(self):
+        if not self.thinking:
+            return
+        result = self.ai.poll()
+        if result is None:
+            self.after(10, self.poll_ai)
+            return
+        self.thinking = False
+        move, info = result
+        # Для MCTS видно, сколько случайных партий в секунду даёт это железо
+        rate = info.get("playouts_per_sec")
+        self.status_label.config(text=f"{rate:.0f} ойын/с" if rate else "")
+        self.place(move)
+
+    # --- Сетевая игра ---
+    def join_network(self):
+        self.leave_network()
+        self.net = NetClient()
+        self.my_stone = None
+        self.status_label.config(text="Қосылуда...")
+        self.net.connect(self.board.n, self.board.k)
+        self.after(30, self.poll_net, self.net)
+
+    def leave_network(self):
+        if self.net is not None:
+            self.net.close()
+            self.net = None
+
+    def poll_net(self, net):
+        # Сообщения сервера разбираются в потоке Tk небольшими порциями через after()
+        if net is not self.net:
+            return
+        for message in net.poll():
+            kind = message[0]
+            if kind == "WAIT":
+                self.status_label.config(text="Қарсылас күтілуде...")
+            elif kind == "START":
+                self.my_stone = message[2]
+                self.status_label.config(text=f"Сіз: {self.my_stone}")
+            elif kind == "MOVE":
+                self.thinking = False
+                self.place(int(message[1]))
+            elif kind == "ERR":
+                self.thinking = False
+            elif kind == "END":
+                if not self.board.is_over():
+                    self.disable_all()
+                    messagebox.showinfo("Нәтиже", "Қарсылас ойыннан шықты!")
+                self.leave_network()
+                return
+            elif kind == "CLOSED":
+                self.status_label.config(text="Сервермен байланыс жоқ")
+                self.leave_network()
                 return
-            self.current_player = "O" if self.current_player == "X" else "X"
+        self.after(30, self.poll_net, net)
 
     def disable_all(self):
         for b in self.buttons:
             b.config(state="disabled")
 
     def restart_game(self):
-        self.board = [""] * 9
-        self.current_player = "X"
+        self.stop_animations()
+        if self.ai is not None:
+            self.ai.cancel()
+        self.thinking = False
+        self.status_label.config(text="")
+        self.board = Board(*VARIANTS[self.variant.get()])
         for b in self.buttons:
             b.config(text="", state="normal")
+        if self.opponent.get() == NETWORK:
+            self.join_network()
 
     def update_score_label(self):
         self.score_label.config(text=f"X: {self.x_wins}   O: {self.o_wins}")
@@ -140,10 +321,50 @@ class GameFrame(tk.Frame):
         self.update_theme()
 
     def save_data(self):
-        os.makedirs("data", exist_ok=True)
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump({"x_wins": self.x_wins, "o_wins": self.o_wins, "dark_mode": self.dark_mode}, f, indent=4)
+        storage().set(DATA_KEY, {"x_wins": self.x_wins, "o_wins": self.o_wins, "dark_mode": self.dark_mode,
+                                 "opponent": self.opponent.get(), "variant": self.variant.get()})
 
     def back_to_menu(self):
-        self.pack_forget()
         self.controller.back_to_menu()
+
+    # --- Жизненный цикл ---
+    def on_hide(self):
+        # Анимации и опрос останавливаются, сетевая партия покидается (соперник побеждает);
+        # поиск компьютера отменяется и начнётся заново при возвращении
+        self.stop_animations()
+        self.leave_network()
+        if self.thinking and self.ai is not None:
+            self.ai.cancel()
+            self.thinking = False
+            self.resume_ai = True
+
+    def on_show(self):
+        if self.opponent.get() == NETWORK and self.net is None:
+            self.restart_game()
+        elif self.resume_ai:
+            self.resume_ai = False
+            self.start_ai()
+
+    def suspend(self):
+        # Незаконченная партия: знаки на поле; кто ходит, восстановится из их числа
+        if self.board.is_over() or self.opponent.get() == NETWORK:
+            return None
+        return {"variant": self.variant.get(), "cells": bytes(self.board.cells), "ai_turn": self.resume_ai}
+
+    def resume(self, state):
+        if state["variant"] != self.variant.get():
+            return
+        # Знаки ставятся по очереди X, O, X...; партия не закончена, поэтому
+        # промежуточных побед при таком порядке быть не может
+        crosses = [i for i, v in enumerate(state["cells"]) if v == X]
+        noughts = [i for i, v in enumerate(state["cells"]) if v == O]
+        for k, i in enumerate(crosses):
+            self.place(i)
+            if k < len(noughts):
+                self.place(noughts[k])
+        self.resume_ai = state["ai_turn"] and self.ai is not None
+
+    def dispose(self):
+        self.on_hide()
+        if self.ai is not None:
+            self.ai.cancel()
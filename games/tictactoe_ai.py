@@ -0,0 +1,349 @@
+import copy
+import queue
+import random
+import threading
+import time
+
+from games import tictactoe_mcts
+
+WIN = 1000000        # оценка выигранной позиции; ближе к победе — больше
+INF = 10 ** 9
+CHECK_EVERY = 256    # как часто (в узлах) проверяется время
+EXACT, LOWER, UPPER = 0, 1, 2
+
+HUMAN = "Адам"
+# Уровни компьютера: (предельная глубина, секунд на ход, доля случайных ходов)
+LEVELS = {
+    "Оңай": (1, 0.05, 0.3),
+    "Орташа": (3, 0.2, 0.0),
+    "Қиын": (None, 1.0, 0.0),
+}
+MCTS = "MCTS"       # поиск Монте-Карло на всех ядрах — для больших полей
+MCTS_BUDGET = 2.0   # секунд на ход
+
+
+class Timeout(Exception):
+    pass
+
+
+def symmetries(n):
+    # 8 симметрий квадрата как перестановки индексов клеток
+    maps = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = []
+            for i in range(n * n):
+                r, c = divmod(i, n)
+                if flip:
+                    c = n - 1 - c
+                for _ in range(turns):
+                    r, c = c, n - 1 - r
+                perm.append(r * n + c)
+            maps.append(perm)
+    return maps
+
+
+def line_masks(n, k):
+    # Все отрезки из k клеток по горизонтали, вертикали и диагоналям — как битовые маски
+    masks = []
+    for r in range(n):
+        for c in range(n):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                er, ec = r + dr * (k - 1), c + dc * (k - 1)
+                if 0 <= er < n and 0 <= ec < n:
+                    mask = 0
+                    for t in range(k):
+                        mask |= 1 << ((r + dr * t) * n + c + dc * t)
+                    masks.append(mask)
+    return masks
+
+
+class Searcher:
+    # Negamax с альфа-бета отсечением и итеративным углублением. Позиция — две битовые
+    # маски (ходящий и соперник). Таблица транспозиций общая для всех партий на поле
+    # этого размера; ключ — минимальный из 8 хешей Зобриста симметричных позиций,
+    # так что повёрнутые и отражённые позиции считаются один раз.
+    def __init__(self, n, k):
+        self.n = n
+        self.k = k
+        cells = n * n
+        self.full = (1 << cells) - 1
+        self.lines = line_masks(n, k)
+        self.lines_through = [[m for m in self.lines if m >> i & 1] for i in range(cells)]
+        self.perms = symmetries(n)
+        self.inverse = [[0] * cells for _ in self.perms]
+        for s, perm in enumerate(self.perms):
+            for i, j in enumerate(perm):
+                self.inverse[s][j] = i
+        rng = random.Random(n * 100 + k)
+        zobrist = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        # zkeys[s][side][i] — ключ камня стороны side в клетке i после симметрии s
+        self.zkeys = [[[zobrist[side][perm[i]] for i in range(cells)] for side in range(2)] for perm in self.perms]
+        # Порядок ходов по умолчанию: от центра к краям
+        center = (n - 1) / 2
+        self.order = sorted(range(cells), key=lambda i: abs(i // n - center) + abs(i % n - center))
+        self.near = []
+        for i in range(cells):
+            r, c = divmod(i, n)
+            mask = 0
+            for rr in range(max(r - 1, 0), min(r + 2, n)):
+                for cc in range(max(c - 1, 0), min(c + 2, n)):
+                    mask |= 1 << (rr * n + cc)
+            self.near.append(mask)
+        self.table = {}
+        self.lock = threading.Lock()
+        self.halt = threading.Event()  # флаг остановки текущего поиска — свой у каждого
+
+    # --- Хеши ---
+    def set_position(self, stones):
+        # stones[side] — маска камней стороны: 0 — X, 1 — O
+        self.hashes = [0] * len(self.perms)
+        for side in range(2):
+            bits = stones[side]
+            while bits:
+                low = bits & -bits
+                self.toggle(low.bit_length() - 1, side)
+                bits ^= low
+
+    def toggle(self, i, side):
+        hashes = self.hashes
+        for s, keys in enumerate(self.zkeys):
+            hashes[s] ^= keys[side][i]
+
+    def key(self):
+        h = min(self.hashes)
+        return h, self.hashes.index(h)
+
+    # --- Оценка ---
+    def wins(self, bits, i):
+        for mask in self.lines_through[i]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def evaluate(self, me, them):
+        # Эвристика на пределе глубины: незаблокированные линии, больше камней — весомее
+        score = 0
+        for mask in self.lines:
+            a, b = me & mask, them & mask
+            if a and not b:
+                score += 4 ** a.bit_count()
+            elif b and not a:
+                score -= 4 ** b.bit_count()
+        return score
+
+    def moves(self, me, them, first):
+        occupied = me | them
+        empty = self.full & ~occupied
+        if self.n > 3 and occupied:
+            # На больших полях рассматриваются только клетки рядом с камнями
+            near = 0
+            bits = occupied
+            while bits:
+                low = bits & -bits
+                near |= self.near[low.bit_length() - 1]
+                bits ^= low
+            empty = empty & near or empty
+        result = [i for i in self.order if empty >> i & 1 and i != first]
+        if first is not None:
+            result.insert(0, first)
+        return result
+
+    # --- Поиск ---
+    def negamax(self, me, them, side, depth, alpha, beta):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and (self.halt.is_set() or time.perf_counter() > self.deadline):
+            raise Timeout
+        empty = self.full & ~(me | them)
+        if not empty:
+            return 0
+        depth = min(depth, empty.bit_count())
+        if depth == 0:
+            return self.evaluate(me, them)
+
+        key, s = self.key()
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            e_depth, flag, value, move = entry
+            first = self.inverse[s][move]
+            if e_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        start_alpha = alpha
+        best, best_move = -INF, None
+        for i in self.moves(me, them, first):
+            bit = 1 << i
+            if self.wins(me | bit, i):
+                best, best_move = WIN, i
+                break
+            self.toggle(i, side)
+            value = -self.negamax(them, me | bit, 1 - side, depth - 1, -beta, -alpha)
+            self.toggle(i, side)
+            # Выигрыш, до которого дальше, стоит чуть меньше
+            if value > WIN // 2:
+                value -= 1
+            elif value < -WIN // 2:
+                value += 1
+            if value > best:
+                best, best_move = value, i
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= start_alpha else LOWER if best >= beta else EXACT
+        self.table[key] = (depth, flag, best, self.perms[s][best_move])
+        return best
+
+    def fork(self):
+        # Копия для параллельного поиска: общие таблицы (и таблица транспозиций),
+        # но свои хеши позиции, счётчики, срок и замок
+        clone = copy.copy(self)
+        clone.lock = threading.Lock()
+        return clone
+
+    def best_move(self, stones, side, max_depth=None, budget=1.0, halt=None):
+        # stones — маски камней X и O, side — кто ходит (0 — X, 1 — O);
+        # halt — threading.Event, которым вызывающий прерывает именно этот поиск;
+        # возвращает (клетка, сведения о поиске)
+        if not self.lock.acquire(blocking=False):
+            # Искатель занят (например, решением 3×3 целиком) — ход не ждёт его,
+            # а ищется на копии в пределах своего бюджета
+            return self.fork().best_move(stones, side, max_depth, budget, halt)
+        try:
+            self.halt = halt or threading.Event()
+            me, them = stones[side], stones[1 - side]
+            empty_count = (self.full & ~(me | them)).bit_count()
+            limit = min(max_depth or empty_count, empty_count)
+
+            started = time.perf_counter()
+            self.deadline = started + budget
+            self.nodes = 0
+            move, score, depth = None, 0, 0
+            self.set_position(stones)
+            key, s = self.key()
+            entry = self.table.get(key)
+            if entry is not None and entry[0] >= limit and entry[1] == EXACT:
+                # Позиция уже решена на нужную глубину
+                move, score, depth = self.inverse[s][entry[3]], entry[2], entry[0]
+                limit = 0
+            for d in range(1, limit + 1):
+                self.set_position(stones)
+                try:
+                    value = self.negamax(me, them, side, d, -INF, INF)
+                except Timeout:
+                    break
+                key, s = self.key()
+                move, score, depth = self.inverse[s][self.table[key][3]], value, d
+                if abs(score) > WIN // 2:
+                    break
+            if move is None:
+                # Не успели даже глубину 1 — любой ход лучше, чем никакого
+                move = self.moves(me, them, None)[0]
+            return move, {"depth": depth, "score": score, "nodes": self.nodes,
+                          "elapsed": time.perf_counter() - started}
+        finally:
+            self.lock.release()
+
+    def solve_all(self):
+        # Маленькое поле (3x3) решается целиком заранее: после этого любой ход —
+        # один поиск в таблице
+        with self.lock:
+            self.halt = threading.Event()  # остановить его может только выход из программы
+            self.deadline = float("inf")
+            self.nodes = 0
+            seen = set()
+
+            def visit(stones, side):
+                self.set_position(stones)
+                key, _ = self.key()
+                me, them = stones[side], stones[1 - side]
+                empty = self.full & ~(me | them)
+                if key in seen or not empty:
+                    return
+                seen.add(key)
+                self.negamax(me, them, side, empty.bit_count(), -INF, INF)
+                for i in range(self.n * self.n):
+                    bit = 1 << i
+                    if empty & bit and not self.wins(me | bit, i):
+                        after = list(stones)
+                        after[side] |= bit
+                        visit(after, 1 - side)
+
+            try:
+                visit([0, 0], 0)
+            except Timeout:
+                pass
+
+
+SOLVE_CELLS = 9  # поля не больше этого решаются целиком в фоне при первом обращении
+_searchers = {}
+
+
+def searcher(n, k):
+    # Один искатель (и одна таблица транспозиций) на размер поля
+    if (n, k) not in _searchers:
+        _searchers[(n, k)] = Searcher(n, k)
+        if n * n <= SOLVE_CELLS:
+            threading.Thread(target=_searchers[(n, k)].solve_all, name="tictactoe-solve", daemon=True).start()
+    return _searchers[(n, k)]
+
+
+class AIPlayer:
+    # Компьютерный соперник: поиск идёт в отдельном потоке, результат забирается
+    # из очереди в потоке Tk через poll(), так что окно не замирает.
+    def __init__(self, n, k, level):
+        self.n = n
+        self.k = k
+        self.mcts = level == MCTS
+        if self.mcts:
+            self.searcher, self.max_depth, self.budget, self.randomness = None, None, MCTS_BUDGET, 0.0
+        else:
+            self.searcher = searcher(n, k)
+            self.max_depth, self.budget, self.randomness = LEVELS[level]
+        self.results = queue.Queue()
+        self.generation = 0
+        self.halt = threading.Event()  # остановка текущего поиска этого игрока
+
+    def start(self, board):
+        self.generation += 1
+        generation = self.generation
+        self.halt = halt = threading.Event()
+        stones, side = list(board.stones), board.current - 1
+        cells, stone = bytes(board.cells), board.current
+        empty = [i for i, v in enumerate(cells) if not v]
+
+        def think():
+            if self.mcts:
+                move, info = tictactoe_mcts.best_move(cells, self.n, self.k, stone, self.budget)
+            elif random.random() < self.randomness:
+                move, info = random.choice(empty), {}
+            else:
+                move, info = self.searcher.best_move(stones, side, self.max_depth, self.budget, halt)
+            self.results.put((generation, move, info))
+
+        threading.Thread(target=think, name="tictactoe-ai", daemon=True).start()
+
+    def poll(self):
+        # Ход для последнего запроса или None, если поиск ещё идёт
+        while True:
+            try:
+                generation, move, info = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self.generation:
+                return move, info
+
+    def cancel(self):
+        # Прерывается только свой поиск — общий искатель может в это время решать
+        # 3×3 целиком. Поиск MCTS в процессах не прерывается — его результат
+        # просто отбрасывается
+        self.generation += 1
+        self.halt.set()
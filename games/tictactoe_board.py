@@ -0,0 +1,82 @@
+EMPTY, X, O = 0, 1, 2
+SYMBOLS = {EMPTY: "", X: "X", O: "O"}
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Варианты поля: название -> (сторона N, сколько в ряд нужно для победы)
+VARIANTS = {
+    "3×3": (3, 3),
+    "4×4": (4, 4),
+    "5×5": (5, 4),
+    "7×7": (7, 5),
+    "10×10": (10, 5),
+    "15×15": (15, 5),
+    "19×19": (19, 5),
+}
+
+
+def line_at(cells, n, k, i):
+    # Ищет k одинаковых камней подряд через клетку i: в каждом из 4 направлений
+    # просматривается не больше k - 1 клеток в обе стороны
+    r, c = divmod(i, n)
+    stone = cells[i]
+    for dr, dc in DIRECTIONS:
+        line = [i]
+        for sign in (1, -1):
+            rr, cc = r + sign * dr, c + sign * dc
+            while len(line) < k and 0 <= rr < n and 0 <= cc < n and cells[rr * n + cc] == stone:
+                line.append(rr * n + cc)
+                rr += sign * dr
+                cc += sign * dc
+        if len(line) >= k:
+            return sorted(line)
+    return None
+
+
+class Board:
+    # Поле N x N для «k в ряд»: клетки в bytearray и битовые маски камней каждой стороны.
+    # Победа проверяется только по линиям через поставленный камень — O(k) на ход.
+    def __init__(self, n=3, k=3):
+        if not 1 <= k <= n:
+            raise ValueError("k must be between 1 and n")
+        self.n = n
+        self.k = k
+        self.cells = bytearray(n * n)
+        self.stones = [0, 0]  # битовые маски камней X и O
+        self.moves = 0
+        self.current = X
+        self.winner = EMPTY
+        self.win_line = None
+
+    def __getitem__(self, i):
+        return SYMBOLS[self.cells[i]]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def symbols(self):
+        return [SYMBOLS[v] for v in self.cells]
+
+    def player(self):
+        return SYMBOLS[self.current]
+
+    def is_over(self):
+        return self.winner != EMPTY or self.moves == len(self.cells)
+
+    def play(self, i):
+        # Ставит камень текущего игрока в клетку i; False, если ход невозможен
+        if self.is_over() or self.cells[i] != EMPTY:
+            return False
+        stone = self.current
+        self.cells[i] = stone
+        self.stones[stone - 1] |= 1 << i
+        self.moves += 1
+        line = self.line_through(i)
+        if line is not None:
+            self.winner = stone
+            self.win_line = line
+        else:
+            self.current = O if stone == X else X
+        return True
+
+    def line_through(self, i):
+        return line_at(self.cells, self.n, self.k, i)
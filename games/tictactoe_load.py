@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import random
+import time
+
+from games.tictactoe_board import Board, VARIANTS
+from games.tictactoe_server import HOST, LINE_LIMIT, PORT, MatchServer
+
+
+class Stats:
+    def __init__(self):
+        self.matches = 0
+        self.moves = 0
+        self.errors = 0
+        self.latencies = []
+
+
+async def client(host, port, n, k, deadline, stats, rng):
+    # Один игрок: встаёт в очередь, делает случайные ходы, по окончании партии — снова
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.errors += 1
+        return
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(f"JOIN {n} {k}\n".encode())
+            board = Board(n, k)
+            stone = sent = None
+            sent_at = 0.0
+            while True:
+                try:
+                    # Игрок, оставшийся без пары к концу теста, перестаёт ждать
+                    line = await asyncio.wait_for(reader.readline(), max(deadline - time.perf_counter(), 0) + 1.0)
+                except asyncio.TimeoutError:
+                    return
+                if not line:
+                    return
+                parts = line.split()
+                kind = parts[0]
+                if kind == b"START":
+                    stone = parts[2].decode()
+                elif kind == b"MOVE":
+                    i = int(parts[1])
+                    if i == sent:
+                        # Время от отправки хода до его подтверждения сервером
+                        stats.latencies.append(time.perf_counter() - sent_at)
+                        stats.moves += 1
+                        sent = None
+                    board.play(i)
+                elif kind == b"END":
+                    if stone == "X":
+                        stats.matches += 1
+                    break
+                elif kind == b"ERR":
+                    stats.errors += 1
+                    sent = None
+                if stone is not None and sent is None and not board.is_over() and board.player() == stone:
+                    sent = rng.choice([i for i, v in enumerate(board.cells) if not v])
+                    sent_at = time.perf_counter()
+                    writer.write(f"MOVE {sent}\n".encode())
+    except ConnectionError:
+        stats.errors += 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, clients, duration, n, k, local):
+    listener = None
+    if local:
+        server = MatchServer()
+        listener = await asyncio.start_server(server.handle, host, port, limit=LINE_LIMIT)
+    stats = Stats()
+    rng = random.Random(0)
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(host, port, n, k, deadline, stats, rng) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    if listener is not None:
+        listener.close()
+        await listener.wait_closed()
+    return stats, elapsed
+
+
+def percentile(values, p):
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервера крестиков-ноликов")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--clients", type=int, default=200, help="одновременных игроков (партий — вдвое меньше)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--variant", choices=list(VARIANTS), default="3×3")
+    parser.add_argument("--local", action="store_true", help="поднять сервер в этом же процессе")
+    args = parser.parse_args()
+
+    n, k = VARIANTS[args.variant]
+    stats, elapsed = asyncio.run(run(args.host, args.port, args.clients, args.duration, n, k, args.local))
+    latencies = sorted(stats.latencies)
+    print(f"{stats.matches} партий за {elapsed:.2f} с — {stats.matches / elapsed:.0f} партий/с, "
+          f"{stats.moves / elapsed:.0f} ходов/с, ошибок: {stats.errors}")
+    print(f"задержка хода: p50 {percentile(latencies, 0.5) * 1000:.2f} мс, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.2f} мс, p99 {percentile(latencies, 0.99) * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import atexit
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from games.tictactoe_board import Board, EMPTY, X, O, VARIANTS, line_at
+
+EXPLORATION = 1.4  # коэффициент исследования в формуле UCT
+RADIUS = 2         # на больших полях ходы ищутся не дальше RADIUS клеток от камней
+
+_pool = None
+_pool_workers = 0
+_near = {}
+
+
+def neighbourhood(n):
+    # Для каждой клетки — клетки квадрата со стороной 2 * RADIUS + 1 вокруг неё
+    if n not in _near:
+        _near[n] = [[rr * n + cc
+                     for rr in range(max(r - RADIUS, 0), min(r + RADIUS + 1, n))
+                     for cc in range(max(c - RADIUS, 0), min(c + RADIUS + 1, n))]
+                    for r, c in (divmod(i, n) for i in range(n * n))]
+    return _near[n]
+
+
+def candidates(cells, n):
+    # Ходы, которые имеет смысл рассматривать в дереве: на маленьких полях — все
+    # пустые клетки, на больших — только рядом с уже стоящими камнями
+    if n <= 5:
+        return [i for i, v in enumerate(cells) if v == EMPTY]
+    near = neighbourhood(n)
+    result = set()
+    for i, v in enumerate(cells):
+        if v != EMPTY:
+            result.update(near[i])
+    if not result:
+        return [(n // 2) * n + n // 2]
+    return sorted(i for i in result if cells[i] == EMPTY)
+
+
+def playout(cells, n, k, stone, rng):
+    # Случайная партия до конца на копии поля; возвращает победителя или EMPTY при ничьей
+    empty = [i for i, v in enumerate(cells) if v == EMPTY]
+    rng.shuffle(empty)
+    for i in empty:
+        cells[i] = stone
+        if line_at(cells, n, k, i):
+            return stone
+        stone = O if stone == X else X
+    return EMPTY
+
+
+def search(cells, n, k, stone, budget, seed):
+    # Один поиск UCT. Узлы дерева хранятся в параллельных списках: ход, родитель,
+    # дети, неиспробованные ходы, кто сделал ход, посещения, очки, исход.
+    rng = random.Random(seed)
+    cells = bytearray(cells)
+    other = O if stone == X else X
+    moves, parent, children, untried = [None], [-1], [[]], [candidates(cells, n)]
+    mover, visits, score, outcome = [other], [0], [0.0], [None]
+    rng.shuffle(untried[0])
+
+    deadline = time.perf_counter() + budget
+    playouts = 0
+    while time.perf_counter() < deadline or playouts == 0:
+        board = bytearray(cells)
+        node = 0
+        # Выбор: спуск по полностью раскрытым узлам
+        while not untried[node] and children[node] and outcome[node] is None:
+            log_n = math.log(visits[node])
+            best, best_value = None, -1.0
+            for child in children[node]:
+                value = score[child] / visits[child] + EXPLORATION * math.sqrt(log_n / visits[child])
+                if value > best_value:
+                    best, best_value = child, value
+            node = best
+            board[moves[node]] = mover[node]
+
+        # Раскрытие одного нового хода
+        if untried[node] and outcome[node] is None:
+            move = untried[node].pop()
+            player = O if mover[node] == X else X
+            board[move] = player
+            moves.append(move)
+            parent.append(node)
+            children.append([])
+            mover.append(player)
+            visits.append(0)
+            score.append(0.0)
+            if line_at(board, n, k, move):
+                outcome.append(player)
+                untried.append([])
+            else:
+                nxt = candidates(board, n)
+                outcome.append(None if nxt else EMPTY)
+                rng.shuffle(nxt)
+                untried.append(nxt)
+            children[node].append(len(moves) - 1)
+            node = len(moves) - 1
+
+        # Симуляция
+        if outcome[node] is not None:
+            winner = outcome[node]
+        else:
+            winner = playout(board, n, k, O if mover[node] == X else X, rng)
+        playouts += 1
+
+        # Обратное распространение: очко тому, кто сделал ход в узел
+        while node != -1:
+            visits[node] += 1
+            if winner == mover[node]:
+                score[node] += 1.0
+            elif winner == EMPTY:
+                score[node] += 0.5
+            node = parent[node]
+
+    stats = {moves[child]: (visits[child], score[child]) for child in children[0]}
+    return stats, playouts
+
+
+def pool(workers):
+    # Процессы живут между ходами, чтобы не платить за их запуск каждый раз;
+    # spawn — потому что копировать через fork процесс с Tk небезопасно
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def shutdown():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def urgent_move(cells, n, k, stone):
+    # Выигрыш в один ход или защита от такого же выигрыша соперника
+    other = O if stone == X else X
+    for player in (stone, other):
+        for i in candidates(cells, n):
+            cells[i] = player
+            won = line_at(cells, n, k, i)
+            cells[i] = EMPTY
+            if won:
+                return i
+    return None
+
+
+def best_move(cells, n, k, stone, budget=1.0, workers=None, seed=None):
+    # Распараллеливание по корню: каждый процесс строит своё дерево с другим сидом,
+    # статистика ходов корня складывается. Больше ядер и времени — больше партий.
+    workers = workers or os.cpu_count() or 1
+    cells = bytes(cells)
+    started = time.perf_counter()
+    move = urgent_move(bytearray(cells), n, k, stone)
+    if move is not None:
+        return move, {"playouts": 0, "workers": 0, "elapsed": time.perf_counter() - started,
+                      "playouts_per_sec": 0.0}
+
+    seed = seed if seed is not None else random.getrandbits(32)
+    if workers == 1:
+        results = [search(cells, n, k, stone, budget, seed)]
+    else:
+        executor = pool(workers)
+        futures = [executor.submit(search, cells, n, k, stone, budget, seed + w) for w in range(workers)]
+        results = [future.result() for future in futures]
+
+    merged = {}
+    playouts = 0
+    for stats, count in results:
+        playouts += count
+        for i, (v, s) in stats.items():
+            total = merged.setdefault(i, [0, 0.0])
+            total[0] += v
+            total[1] += s
+    move = max(merged, key=lambda i: merged[i][0])
+    elapsed = time.perf_counter() - started
+    return move, {"playouts": playouts, "workers": workers, "elapsed": elapsed,
+                  "playouts_per_sec": playouts / elapsed if elapsed else 0.0,
+                  "win_rate": merged[move][1] / merged[move][0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер скорости MCTS для крестиков-ноликов")
+    parser.add_argument("--variant", choices=list(VARIANTS), default="15×15")
+    parser.add_argument("--budget", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    board = Board(*VARIANTS[args.variant])
+    board.play(len(board) // 2)
+    for workers in args.workers:
+        move, info = best_move(board.cells, board.n, board.k, board.current, args.budget, workers, seed=0)
+        print(f"{workers} проц.: {info['playouts']} партий за {info['elapsed']:.2f} с — "
+              f"{info['playouts_per_sec']:.0f} партий/с, ход {divmod(move, board.n)}")
+
+
+if __name__ == "__main__":
+    main()
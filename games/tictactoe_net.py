@@ -0,0 +1,65 @@
+import queue
+import socket
+import threading
+
+from games.tictactoe_server import HOST, PORT
+
+CONNECT_TIMEOUT = 3.0
+
+
+class NetClient:
+    # Клиент сервера партий для окна Tk: чтение сокета идёт в фоновом потоке, строки
+    # складываются в очередь, а окно забирает их через poll() из after(). Отправка —
+    # одна короткая запись в сокет, она не блокирует цикл Tk.
+    def __init__(self, host=HOST, port=PORT):
+        self.host = host
+        self.port = port
+        self.sock = None
+        self.messages = queue.Queue()
+        self.closed = False
+
+    def connect(self, n, k):
+        # Подключение и вход в очередь ожидания тоже в фоне: окно не ждёт сеть
+        threading.Thread(target=self.run, args=(n, k), name="tictactoe-net", daemon=True).start()
+
+    def run(self, n, k):
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock = sock
+            if self.closed:
+                sock.close()
+                return
+            self.send(f"JOIN {n} {k}")
+            for line in sock.makefile("r", encoding="ascii"):
+                self.messages.put(line.split())
+        except OSError:
+            pass
+        if not self.closed:
+            self.messages.put(["CLOSED"])
+
+    def send(self, line):
+        try:
+            if self.sock is not None:
+                self.sock.sendall(line.encode() + b"\n")
+        except OSError:
+            self.messages.put(["CLOSED"])
+
+    def poll(self):
+        # Все пришедшие сообщения — списки слов строки протокола
+        result = []
+        while True:
+            try:
+                result.append(self.messages.get_nowait())
+            except queue.Empty:
+                return result
+
+    def close(self):
+        self.closed = True
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
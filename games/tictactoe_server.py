@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import itertools
+from collections import deque
+from contextlib import suppress
+
+from games.tictactoe_board import Board, EMPTY, X, O, VARIANTS
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_SIDE = 19  # больше самого крупного варианта поля не принимаем
+LINE_LIMIT = 1024  # длиннее строки протокола не бывает — такое соединение закрывается
+
+# Протокол — строки ASCII, по одному сообщению на строку.
+# Клиент -> сервер:  JOIN n k | MOVE i | QUIT
+# Сервер -> клиент:  WAIT | START id X|O n k | MOVE i | END X|O|- | ERR причина
+# Строка длиннее LINE_LIMIT получает ERR line-too-long, после чего соединение закрывается.
+# MOVE от сервера приходит обоим игрокам, в том числе тому, кто ходил, — это
+# подтверждение хода; клиент ставит знак только по нему.
+
+
+class Player:
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.stone = EMPTY
+
+    def send(self, line):
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+
+class Match:
+    def __init__(self, match_id, n, k, first, second):
+        self.id = match_id
+        self.board = Board(n, k)
+        self.players = (first, second)
+        first.match, first.stone = self, X
+        second.match, second.stone = self, O
+
+    def opponent(self, player):
+        return self.players[self.players[0] is player]
+
+    def broadcast(self, line):
+        for player in self.players:
+            player.send(line)
+
+    def finish(self, result):
+        self.broadcast(f"END {result}")
+        for player in self.players:
+            player.match = None
+
+
+class MatchServer:
+    # Все партии живут в памяти одного процесса; очередь ожидания — отдельно на каждый
+    # вариант поля. Цикл asyncio обслуживает тысячи соединений без потоков.
+    def __init__(self):
+        self.waiting = {}  # (n, k) -> deque игроков
+        self.matches = {}
+        self.ids = itertools.count(1)
+        self.finished = 0
+        self.moves = 0
+
+    async def handle(self, reader, writer):
+        player = Player(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.dispatch(player, line.split())
+                await writer.drain()
+        except ValueError:
+            # readline() не нашёл перевода строки в пределах LINE_LIMIT (LimitOverrunError)
+            player.send("ERR line-too-long")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.leave(player)
+            writer.close()
+            # При остановке сервера незакрытые соединения отменяются прямо здесь
+            with suppress(ConnectionError, asyncio.CancelledError):
+                await writer.wait_closed()
+
+    def dispatch(self, player, parts):
+        if not parts:
+            return
+        command = parts[0]
+        try:
+            if command == b"JOIN":
+                self.join(player, int(parts[1]), int(parts[2]))
+            elif command == b"MOVE":
+                self.move(player, int(parts[1]))
+            elif command == b"QUIT":
+                self.leave(player)
+            else:
+                player.send("ERR command")
+        except (IndexError, ValueError):
+            player.send("ERR format")
+
+    def join(self, player, n, k):
+        if player.match is not None:
+            player.send("ERR playing")
+            return
+        if not 1 <= k <= n <= MAX_SIDE:
+            player.send("ERR variant")
+            return
+        queue = self.waiting.setdefault((n, k), deque())
+        if player in queue:
+            return
+        while queue and queue[0].writer.is_closing():
+            queue.popleft()
+        if not queue:
+            queue.append(player)
+            player.send("WAIT")
+            return
+        first = queue.popleft()
+        match = Match(next(self.ids), n, k, first, player)
+        self.matches[match.id] = match
+        first.send(f"START {match.id} X {n} {k}")
+        player.send(f"START {match.id} O {n} {k}")
+
+    def move(self, player, i):
+        match = player.match
+        if match is None:
+            player.send("ERR no-match")
+            return
+        board = match.board
+        if board.current != player.stone or not 0 <= i < len(board) or not board.play(i):
+            player.send("ERR move")
+            return
+        self.moves += 1
+        match.broadcast(f"MOVE {i}")
+        if board.is_over():
+            self.end(match, board.player() if board.winner != EMPTY else "-")
+
+    def leave(self, player):
+        for queue in self.waiting.values():
+            if player in queue:
+                queue.remove(player)
+        match = player.match
+        if match is not None:
+            # Ушедший игрок проигрывает
+            self.end(match, "X" if match.opponent(player).stone == X else "O")
+
+    def end(self, match, result):
+        match.finish(result)
+        del self.matches[match.id]
+        self.finished += 1
+
+
+async def serve(host=HOST, port=PORT):
+    server = MatchServer()
+    listener = await asyncio.start_server(server.handle, host, port, limit=LINE_LIMIT)
+    print(f"Сервер крестиков-ноликов: {host}:{port}, варианты: {', '.join(VARIANTS)}")
+    async with listener:
+        while True:
+            await asyncio.sleep(10)
+            print(f"партий идёт: {len(server.matches)}, сыграно: {server.finished}, ходов: {server.moves}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер сетевых партий крестиков-ноликов")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
+import time
+
+STARTED = time.perf_counter()
+
+import logging
 import tkinter as tk
-from games import snake, tictactoe, minesweeper
+from games.lifecycle import FrameCache
+from games.perf_overlay import PerfOverlay
+from games.registry import GameEntry, Usage, discover, discover_plugins, log, prewarm
+from games.scheduler import Scheduler
+
+STARTUP_TARGET = 0.3  # секунд от запуска до готового меню
+PREWARM_DELAY = 500   # мс после показа меню до фонового импорта любимой игры
+STATS = GameEntry("Статистика", "games.stats")  # экран истории партий, не игра — в счётчик не идёт
 
 class MainApp(tk.Tk):
     def __init__(self):
@@ -7,15 +19,30 @@ class MainApp(tk.Tk):
         self.title("MiniGame Center")
         self.geometry("1080x650")
 
+        # Общий таймер анимаций и периодических задач для всех игр
+        self.scheduler = Scheduler(self)
+
         # Контейнер для всех "экранов"
         self.container = tk.Frame(self)
         self.container.pack(fill="both", expand=True)
 
-        self.frames = {}  # Словарь для хранения всех Frame
+        # Экраны игр: показ, скрытие и выгрузка давно скрытых — через протокол Lifecycle
+        self.frames = FrameCache(self.container, self)
+
+        # Замеры горячих путей: F3 — оверлей поверх любого экрана, F4 — выгрузка сеанса
+        self.overlay = PerfOverlay(self.container, self)
+        self.bind_all("<F3>", lambda e: self.overlay.toggle())
+        self.bind_all("<F4>", lambda e: self.overlay.export())
+
+        # Игры только перечисляются: модули импортируются при первом клике
+        self.games = discover()
+        self.usage = Usage()
 
         # Инициализация главного меню
-        self.frames["menu"] = self.create_menu()
-        self.frames["menu"].pack(fill="both", expand=True)
+        self.menu = self.create_menu()
+        self.menu.pack(fill="both", expand=True)
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self.after_idle(self.menu_ready)
 
     def create_menu(self):
         frame = tk.Frame(self.container)
@@ -23,41 +50,58 @@ class MainApp(tk.Tk):
         label = tk.Label(frame, text="Выберите игру", font=("Arial", 16))
         label.pack(pady=30)
 
-        games_list = [
-            ("Змейка", snake.GameFrame),
-            ("Крестики-нолики", tictactoe.GameFrame),
-            ("Сапёр", minesweeper.GameFrame)
-        ]
+        for entry in self.games:
+            self.add_game_button(frame, entry)
 
-        for name, game_class in games_list:
-            btn = tk.Button(frame, text=name, font=("Arial", 14), width=20, command=lambda g=game_class: self.show_game(g))
-            btn.pack(pady=10)
+        self.btn_stats = tk.Button(frame, text=STATS.title, font=("Arial", 14), width=20,
+                                   command=lambda: self.show_screen(STATS))
+        self.btn_stats.pack(pady=(30, 0))
 
-        btn_exit = tk.Button(frame, text="Выход", font=("Arial", 14), width=20, command=self.destroy)
-        btn_exit.pack(pady=30)
+        self.btn_exit = tk.Button(frame, text="Выход", font=("Arial", 14), width=20, command=self.exit_app)
+        self.btn_exit.pack(pady=30)
 
         return frame
 
-    def show_game(self, game_class):
-        # Скрываем меню
-        self.frames["menu"].pack_forget()
+    def add_game_button(self, frame, entry, **pack):
+        btn = tk.Button(frame, text=entry.title, font=("Arial", 14), width=20, command=lambda e=entry: self.show_game(e))
+        btn.pack(pady=10, **pack)
 
-        # Если Frame ещё не создан, создаём
-        if game_class not in self.frames:
-            frame = game_class(self.container, self)
-            self.frames[game_class] = frame
-            frame.pack(fill="both", expand=True)
+    def menu_ready(self):
+        # Меню построено и первый раз отрисовано — замер времени запуска
+        self.update_idletasks()
+        elapsed = time.perf_counter() - STARTED
+        if elapsed > STARTUP_TARGET:
+            log.warning("меню готово за %.0f мс — дольше цели %.0f мс", elapsed * 1000, STARTUP_TARGET * 1000)
         else:
-            self.frames[game_class].pack(fill="both", expand=True)
+            log.info("меню готово за %.0f мс", elapsed * 1000)
+        # Игры-плагины добавляются в меню, когда оно уже на экране, — вслед за встроенными
+        for entry in discover_plugins(e.title for e in self.games):
+            self.games.append(entry)
+            self.add_game_button(self.menu, entry, before=self.btn_stats)
+        self.after(PREWARM_DELAY, lambda: prewarm(self.usage.favourite(self.games)))
+
+    def show_game(self, entry):
+        self.usage.record(entry.title)
+        self.show_screen(entry)
+
+    def show_screen(self, entry):
+        # Скрываем меню; экран строится при первом открытии
+        self.menu.pack_forget()
+        self.frames.show(entry)
+        if self.overlay.visible:
+            self.overlay.label.lift()
 
     def back_to_menu(self):
-        # Скрываем все активные игры
-        for key, frame in self.frames.items():
-            if key != "menu":
-                frame.pack_forget()
-        self.frames["menu"].pack(fill="both", expand=True)
+        # Игра скрывается и останавливает свои таймеры
+        self.frames.hide()
+        self.menu.pack(fill="both", expand=True)
+
+    def exit_app(self):
+        self.frames.close()
+        self.destroy()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     app = MainApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
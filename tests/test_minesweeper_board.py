@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from games.minesweeper_board import Board, CellSet
+
+
+def make_board(rows, cols, mine_count, rng):
+    cells = rng.sample([(r, c) for r in range(rows) for c in range(cols)], mine_count)
+    return Board(rows, cols, CellSet.from_cells(rows, cols, cells)), set(cells)
+
+
+def neighbours(rows, cols, r, c):
+    for i in range(max(r - 1, 0), min(r + 2, rows)):
+        for j in range(max(c - 1, 0), min(c + 2, cols)):
+            yield i, j
+
+
+def flood(board, r, c):
+    # Наивное раскрытие: обход в ширину по нулям, к области добавляются все соседи
+    if board.count(r, c) != 0:
+        return {(r, c)}, set()
+    zeros, opened, queue = {(r, c)}, set(), [(r, c)]
+    while queue:
+        cell = queue.pop()
+        for i, j in neighbours(board.rows, board.cols, *cell):
+            opened.add((i, j))
+            if board.count(i, j) == 0 and (i, j) not in zeros:
+                zeros.add((i, j))
+                queue.append((i, j))
+    return opened, zeros
+
+
+class BoardTest(unittest.TestCase):
+    SIZES = [(1, 1), (1, 17), (17, 1), (9, 9), (16, 30), (23, 41)]
+
+    def boards(self):
+        rng = random.Random(1)
+        for rows, cols in self.SIZES:
+            n = rows * cols
+            for mine_count in sorted({0, 1, n // 10, n // 5, n // 3, n - 1}):
+                yield make_board(rows, cols, mine_count, rng)
+
+    def test_counts(self):
+        for board, mines in self.boards():
+            for r in range(board.rows):
+                for c in range(board.cols):
+                    self.assertEqual(board.is_mine(r, c), (r, c) in mines)
+                    if (r, c) not in mines:
+                        expected = sum(cell in mines for cell in neighbours(board.rows, board.cols, r, c))
+                        self.assertEqual(board.count(r, c), expected)
+
+    def test_region_matches_flood_fill(self):
+        for board, mines in self.boards():
+            expected = {}  # клетка нуля -> раскрытие её области, общее для всей области
+            for r in range(board.rows):
+                for c in range(board.cols):
+                    if (r, c) in mines:
+                        continue
+                    if (r, c) not in expected:
+                        opened, zeros = flood(board, r, c)
+                        for cell in zeros:
+                            expected[cell] = opened
+                    # Дважды: второй раз граница берётся из кэша
+                    for _ in range(2):
+                        spans = list(board.region(r, c))
+                        cells = [(row, j) for row, lo, hi in spans for j in range(lo, hi)]
+                        self.assertEqual(len(cells), len(set(cells)))
+                        self.assertEqual(set(cells), expected.get((r, c), {(r, c)}), (board.rows, board.cols, r, c))
+                        self.assertEqual(spans, sorted(spans))
+
+    def test_region_labels_partition_zeros(self):
+        for board, mines in self.boards():
+            seen = {}
+            for r in range(board.rows):
+                for c in range(board.cols):
+                    if board.count(r, c) != 0:
+                        self.assertIsNone(board.region_of(r, c))
+                    elif (r, c) not in seen:
+                        _, zeros = flood(board, r, c)
+                        labels = {board.region_of(i, j) for i, j in zeros}
+                        self.assertEqual(len(labels), 1)
+                        label = labels.pop()
+                        self.assertNotIn(label, seen.values())
+                        seen.update(dict.fromkeys(zeros, label))
+
+    def test_partial_iteration_does_not_cache(self):
+        board, _ = make_board(30, 30, 20, random.Random(2))
+        r, c = next((r, c) for r in range(30) for c in range(30) if board.count(r, c) == 0)
+        expected = list(board.region(r, c))
+        board, _ = make_board(30, 30, 20, random.Random(2))
+        next(board.region(r, c))
+        self.assertEqual(list(board.region(r, c)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
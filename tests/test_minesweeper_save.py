@@ -0,0 +1,102 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from games.minesweeper_engine import MinesweeperGame, PLAYING
+from games.minesweeper_save import JOURNAL_KEY, SaveJournal, game_state, restore_game
+from games.storage import Storage
+
+
+class SaveJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "test.db")
+        self.store = Storage(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def reopen(self):
+        # Новое хранилище на той же базе — как после перезапуска программы
+        self.store.close()
+        self.store = Storage(self.path)
+        return SaveJournal(store=self.store)
+
+    def play(self, journal, game, rng, moves, save_at=()):
+        # Случайные ходы так же, как их делает GameFrame: открытия безопасных клеток и флаги
+        closed = [(r, c) for r in range(game.rows) for c in range(game.cols)]
+        for n in range(moves):
+            if game.status != PLAYING:
+                break
+            if n in save_at:
+                journal.snapshot(game_state(game))
+            r, c = rng.choice(closed)
+            if (r, c) in game.opened:
+                continue
+            if rng.random() < 0.3:
+                value = int((r, c) not in game.flags)
+                game.set_flag(r, c, value)
+                journal.record("f", r, c, value)
+            elif (r, c) not in game.flags:
+                if not game.opened and game.secure_first_click(r, c):
+                    journal.snapshot(game_state(game))
+                if game.board.is_mine(r, c):
+                    continue
+                journal.record("o", r, c)
+                game.open(r, c)
+
+    def assertSameGame(self, loaded, game):
+        self.assertEqual(loaded.mines.tobytes(), game.mines.tobytes())
+        self.assertEqual(loaded.opened.tobytes(), game.opened.tobytes())
+        self.assertEqual(loaded.flags.tobytes(), game.flags.tobytes())
+        self.assertEqual(loaded.seed, game.seed)
+        self.assertEqual(loaded.status, game.status)
+
+    def test_snapshot_and_journal_restore_game(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            journal = SaveJournal(store=self.store)
+            game = MinesweeperGame(12, 15, 30, seed=seed, first_click_safe=True)
+            journal.snapshot(game_state(game))
+            self.play(journal, game, rng, 150, save_at=(40, 90))
+            state, moves = self.reopen().load()
+            self.assertSameGame(restore_game(state, moves), game)
+
+    def test_snapshot_clears_journal(self):
+        journal = SaveJournal(store=self.store)
+        game = MinesweeperGame(9, 9, 10, seed=1)
+        journal.snapshot(game_state(game))
+        self.play(journal, game, random.Random(1), 30)
+        journal.snapshot(game_state(game))
+        state, moves = self.reopen().load()
+        self.assertEqual(moves, [])
+        self.assertSameGame(restore_game(state, moves), game)
+
+    def test_torn_last_line_is_skipped(self):
+        journal = SaveJournal(store=self.store)
+        game = MinesweeperGame(9, 9, 10, seed=2)
+        journal.snapshot(game_state(game))
+        self.play(journal, game, random.Random(2), 30)
+        self.store.append_blob(JOURNAL_KEY, f"{journal.seq + 1} f 0".encode())
+        journal = self.reopen()
+        state, moves = journal.load()
+        self.assertSameGame(restore_game(state, moves), game)
+        # Следующий ход не склеивается с оборванной строкой
+        game.set_flag(0, 0, int((0, 0) not in game.flags))
+        journal.record("f", 0, 0, int((0, 0) in game.flags))
+        state, moves = self.reopen().load()
+        self.assertSameGame(restore_game(state, moves), game)
+
+    def test_clear(self):
+        journal = SaveJournal(store=self.store)
+        journal.snapshot(game_state(MinesweeperGame(9, 9, 10, seed=3)))
+        journal.record("o", 0, 0)
+        journal.clear()
+        self.assertEqual(self.reopen().load(), (None, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from itertools import combinations
+
+from games.minesweeper_board import Board, CellSet
+from games.minesweeper_solver import Frontier, analyze, neighbors
+
+
+def brute_force(board, mine_count, opened):
+    # Все расстановки мин по закрытым клеткам, согласные с числами на открытых:
+    # для каждой клетки — в скольких из них она мина
+    rows, cols = board.rows, board.cols
+    closed = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in opened]
+    constraints = [(set(neighbors(r, c, rows, cols)) - opened, board.count(r, c)) for r, c in opened]
+    hits = dict.fromkeys(closed, 0)
+    total = 0
+    for placed in combinations(closed, mine_count):
+        placed = set(placed)
+        if all(len(cells & placed) == n for cells, n in constraints):
+            total += 1
+            for cell in placed:
+                hits[cell] += 1
+    return {cell: n / total for cell, n in hits.items()}
+
+
+def positions(count, rng):
+    # Небольшие поля, открытые с безопасной клетки и ещё несколькими безопасными ходами
+    while count:
+        rows, cols = rng.randint(3, 5), rng.randint(4, 5)
+        mine_count = rng.randint(2, 6)
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        board = Board(rows, cols, CellSet.from_cells(rows, cols, rng.sample(cells, mine_count)))
+        safe = [cell for cell in cells if not board.is_mine(*cell)]
+        opened = set()
+        for cell in rng.sample(safe, rng.randint(1, 3)):
+            opened.update(board.region_cells(*cell))
+        if len(opened) + mine_count < rows * cols:
+            count -= 1
+            yield board, mine_count, opened
+
+
+class SolverTest(unittest.TestCase):
+    def assertAgrees(self, result, expected):
+        for cell in result.safe:
+            self.assertEqual(expected[cell], 0.0, cell)
+        for cell in result.mines:
+            self.assertEqual(expected[cell], 1.0, cell)
+        # Клетки, решённые распространением, в вероятностях не участвуют
+        solved = result.safe | result.mines
+        for cell, p in expected.items():
+            if cell in solved:
+                continue
+            if cell in result.probabilities:
+                self.assertAlmostEqual(result.probabilities[cell], p, msg=cell)
+            else:
+                self.assertAlmostEqual(result.other, p, msg=cell)
+
+    def test_analyze_matches_brute_force(self):
+        for board, mine_count, opened in positions(150, random.Random(5)):
+            result = analyze(board.rows, board.cols, mine_count,
+                             CellSet.from_cells(board.rows, board.cols, opened), board.count)
+            self.assertTrue(result.exact)
+            expected = brute_force(board, mine_count, opened)
+            self.assertAgrees(result, expected)
+            # Клетка, безопасная во всех расстановках, получает вероятность 0
+            for cell, p in expected.items():
+                if p == 0.0 and cell not in result.safe:
+                    self.assertEqual(result.probabilities.get(cell, result.other), 0.0)
+
+    def test_incremental_frontier_matches_scratch(self):
+        # Граница, которую кормят открытыми клетками по частям, даёт тот же анализ
+        for board, mine_count, opened in positions(60, random.Random(6)):
+            frontier = Frontier(board.rows, board.cols, mine_count, board.count)
+            cells = sorted(opened)
+            random.Random(len(cells)).shuffle(cells)
+            for i in range(0, len(cells), 3):
+                frontier.add(cells[i:i + 3])
+            result = frontier.analyze()
+            scratch = analyze(board.rows, board.cols, mine_count,
+                              CellSet.from_cells(board.rows, board.cols, opened), board.count)
+            self.assertEqual(result.safe, scratch.safe)
+            self.assertEqual(result.mines, scratch.mines)
+            self.assertEqual(result.probabilities.keys(), scratch.probabilities.keys())
+            for cell, p in scratch.probabilities.items():
+                self.assertAlmostEqual(result.probabilities[cell], p)
+            self.assertAgrees(result, brute_force(board, mine_count, opened))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from games.snake_engine import SnakeGame, PLAYING, DOWN
+from games.snake_replay import Replay
+from games.snake_ai import Autopilot
+
+
+def autopilot_game(seed, cols=12, rows=10, strategy="safe", max_ticks=3000):
+    game = SnakeGame(cols, rows, seed=seed)
+    pilot = Autopilot(strategy)
+    while game.status == PLAYING and game.ticks < max_ticks:
+        game.turn(pilot.choose(game))
+        game.step()
+    return game
+
+
+class ReplayTest(unittest.TestCase):
+    def test_round_trip_verifies(self):
+        for seed in range(20):
+            game = autopilot_game(seed, strategy=("greedy", "safe")[seed % 2])
+            replay = Replay.from_game(game)
+            loaded = Replay.from_bytes(replay.to_bytes())
+            self.assertEqual(loaded.turns, replay.turns)
+            self.assertTrue(loaded.verify())
+            final = loaded.play()
+            self.assertEqual(list(final.cells), list(game.cells))
+            self.assertEqual(final.status, game.status)
+
+    def test_long_gaps_between_turns(self):
+        # Разница тактов больше 31 не помещается в один байт varint
+        game = SnakeGame(200, 5, seed=7)
+        for _ in range(150):
+            game.step()
+        game.turn(DOWN)
+        game.step()
+        replay = Replay.from_bytes(Replay.from_game(game).to_bytes())
+        self.assertEqual(replay.turns, [(150, DOWN)])
+        self.assertTrue(replay.verify())
+
+    def test_tampered_score_fails(self):
+        replay = Replay.from_game(autopilot_game(3))
+        replay.score += 1
+        self.assertFalse(Replay.from_bytes(replay.to_bytes()).verify())
+
+    def test_truncated_data_rejected(self):
+        data = Replay.from_game(autopilot_game(5)).to_bytes()
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(data[:10])
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"XXXX" + data[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()